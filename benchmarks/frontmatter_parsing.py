@@ -0,0 +1,42 @@
+"""
+Compare `render_engine.parsers.base_parsers.parse_content` with `frontmatter.parse`.
+
+Run from the root of the repository:
+
+    uv run python benchmarks/frontmatter_parsing.py
+"""
+
+import argparse
+import timeit
+
+import frontmatter
+
+from render_engine.parsers.base_parsers import parse_content
+
+BODY = "A paragraph of the post with *some* markdown in it.\n\n" * 40
+
+DOCUMENTS = {
+    "simple": f"---\ntitle: A simple post\nauthor: Jane Doe\ndescription: Only key value pairs\n---\n{BODY}",
+    "typed": f"---\ntitle: A typed post\ndate: 2024-05-01\ntags: [python, static sites]\ndraft: false\n---\n{BODY}",
+    "none": BODY,
+}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("-n", "--number", type=int, default=5000, help="parses per measurement")
+    parser.add_argument("-r", "--repeat", type=int, default=5, help="measurements, the best one is reported")
+    args = parser.parse_args()
+
+    print(f"{'frontmatter':<12} {'frontmatter.parse':>18} {'parse_content':>14} {'speedup':>8}")
+    for name, document in DOCUMENTS.items():
+        assert parse_content(document) == frontmatter.parse(document)
+        baseline, fast = (
+            min(timeit.repeat(lambda: parse(document), number=args.number, repeat=args.repeat)) / args.number
+            for parse in (frontmatter.parse, parse_content)
+        )
+        print(f"{name:<12} {baseline * 1e6:>16.1f}us {fast * 1e6:>12.1f}us {baseline / fast:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Measure the overhead of the plugin hooks on the render of a page.
+
+Renders a page without a template into memory with 0, 1 and 5 plugins implementing `render_content` and
+`post_render_content`, and with 5 plugins implementing other hooks only, which should cost as little as no plugins.
+
+Run from the root of the repository:
+
+    uv run python benchmarks/plugin_dispatch.py
+"""
+
+import argparse
+import timeit
+
+from render_engine import Page, Site
+from render_engine.output import MemoryBackend
+from render_engine.plugins import hook_impl
+
+
+def make_plugin(index: int, render_hooks: bool = True) -> type:
+    """A plugin whose hooks do nothing"""
+
+    def noop(*args, **kwargs) -> None:
+        pass
+
+    hooks = ("render_content", "post_render_content") if render_hooks else ("pre_build_site",)
+    return type(f"Plugin{index}", (), {hook: staticmethod(hook_impl(noop)) for hook in hooks})
+
+
+def make_page(plugins: list[type]) -> tuple[Site, Page]:
+    """A site with `plugins` registered and a page added to it"""
+    site = Site(output_backend=MemoryBackend())
+    site.register_plugins(*plugins)
+
+    @site.page
+    class BenchmarkPage(Page):
+        content = "A page without a template."
+
+    BenchmarkPage.site = site
+    return site, BenchmarkPage
+
+
+CASES = {
+    "0 plugins": [],
+    "1 plugin": [make_plugin(0)],
+    "5 plugins": [make_plugin(index) for index in range(5)],
+    "5 other plugins": [make_plugin(index, render_hooks=False) for index in range(5)],
+}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("-n", "--number", type=int, default=20000, help="renders per measurement")
+    parser.add_argument("-r", "--repeat", type=int, default=5, help="measurements, the best one is reported")
+    args = parser.parse_args()
+
+    print(f"{'plugins':<16} {'per page':>10} {'overhead':>10}")
+    baseline = None
+    for name, plugins in CASES.items():
+        site, page = make_page(plugins)
+        per_page = (
+            min(timeit.repeat(lambda: page.render(site.theme_manager), number=args.number, repeat=args.repeat))
+            / args.number
+        )
+        baseline = per_page if baseline is None else baseline
+        print(f"{name:<16} {per_page * 1e6:>8.2f}us {(per_page - baseline) * 1e6:>8.2f}us")
+        site.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,6 @@
 """Shared Properties and methods across render_engine objects."""
 
-from collections import defaultdict
+from collections import ChainMap, defaultdict
 from collections.abc import Callable
 
 from slugify import slugify
@@ -137,6 +137,33 @@ class BaseObject:
 
         return base_dict
 
+    def render_context(self) -> ChainMap:
+        """
+        Returns a read-only view of the object's attributes, with the same items as `to_dict`.
+
+        The layers of the view are the object's `plugin_settings`, `template_vars` and attributes themselves rather
+        than copies, so only the title, slug, url and path_name are computed. Objects that override `to_dict` get its
+        result as the only layer.
+
+        Returns:
+            ChainMap: The attributes passed into the object's templates.
+
+        """
+        if type(self).to_dict is not BaseObject.to_dict:
+            return ChainMap(self.to_dict())
+        computed = {
+            "title": self._title,
+            "slug": self._slug,
+            "url": self.url_for(),
+            "path_name": self.path_name,
+        }
+        return ChainMap(
+            getattr(self, "plugin_settings", None) or {},
+            getattr(self, "template_vars", None) or {},
+            computed,
+            vars(self),
+        )
+
     def render(self, *args, **kwargs):
         """Render method. Implemented in child objects"""
         raise NotImplementedError(f'{self.__class__.__name__} does not implement the "render" method.')
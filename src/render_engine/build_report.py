@@ -0,0 +1,144 @@
+"""
+The report of a build, returned by `Site.render`.
+
+The report holds the wall clock and CPU time of every phase of the build, the load and render time and the number
+of rendered entries of every collection, the amount written and the time spent rendering every entry.
+"""
+
+import contextlib
+import dataclasses
+import heapq
+import time
+from collections.abc import Iterator
+from typing import Any
+
+from .plugin_timing import HookTiming
+
+
+@dataclasses.dataclass
+class PhaseTiming:
+    """
+    The time spent in a phase of the build.
+
+    Attributes:
+        name: The name of the phase.
+        wall: The wall clock time of the phase, in seconds.
+        cpu: The CPU time used during the phase, in seconds.
+    """
+
+    name: str
+    wall: float = 0.0
+    cpu: float = 0.0
+
+
+@dataclasses.dataclass
+class EntryTiming:
+    """
+    The time spent rendering one entry of the site.
+
+    Attributes:
+        route: The key of the entry, or of the collection of the entry, in the route list.
+        output: The first output of the entry.
+        wall: The wall clock time of the render, in seconds.
+        cpu: The CPU time of the thread or process that rendered the entry, in seconds.
+    """
+
+    route: str
+    output: str
+    wall: float
+    cpu: float
+
+
+@dataclasses.dataclass
+class CollectionReport:
+    """
+    The load and render of a collection.
+
+    Attributes:
+        name: The key of the collection in the route list.
+        pages: The number of pages rendered.
+        archives: The number of archive pages rendered.
+        feeds: The number of feeds rendered.
+        load: The time spent loading the pages of the collection. The CPU time only covers the thread that loaded
+            them.
+        render: The time from when the collection was scheduled until all of its entries were rendered. The CPU time
+            is the sum of the CPU time of its entries.
+    """
+
+    name: str
+    pages: int = 0
+    archives: int = 0
+    feeds: int = 0
+    load: PhaseTiming | None = None
+    render: PhaseTiming | None = None
+
+
+@dataclasses.dataclass
+class BuildReport:
+    """
+    What a build did and where it spent its time.
+
+    Attributes:
+        phases: The timing of the phases of the build, in the order they ran.
+        collections: The report of every collection, by route.
+        files_written: The number of outputs written.
+        files_unchanged: The number of outputs that were not written because their content did not change.
+        bytes_written: The size, in bytes, of the outputs written. Static files are not included.
+        skipped: The number of entries that an incremental build did not render because they were current.
+        entries: The render time of every entry that was rendered.
+        plugin_timings: The calls and time spent in the hooks of each plugin, when `plugin_timing` is set.
+    """
+
+    phases: list[PhaseTiming] = dataclasses.field(default_factory=list)
+    collections: dict[str, CollectionReport] = dataclasses.field(default_factory=dict)
+    files_written: int = 0
+    files_unchanged: int = 0
+    bytes_written: int = 0
+    skipped: int = 0
+    entries: list[EntryTiming] = dataclasses.field(default_factory=list)
+    plugin_timings: list[HookTiming] = dataclasses.field(default_factory=list)
+
+    @contextlib.contextmanager
+    def phase(self, name: str) -> Iterator[PhaseTiming]:
+        """Time the body of the `with` statement as a phase of the build"""
+        timing = PhaseTiming(name=name)
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield timing
+        finally:
+            timing.wall = time.perf_counter() - wall
+            timing.cpu = time.process_time() - cpu
+            self.phases.append(timing)
+
+    @property
+    def wall(self) -> float:
+        """The wall clock time of the whole build, in seconds"""
+        return sum(phase.wall for phase in self.phases)
+
+    @property
+    def cpu(self) -> float:
+        """The CPU time used by the whole build, in seconds"""
+        return sum(phase.cpu for phase in self.phases)
+
+    def slowest(self, count: int = 10) -> list[EntryTiming]:
+        """The `count` entries that took the longest to render, the slowest first"""
+        return heapq.nlargest(count, self.entries, key=lambda entry: entry.wall)
+
+    def to_dict(self, slowest: int = 10) -> dict[str, Any]:
+        """
+        The report as plain data, to be stored as JSON.
+
+        :param slowest: The number of slowest entries included. The render time of the other entries is left out.
+        """
+        return {
+            "wall": self.wall,
+            "cpu": self.cpu,
+            "phases": [dataclasses.asdict(phase) for phase in self.phases],
+            "collections": {name: dataclasses.asdict(report) for name, report in self.collections.items()},
+            "files_written": self.files_written,
+            "files_unchanged": self.files_unchanged,
+            "bytes_written": self.bytes_written,
+            "skipped": self.skipped,
+            "slowest": [dataclasses.asdict(entry) for entry in self.slowest(slowest)],
+            "plugin_timings": [dataclasses.asdict(timing) for timing in self.plugin_timings],
+        }
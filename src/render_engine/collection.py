@@ -1,9 +1,10 @@
 import copy
+import dataclasses
 import datetime
 import logging
-import os
+import threading
+import time
 from collections.abc import Callable, Generator, Iterable
-from multiprocessing.pool import ThreadPool
 from pathlib import Path
 from typing import Any, cast
 
@@ -15,11 +16,59 @@ from ._base_object import BaseObject
 from .archive import Archive
 from .content_managers import ContentManager, FileContentManager
 from .feeds import RSSFeed
-from .page import BasePage, Page
+from .page import BasePage, Page, parse_stats
 from .parsers import BasePageParser
 from .plugins import PluginManager
 
 
+@dataclasses.dataclass
+class ContentLoad:
+    """
+    How long it took to load the pages of a collection.
+
+    Attributes:
+        pages: The number of pages of the collection.
+        seconds: The wall clock time spent loading them.
+        cpu: The CPU time of the thread that loaded them. Workers of the content manager are not included.
+    """
+
+    pages: int
+    seconds: float
+    cpu: float = 0.0
+
+
+class _ParseBatch:
+    """
+    Pages whose content is parsed at once with the `parse_many` method of their Parser.
+
+    The batch is parsed by the first render unit that needs one of its pages, so parsing overlaps with the rendering
+    of the other batches. The units of the other pages of the batch wait for it while it is parsed.
+    """
+
+    def __init__(self, parse_many: Callable, extras: Any, pages: list[tuple[Page, Any]]) -> None:
+        self.pages = [page for page, _ in pages]
+        self._parse_many = parse_many
+        self._extras = extras
+        self._contents: list[tuple[Page, Any]] | None = pages
+        self._lock = threading.Lock()
+
+    def parse(self) -> None:
+        """Parse the pages of the batch unless they are parsed already"""
+        with self._lock:
+            if self._contents is None:
+                return
+            contents, self._contents = self._contents, None
+            try:
+                parsed = self._parse_many([content for _, content in contents], extras=self._extras)
+            except Exception as e:
+                # The pages are parsed one at a time when they are rendered, which raises for the page at fault.
+                logging.warning(f"Parsing a batch of {len(contents)} pages failed ({e!r}). Parsing them one at a time.")
+                return
+            parse_stats.add(parsed=len(contents))
+            for (page, content), page_parsed in zip(contents, parsed, strict=True):
+                page._store_content(content, self._extras, page_parsed)
+
+
 class Collection(BaseObject):
     """
     Collection objects serve as a way to quickly process pages that have a
@@ -62,11 +111,19 @@ class Collection(BaseObject):
         ContentManager: type[ContentManager] | None = FileContentManager
         content_manager: ContentManager
         content_manager_extras: dict[str, Any]: kwargs to pass to the ContentManager when instantiating
+        render_backend: str | None: `thread` or `process` to override the `Site`'s render backend
+        parse_batch_size: int = 256: The number of pages parsed at once by a Parser that implements `parse_many`
+        render_batch_size: int = 256: The number of pages passed at once to the batch plugin hooks
 
     Methods:
 
         iter_content_path(): Iterates through the collection's content path.
+        load_content(): Loads the pages of the collection and returns how long it took.
         get_page(content_path: str | Path | None = None): Returns the page Object for the specified Content Path.
+        get_pages(content_paths: Iterable[str | Path]): Returns the page Objects for the specified Content Paths.
+        parse_pages(pages: Iterable[BaseObject]): Parses the content of pages in batches.
+        parse_batches(pages: Iterable[BaseObject]): Groups pages in batches to be parsed when they are rendered.
+        render(): Renders every entry of the collection, running the batch plugin hooks around them.
         sorted_pages: Returns the sorted pages of the collection.
         archives: Returns the Archive objects containing the pages from the content path.
         feed: Returns the Feed object for the collection.
@@ -91,6 +148,9 @@ class Collection(BaseObject):
     template: str | None
     ContentManager: type[ContentManager] = FileContentManager
     content_manager_extras: dict[str, Any]
+    render_backend: str | None = None
+    parse_batch_size: int = 256
+    render_batch_size: int = 256
 
     def __init__(
         self,
@@ -123,13 +183,23 @@ class Collection(BaseObject):
     def get_page(
         self,
         content_path: str | Path | None = None,
+        lazy: bool = False,
     ) -> Page:
-        """Returns the page Object for the specified Content Path"""
+        """
+        Returns the page Object for the specified Content Path
+
+        :param content_path: The path of the content of the page
+        :param lazy: Only read the frontmatter now and the content of the page when it is first used
+        """
         _page = self.content_type(
             content_path=content_path,
             Parser=self.Parser,
+            **({"lazy": True} if lazy else {}),
         )
+        return self._prepare_page(_page)
 
+    def _prepare_page(self, _page: Page) -> Page:
+        """Sets the attributes that a page inherits from the collection"""
         _page.parser_extras = getattr(self, "parser_extras", {})
         _page.routes = self.routes
         _page.template = getattr(self, "template", None)
@@ -137,6 +207,119 @@ class Collection(BaseObject):
 
         return _page
 
+    def _parses_content_paths(self, lazy: bool = False) -> bool:
+        """
+        Whether `get_pages` reads the files with the `parse_content_paths` method of the Parser.
+
+        Each page is created with `get_page` instead when it is overridden, when the `content_type` has its own
+        constructor or when the pages are lazy.
+        """
+        return not (
+            lazy
+            or getattr(self.Parser, "parse_content_paths", None) is None
+            or type(self).get_page is not Collection.get_page
+            or self.content_type.__init__ is not Page.__init__
+        )
+
+    def get_pages(
+        self,
+        content_paths: Iterable[str | Path],
+        lazy: bool = False,
+        parsed: Iterable[tuple[dict, Any]] | None = None,
+    ) -> list[Page]:
+        """
+        Returns the page Objects for the specified Content Paths
+
+        The files are read together with the `parse_content_paths` method of the Parser when `_parses_content_paths`
+        is True, otherwise each page is created with `get_page`.
+
+        :param content_paths: The paths of the content of the pages
+        :param lazy: Only read the frontmatter now and the content of the pages when it is first used
+        :param parsed: The attributes and content already parsed from each content path by `parse_content_paths`
+        """
+        content_paths = list(content_paths)
+        if not self._parses_content_paths(lazy):
+            return [self.get_page(path, lazy=True) if lazy else self.get_page(path) for path in content_paths]
+        if parsed is None:
+            parsed = self.Parser.parse_content_paths(content_paths)
+        return [
+            self._prepare_page(
+                self.content_type(content_path=path, Parser=self.Parser, metadata=metadata, content=content)
+            )
+            for path, (metadata, content) in zip(content_paths, parsed, strict=True)
+        ]
+
+    def parse_pages(self, pages: Iterable[BaseObject]) -> None:
+        """
+        Parses the content of pages in batches of `parse_batch_size` with the `parse_many` method of the Parser.
+
+        Only done when the Parser overrides `parse_many`, otherwise each page is parsed when it is rendered. Pages
+        whose content is already parsed, or that use another Parser, are left alone.
+
+        :param pages: The entries of the collection that are about to be rendered
+        """
+        for batch in self.parse_batches(pages):
+            batch.parse()
+
+    def parse_batches(self, pages: Iterable[BaseObject]) -> list[_ParseBatch]:
+        """
+        Groups pages in batches of `parse_batch_size` to be parsed with the `parse_many` method of the Parser.
+
+        The batches are parsed by the render units of their pages, see `_render`. Only done when the Parser overrides
+        `parse_many`. Pages whose content is already parsed, or that use another Parser, are left out.
+
+        :param pages: The entries of the collection that are about to be rendered
+        """
+        parse_many = getattr(self.Parser, "parse_many", None)
+        if parse_many is None or getattr(parse_many, "__func__", parse_many) is BasePageParser.parse_many.__func__:
+            return []
+        # A batch is parsed with one extras, the pages normally share the extras of the collection.
+        groups: list[tuple[Any, list[tuple[Page, Any]]]] = []
+        for page in pages:
+            if not isinstance(page, Page) or page.Parser is not self.Parser:
+                continue
+            if not (content := getattr(page, "content", None)):
+                continue
+            extras = getattr(page, "parser_extras", {})
+            found, _ = page._cached_content(content, extras)
+            if found:
+                continue
+            group = next((group for group_extras, group in groups if group_extras == extras), None)
+            if group is None:
+                groups.append((extras, group := []))
+            group.append((page, content))
+        return [
+            _ParseBatch(parse_many, extras, list(batch))
+            for extras, group in groups
+            for batch in batched(group, self.parse_batch_size)
+        ]
+
+    @staticmethod
+    def _entry_batches(entries: Iterable[BaseObject], batches: list[_ParseBatch]) -> list[list[_ParseBatch]]:
+        """
+        The batches each entry needs parsed before it is rendered.
+
+        A page needs its own batch. Archives and feeds read the content of every page, so they need all of them.
+        """
+        page_batches = {id(page): batch for batch in batches for page in batch.pages}
+        entry_batches = []
+        for entry in entries:
+            if isinstance(entry, Archive | RSSFeed):
+                entry_batches.append(batches)
+            else:
+                entry_batches.append([page_batches[id(entry)]] if id(entry) in page_batches else [])
+        return entry_batches
+
+    def load_content(self) -> ContentLoad:
+        """
+        Loads the pages of the collection from its content manager.
+
+        The pages are otherwise loaded the first time the collection is iterated.
+        """
+        start, cpu = time.perf_counter(), time.thread_time()
+        pages = sum(1 for _ in self.content_manager)
+        return ContentLoad(pages=pages, seconds=time.perf_counter() - start, cpu=time.thread_time() - cpu)
+
     @staticmethod
     def _date_key(page: Page) -> datetime.datetime:
         """
@@ -284,14 +467,34 @@ class Collection(BaseObject):
             return
         method(collection=self, site=site, settings=self.plugin_manager.plugin_settings)
 
-    def _render(self, entry: BaseObject):
+    def _run_batch_plugins(self, site, hook_type: str, entries: Iterable[BaseObject]) -> None:
+        """
+        Run a batch plugin hook for the pages among `entries`, in chunks of `render_batch_size`.
+
+        :param site: The site object triggering the call
+        :param hook_type: `render_content_batch` or `post_render_content_batch`
+        :param entries: The entries of the collection being rendered. Archives and feeds are left out.
+        """
+        plugin_manager = getattr(self, "plugin_manager", None)
+        if plugin_manager is None or not plugin_manager.implements(hook_type):
+            return
+        pages = [entry for entry in entries if not isinstance(entry, (RSSFeed, Archive))]
+        method = getattr(plugin_manager.hook, hook_type)
+        for chunk in batched(pages, self.render_batch_size):
+            method(pages=list(chunk), collection=self, settings=plugin_manager.plugin_settings, site=site)
+
+    def _render(self, entry: BaseObject, batches: Iterable[_ParseBatch] = ()):
         """
         Renders 1 entry in the Collection
 
         :param entry: The entry to process
+        :param batches: The parse batches to parse before the entry is rendered, from `parse_batches`
         """
+        for batch in batches:
+            batch.parse()
         if not isinstance(entry, RSSFeed) and not isinstance(entry, Archive):
-            entry.plugin_manager = copy.deepcopy(self.plugin_manager)
+            plugin_manager = self.plugin_manager
+            entry.plugin_manager = plugin_manager.copy() if plugin_manager is not None else None
 
         # Circular imports. Need to be handled here.
         from .page import BasePage
@@ -306,13 +509,16 @@ class Collection(BaseObject):
     def render(self) -> None:
         """Iterate through Pages and Check for Archives and Feeds"""
 
-        # Use a ThreadPool to process all of the entries in the collection in parallel.
-        # This is limited to the number of CPUs available. The easiest way to implement
-        # this parallelization for a single task is to use the imap_unordered method of
-        # the ThreadPool. This is, effectively, a generator so we need to loop over it
-        # for them to run. Since there is no actual return value to look at we just `pass`.
-        for entry in ThreadPool(processes=os.cpu_count()).imap_unordered(self._render, self.all_content):
+        # Render all of the entries in parallel on the executor owned by the Site so that the workers are
+        # shared by every collection and reused across builds. Iterating over the results waits for all of
+        # them and raises any error from the workers.
+        self.site = cast(Any, self.site)
+        entries = list(self.all_content)
+        self._run_batch_plugins(self.site, "render_content_batch", entries)
+        batches = self._entry_batches(entries, self.parse_batches(entries))
+        for _ in self.site.executor.map(self._render, entries, batches):
             pass
+        self._run_batch_plugins(self.site, "post_render_content_batch", entries)
 
     def create_entry(
         self,
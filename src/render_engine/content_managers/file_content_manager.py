@@ -1,41 +1,268 @@
+import fnmatch
+import functools
+import itertools
+import logging
+import multiprocessing
+import os
+import pickle
+import re
 import subprocess
-from collections.abc import Iterable
-from pathlib import Path
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path, PurePath
+from typing import Any
 
-from more_itertools import flatten
+from more_itertools import divide, flatten
 
 from render_engine.content_managers import ContentManager
+from render_engine.parsers import BasePageParser
+
+LOAD_BACKENDS = ("thread", "process")
+
+logger = logging.getLogger("FileContentManager")
+
+
+def _parse_chunk(Parser: type[BasePageParser], chunk: list[Path]) -> list[tuple[dict, Any]]:
+    """Parse a chunk of content paths inside a worker process"""
+    return Parser.parse_content_paths(chunk)
+
+
+# A part of a compiled glob pattern: the match function of a name, or None for `**`
+_PatternPart = Callable[[str], Any] | None
+
+
+@functools.cache
+def _compile_pattern(pattern: str) -> tuple[_PatternPart, ...]:
+    """Compile a glob pattern into one matcher per path component, matching case like the file system does"""
+    flags = re.IGNORECASE if os.path.normcase("A") == "a" else 0
+    return tuple(
+        None if part == "**" else re.compile(fnmatch.translate(part), flags).match for part in PurePath(pattern).parts
+    )
+
+
+def _match_parts(pattern: tuple[_PatternPart, ...], names: tuple[str, ...]) -> bool:
+    """Whether the components of a relative path match a compiled glob pattern"""
+    if not pattern:
+        return not names
+    first, rest = pattern[0], pattern[1:]
+    if first is None:
+        return any(_match_parts(rest, names[index:]) for index in range(len(names) + 1))
+    return bool(names) and first(names[0]) is not None and _match_parts(rest, names[1:])
+
+
+def _matches(pattern: tuple[_PatternPart, ...], names: tuple[str, ...], anywhere: bool) -> bool:
+    """
+    Whether a relative path matches a compiled glob pattern.
+
+    With `anywhere` set, a pattern made of a single name matches the name of the file at any depth.
+    """
+    if anywhere and len(pattern) == 1:
+        return pattern[0] is None or pattern[0](names[-1]) is not None
+    return _match_parts(pattern, names)
+
+
+def _load_context() -> multiprocessing.context.BaseContext:
+    """
+    The multiprocessing context used to load pages in worker processes.
+
+    Pages are loaded while the render workers and other threads of the site are running, so the workers are not forked
+    from the loading process: a lock held by one of its threads would stay held in the workers.
+    """
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
 
 
 class FileContentManager(ContentManager):
-    """Content manager for content stored on the file system as individual files"""
+    """
+    Content manager for content stored on the file system as individual files
+
+    With `lazy` set, only the frontmatter of each file is read when the pages are loaded, which is all that sorting,
+    archives and the site map need. The rest of the file is read when the content of the page is first used.
+
+    The files are found with a single walk of `content_path`. By default only the files directly in `content_path`
+    whose names match one of `include_suffixes` are pages. With `recursive` set, the files of every sub-folder are
+    included as well, and the files and folders matching one of `exclude` are skipped without walking into them.
+
+    With `max_workers` set to more than 1, the files are read and parsed by a pool of threads or, with
+    `load_backend="process"`, of worker processes started with the `forkserver` or `spawn` method. The pages are in
+    the same order as when they are loaded one after another.
+    """
 
     def __init__(
         self,
         content_path: Path | str,
         collection,
         include_suffixes: Iterable[str] = ("*.md", "*.html"),
+        recursive: bool = False,
+        exclude: Iterable[str] = (),
+        lazy: bool = False,
+        max_workers: int | None = 1,
+        load_backend: str = "thread",
         **kwargs,
     ):
+        """
+        :param content_path: The directory holding the content files
+        :param collection: The collection the pages belong to
+        :param include_suffixes: Glob patterns of the files that are pages, relative to `content_path`
+        :param recursive: Include the files in the sub-folders of `content_path`, where patterns without a `/` match
+            the name of the files. Default: False
+        :param exclude: Glob patterns of the files and folders to skip. Patterns without a `/` match the name of a
+            file or folder at any depth, the others its path relative to `content_path`
+        :param lazy: Only read the frontmatter of the files when the pages are loaded
+        :param max_workers: Number of workers loading the pages. None uses the number of CPUs. Default: 1
+        :param load_backend: `thread` or `process`, the kind of workers loading the pages. Default: `thread`
+        """
+        if load_backend not in LOAD_BACKENDS:
+            raise ValueError(f"Unknown load backend {load_backend!r}. Expected one of {LOAD_BACKENDS}.")
         self.content_path = content_path
         self.include_suffixes = include_suffixes
+        self.recursive = recursive
+        self.exclude = exclude
         self.collection = collection
+        self.lazy = lazy
+        self.max_workers = max_workers
+        self.load_backend = load_backend
         self._pages = None
 
-    def iter_content_path(self):
-        """Iterate through in the collection's content path."""
-        return flatten([Path(self.content_path).glob(suffix) for suffix in self.include_suffixes])
+    def iter_content_path(self) -> Iterator[Path]:
+        """
+        Iterate through in the collection's content path.
+
+        The files are listed in the order of `include_suffixes`, then in the order they are found, like globbing
+        `content_path` with each pattern in turn.
+        """
+        include = [_compile_pattern(pattern) for pattern in self.include_suffixes]
+        exclude = [_compile_pattern(pattern) for pattern in self.exclude]
+        if self.recursive or any(None in pattern for pattern in include):
+            depth = None
+        else:
+            depth = max((len(pattern) for pattern in include), default=0)
+        files = list(self._scan(Path(self.content_path), (), depth, exclude))
+        for pattern in include:
+            for names, path in files:
+                if _matches(pattern, names, self.recursive):
+                    yield path
+
+    def _scan(
+        self,
+        directory: Path,
+        parents: tuple[str, ...],
+        depth: int | None,
+        exclude: list[tuple[_PatternPart, ...]],
+    ) -> Iterator[tuple[tuple[str, ...], Path]]:
+        """
+        Walk a directory with `os.scandir`, yielding the relative path components and the path of every file.
+
+        Symbolic links to directories are only followed when the depth is limited: like `**` in `Path.glob`, a walk of
+        all the levels does not enter them, so that a link to a parent directory cannot make it loop.
+
+        :param depth: The number of levels of directories to walk, or None to walk all of them
+        :param exclude: Compiled patterns of the files and directories to skip
+        """
+        try:
+            with os.scandir(directory) as entries:
+                entries = list(entries)
+        except OSError:
+            return
+        directories = []
+        for entry in entries:
+            names = (*parents, entry.name)
+            if any(_matches(pattern, names, True) for pattern in exclude):
+                continue
+            if entry.is_dir(follow_symlinks=depth is not None):
+                if depth is None or len(names) < depth:
+                    directories.append(names)
+            elif entry.is_file():
+                yield names, directory / entry.name
+        # The files of a directory come before the ones of its sub-directories, as with `Path.glob("**/...")`
+        for names in directories:
+            yield from self._scan(directory / names[-1], names, depth, exclude)
 
     @property
     def pages(self) -> Iterable:
         if self._pages is None:
-            self._pages = [self.collection.get_page(page) for page in self.iter_content_path()]
+            self._pages = self.load_pages(list(self.iter_content_path()))
         yield from self._pages
 
     @pages.setter
     def pages(self, value: Iterable):
         self._pages = value
 
+    def load_pages(self, content_paths: list[Path]) -> list:
+        """
+        Create the pages for the files in `content_paths`, in parallel when `max_workers` is more than 1.
+
+        The files are split in contiguous chunks, a few per worker, and the pages of the chunks are put back together
+        in order. Worker processes only parse the files, the pages are created in this process from the attributes and
+        content they send back. The files are loaded by threads when the collection cannot create its pages from
+        parsed content (for instance when the pages are lazy).
+
+        :param content_paths: The paths of the files
+        :return: The pages, in the order of `content_paths`
+        """
+        workers = min(self.max_workers or os.cpu_count() or 1, len(content_paths))
+        if workers <= 1:
+            return self.collection.get_pages(content_paths, lazy=self.lazy)
+        chunks = [list(chunk) for chunk in divide(workers * 4, content_paths)]
+        chunks = [chunk for chunk in chunks if chunk]
+
+        if self.load_backend == "process" and self._parses_in_processes():
+            Parser = self.collection.Parser
+            with ProcessPoolExecutor(max_workers=workers, mp_context=_load_context()) as executor:
+                parsed = list(flatten(executor.map(_parse_chunk, itertools.repeat(Parser), chunks)))
+            return self.collection.get_pages(content_paths, parsed=parsed)
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="content-loader") as executor:
+            return list(flatten(executor.map(lambda chunk: self.collection.get_pages(chunk, lazy=self.lazy), chunks)))
+
+    def _parses_in_processes(self) -> bool:
+        """Whether worker processes can parse the files, which requires a Parser that can be imported by them"""
+        if not self.collection._parses_content_paths(self.lazy):
+            return False
+        try:
+            pickle.dumps(self.collection.Parser)
+        except (pickle.PicklingError, AttributeError, TypeError):
+            logger.warning(
+                f"{self.collection.Parser.__qualname__} cannot be sent to worker processes. Loading with threads."
+            )
+            return False
+        return True
+
+    def get_page(self, content_path: Path | str):
+        """The page of the collection for a file in the content path"""
+        if self.lazy:
+            return self.collection.get_page(content_path, lazy=True)
+        return self.collection.get_page(content_path)
+
+    def reload_entry(self, content_path: Path | str):
+        """
+        Reload the page for a file in the content path that was created, modified or deleted.
+
+        The page keeps its position among the pages of the collection.
+
+        :param content_path: The path of the file that changed
+        :return: The new page or None if the file was deleted or is not part of the collection
+        """
+        content_path = Path(content_path).resolve()
+        pages = list(self.pages)
+        index = next(
+            (
+                index
+                for index, page in enumerate(pages)
+                if getattr(page, "content_path", None) and Path(page.content_path).resolve() == content_path
+            ),
+            len(pages),
+        )
+        page = None
+        if content_path.is_file():
+            for path in self.iter_content_path():
+                if Path(path).resolve() == content_path:
+                    page = self.get_page(path)
+                    break
+        pages[index : index + 1] = [page] if page is not None else []
+        self._pages = pages
+        return page
+
     def create_entry(
         self,
         filepath: Path | None = None,
@@ -79,5 +306,5 @@ class FileContentManager(ContentManager):
             self._pages = [
                 existing_page for existing_page in self._pages if page.content_path != existing_page.content_path
             ]
-            self._pages.append(self.collection.get_page(page.content_path))
+            self._pages.append(self.get_page(page.content_path))
         return f"Entry at {page.content_path} updated."
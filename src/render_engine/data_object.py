@@ -33,13 +33,16 @@ class DataObject(BaseObject):
         from .site import Site
 
         site: Site = cast(Site, self.site)
+        pm = getattr(self, "plugin_manager", None)
+        render_hook = pm is not None and pm.implements("render_content")
+        post_render_hook = pm is not None and pm.implements("post_render_content")
         for route in self.routes:
-            path = Path(site.output_path, route, self.path_name)
-            path.parent.mkdir(parents=True, exist_ok=True)
+            path = Path(route, self.path_name)
 
             settings = dict()
-            if (pm := getattr(self, "plugin_manager", None)) and pm is not None:
+            if render_hook or post_render_hook:
                 settings = {**site.plugin_manager.plugin_settings, "route": self.path_name}
+            if render_hook:
                 pm.hook.render_content(page=self, settings=settings, site=self.site)
 
             data_object = self.data_object
@@ -49,7 +52,7 @@ class DataObject(BaseObject):
                 else self.serializer(self.data_object)
             )
 
-            if pm is not None:
+            if post_render_hook:
                 pm.hook.post_render_content(page=self.__class__, settings=settings, site=self.site)
 
-            path.write_text(serialized)
+            site.output_writer.write_text(path, serialized)
@@ -17,6 +17,23 @@ from jinja2 import (
 from ._base_object import BaseObject
 from .collection import Collection
 from .page import BasePage
+from .template_dependencies import record_template
+
+
+class RenderEngineEnvironment(Environment):
+    """
+    The Jinja Environment used to render sites.
+
+    Every template that is loaded is recorded, by the name it was requested with, for the
+    [template dependency graph][src.render_engine.template_dependencies.TemplateDependencyGraph]. This covers the
+    template of an entry as well as every template it extends, includes or imports.
+    """
+
+    def _load_template(self, name, globals):
+        template = super()._load_template(name, globals)
+        record_template(name)
+        return template
+
 
 render_engine_templates_loader = ChoiceLoader(
     [
@@ -31,7 +48,7 @@ render_engine_templates_loader = ChoiceLoader(
     ]
 )
 
-engine = Environment(
+engine = RenderEngineEnvironment(
     loader=render_engine_templates_loader,
     autoescape=select_autoescape(["xml"]),
     lstrip_blocks=True,
@@ -0,0 +1,301 @@
+"""
+Build manifest for incremental builds.
+
+The manifest maps every output path to a digest of the inputs it was rendered from. On the next build, entries whose
+outputs exist and whose inputs have the same digest are not rendered again.
+
+Outputs rendered with a template that reads the `site` or `routes` globals can show any entry of the site, so they
+also depend on a digest of the content of every entry.
+"""
+
+import dataclasses
+import datetime
+import hashlib
+import json
+import logging
+import threading
+from collections.abc import Iterable, Mapping
+from pathlib import Path
+from types import FunctionType
+from typing import Any
+
+from jinja2 import Environment, TemplateNotFound
+
+from ._base_object import BaseObject
+from .collection import Collection
+from .output import OutputBackend
+from .template_dependencies import reads_site
+
+logger = logging.getLogger("Manifest")
+
+MANIFEST_VERSION = 3
+MANIFEST_NAME = "manifest.json"
+
+# Attributes that point back to the build machinery rather than being inputs of an entry.
+_IGNORED_ATTRS = frozenset(
+    {
+        "site",
+        "plugin_manager",
+        "content_manager",
+        "rendered_content",
+        "engine",
+        "_content_cache",
+    }
+)
+
+_METHOD_TYPES = (FunctionType, staticmethod, classmethod, property)
+
+
+def _qualname(value: Any) -> str:
+    """The importable name of a class, function or the class of an object"""
+    if not isinstance(value, type) and not callable(value):
+        value = type(value)
+    return f"{getattr(value, '__module__', '')}.{getattr(value, '__qualname__', repr(value))}"
+
+
+def _entry_state(entry: BaseObject, seen: set[int]) -> dict[str, Any]:
+    """The attributes of an entry, including the ones set on user defined classes"""
+    state: dict[str, Any] = {}
+    for cls in reversed(type(entry).__mro__):
+        if cls.__module__.startswith("render_engine") or cls is object:
+            continue
+        for key, value in vars(cls).items():
+            if not key.startswith("__") and not isinstance(value, _METHOD_TYPES):
+                state[key] = value
+    state.update(vars(entry))
+    if "_lazy_content_path" in state:
+        # The content of a lazy page is an input even though it has not been read yet.
+        state["content"] = getattr(entry, "content", None)
+        state.pop("_lazy_content_path")
+    for key in _IGNORED_ATTRS:
+        state.pop(key, None)
+    state["__class__"] = _qualname(entry)
+    state["__path_name__"] = str(entry.path_name)
+    return {key: stable(value, seen) for key, value in state.items()}
+
+
+def stable(value: Any, seen: set[int] | None = None) -> Any:
+    """
+    Convert a value to a JSON serializable structure that is the same from one process to the next.
+
+    Objects without a meaningful representation are reduced to the name of their class.
+
+    :param value: The value to convert
+    :param seen: ids of the entries already being converted, used to break cycles
+    """
+    seen = set() if seen is None else seen
+    match value:
+        case None | bool() | int() | float() | str():
+            return value
+        case bytes():
+            return hashlib.sha256(value).hexdigest()
+        case Path():
+            return value.as_posix()
+        case datetime.date() | datetime.time():
+            return value.isoformat()
+        case Mapping():
+            return {str(key): stable(val, seen) for key, val in value.items()}
+        case list() | tuple():
+            return [stable(val, seen) for val in value]
+        case set() | frozenset():
+            return sorted((stable(val, seen) for val in value), key=lambda val: json.dumps(val, sort_keys=True))
+        case BaseObject():
+            if id(value) in seen:
+                return _qualname(value)
+            seen.add(id(value))
+            state = _entry_state(value, seen)
+            seen.discard(id(value))
+            return state
+        case _ if callable(value):
+            return _qualname(value)
+        case _ if dataclasses.is_dataclass(value):
+            return stable(dataclasses.asdict(value), seen)
+        case _ if type(value).__repr__ is not object.__repr__:
+            return repr(value)
+        case _:
+            return _qualname(value)
+
+
+def digest(*parts: Any) -> str:
+    """A stable digest of `parts`"""
+    return hashlib.sha256(json.dumps(stable(parts), sort_keys=True).encode()).hexdigest()
+
+
+def content_digest(route_list: Mapping[Any, BaseObject]) -> str:
+    """A digest of every entry of the site and of every page of its collections"""
+    return digest(
+        [[str(route), list(entry) if isinstance(entry, Collection) else entry] for route, entry in route_list.items()]
+    )
+
+
+def entry_outputs(entry: BaseObject) -> list[str]:
+    """The paths, relative to the output path, that an entry is written to"""
+    routes = getattr(entry, "routes", ["./"])
+    return sorted({(Path(route) / Path(entry.path_name)).as_posix() for route in routes})
+
+
+class BuildManifest:
+    """
+    Maps the output paths of a build to the digest of the inputs they were rendered from.
+
+    The inputs of an entry are its source (the content and frontmatter of the page or the data object), the
+    site_vars, the settings of the plugins and the templates it was rendered with. Archives and feeds include the
+    inputs of their pages.
+
+    Templates are tracked through the [template dependency graph][src.render_engine.template_dependencies]: every
+    output stores the digest of each template that was loaded to render it, so changing a template only invalidates
+    the outputs that extend, include or import it.
+
+    An output rendered with a template that reads the `site` or `routes` globals, such as an index listing the posts
+    of a blog, also stores the digest of the content of the whole site and is rendered again when any entry changes.
+
+    Attributes:
+        path: Where the manifest is stored.
+        output_path: The output path of the build that the manifest describes.
+        outputs: Mapping of output path to the digest of its inputs and of the templates it was rendered with.
+    """
+
+    def __init__(self, path: str | Path, output_path: str | Path) -> None:
+        self.path = Path(path)
+        self.output_path = Path(output_path)
+        self.outputs: dict[str, dict[str, Any]] = {}
+        self._site_digest: str = ""
+        self._content_digest: str = ""
+        self._engine: Environment | None = None
+        self._backend: OutputBackend | None = None
+        self._template_digests: dict[str, str | None] = {}
+        self._site_templates: dict[str, bool] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path: str | Path, output_path: str | Path) -> "BuildManifest":
+        """
+        Load the manifest stored at `path`.
+
+        A missing or unreadable manifest, or one written for another output path, gives an empty manifest.
+        """
+        manifest = cls(path, output_path)
+        try:
+            data = json.loads(manifest.path.read_text())
+        except FileNotFoundError:
+            return manifest
+        except (OSError, ValueError):
+            logger.warning(f"Ignoring unreadable build manifest at {manifest.path}.")
+            return manifest
+        if data.get("version") == MANIFEST_VERSION and data.get("output_path") == manifest.output_path.as_posix():
+            manifest.outputs = dict(data.get("outputs", {}))
+        return manifest
+
+    def save(self) -> None:
+        """Write the manifest to `path`"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        data = {
+            "version": MANIFEST_VERSION,
+            "output_path": self.output_path.as_posix(),
+            "outputs": dict(sorted(self.outputs.items())),
+        }
+        self.path.write_text(json.dumps(data, indent=1))
+
+    def prepare(self, site) -> None:
+        """
+        Compute the inputs shared by every entry of the site.
+
+        This is called once per build after the themes are loaded and the site map is updated.
+        """
+        plugin_manager = site.plugin_manager
+        self._site_digest = digest(
+            site.site_vars,
+            {key: value for key, value in site.theme_manager.engine.globals.items() if key not in ("site", "routes")},
+            plugin_manager.plugin_settings,
+            sorted(plugin_manager._pm.get_name(plugin) or "" for plugin in plugin_manager.plugins),
+            [str(route) for route in site.route_list],
+            [entry.url_for for entry in site.site_map] if site.site_map else [],
+        )
+        self._content_digest = content_digest(site.route_list)
+        self._engine = site.theme_manager.engine
+        self._backend = site.output_backend
+        self._template_digests = {}
+        self._site_templates = {}
+
+    def _load_template(self, name: str) -> None:
+        """Compute the digest of a template and whether it reads the site globals"""
+        template_digest = None
+        site_template = False
+        if self._engine is not None and self._engine.loader is not None:
+            try:
+                source, *_ = self._engine.loader.get_source(self._engine, name)
+            except TemplateNotFound:
+                pass
+            else:
+                template_digest = hashlib.sha256(source.encode()).hexdigest()
+                site_template = reads_site(self._engine, name)
+        with self._lock:
+            self._template_digests[name] = template_digest
+            self._site_templates[name] = site_template
+
+    def template_digest(self, name: str) -> str | None:
+        """
+        The digest of the source of a template as the engine currently resolves it.
+
+        :return: The digest or None if the template cannot be found.
+        """
+        if name not in self._template_digests:
+            self._load_template(name)
+        return self._template_digests[name]
+
+    def reads_site(self, name: str) -> bool:
+        """Whether a template reads the `site` or `routes` globals, and so can show the content of any entry"""
+        if name not in self._site_templates:
+            self._load_template(name)
+        return self._site_templates[name]
+
+    def inputs(self, entry: BaseObject) -> str:
+        """The digest of the inputs of an entry, excluding its templates"""
+        plugins = getattr(entry, "plugin_manager", None)
+        plugin_names = sorted(plugins._pm.get_name(plugin) or "" for plugin in plugins.plugins) if plugins else []
+        return digest(self._site_digest, plugin_names, entry)
+
+    def is_current(self, outputs: list[str], inputs_digest: str | None) -> bool:
+        """Whether every output exists and was rendered from the same inputs and templates"""
+        if inputs_digest is None:
+            return False
+        for output in outputs:
+            recorded = self.outputs.get(output)
+            if not recorded or recorded.get("inputs") != inputs_digest:
+                return False
+            for name, template_digest in recorded.get("templates", {}).items():
+                if template_digest is None or self.template_digest(name) != template_digest:
+                    return False
+            if "content" in recorded and recorded["content"] != self._content_digest:
+                return False
+            if self._backend is not None:
+                if not self._backend.exists(output):
+                    return False
+            elif not (self.output_path / output).exists():
+                return False
+        return True
+
+    def templates(self, outputs: Iterable[str]) -> set[str]:
+        """The names of the templates recorded for `outputs`"""
+        return {name for output in outputs for name in self.outputs.get(output, {}).get("templates", {})}
+
+    def record(self, outputs: list[str], inputs_digest: str | None, templates: Iterable[str] = ()) -> None:
+        """
+        Record what `outputs` were rendered from.
+
+        :param outputs: The output paths of a rendered entry.
+        :param inputs_digest: The digest of the inputs of the entry.
+        :param templates: The names of the templates loaded to render the entry.
+        """
+        if inputs_digest is None:
+            return
+        templates = sorted(templates)
+        recorded: dict[str, Any] = {
+            "inputs": inputs_digest,
+            "templates": {name: self.template_digest(name) for name in templates},
+        }
+        if any(self.reads_site(name) for name in templates):
+            recorded["content"] = self._content_digest
+        with self._lock:
+            for output in outputs:
+                self.outputs[output] = recorded
@@ -0,0 +1,578 @@
+"""
+Writing rendered outputs.
+
+Pages and data objects write their outputs through the `OutputWriter` of their Site so that unchanged outputs can be
+left alone and the number of files that actually changed can be reported after a build.
+
+The writer can also run as a separate stage: outputs are put on a bounded queue and written by dedicated I/O threads so
+that the render workers do not wait on the disk.
+
+Where the outputs are stored is up to an `OutputBackend`. The `FileSystemBackend` writes them to the output path and
+the `MemoryBackend` keeps them in memory, for benchmarks and preview servers. The `ArchiveBackend` streams them into a
+tar or zip archive.
+"""
+
+import hashlib
+import io
+import logging
+import os
+import queue
+import shutil
+import tarfile
+import threading
+import time
+import zipfile
+from abc import ABC, abstractmethod
+from collections.abc import Callable
+from pathlib import Path
+
+logger = logging.getLogger("Output")
+
+# Put on the queue to stop an I/O thread
+_STOP = None
+
+
+def output_key(path: str | Path) -> str:
+    """The normalized form of a path relative to the output path, e.g. `blog/post.html`"""
+    return Path(path).as_posix().lstrip("/")
+
+
+class OutputBackend(ABC):
+    """
+    Base OutputBackend abstract class
+
+    Backends store the outputs of a build. Every path is relative to the root of the output, e.g. `blog/post.html`.
+    Backends must be safe to use from several threads.
+
+    Attributes:
+        supports_processes: Whether outputs written by forked worker processes end up in the backend. Entries set to
+            use the `process` render backend are rendered by threads when this is False.
+    """
+
+    supports_processes: bool = True
+
+    def open(self, update: bool = False) -> None:
+        """
+        Called at the start of every build.
+
+        :param update: Whether the build only renders some of the outputs again, keeping the others, as
+            `Site.rebuild` does.
+        """
+        pass
+
+    def close(self) -> None:
+        """Called at the end of every build, once every output is written"""
+        pass
+
+    @abstractmethod
+    def write_text(self, path: str, content: str) -> int:
+        """
+        Store an output.
+
+        :param path: The path of the output.
+        :param content: The content of the output.
+        :return: The number of characters written.
+        """
+        ...
+
+    @abstractmethod
+    def read_text(self, path: str) -> str | None:
+        """The content of an output or None if it does not exist"""
+        ...
+
+    @abstractmethod
+    def stat(self, path: str) -> tuple[int, int] | None:
+        """A signature of an output that changes whenever it is written, or None if it does not exist"""
+        ...
+
+    def exists(self, path: str) -> bool:
+        """Whether the output exists"""
+        return self.stat(path) is not None
+
+    @abstractmethod
+    def delete(self, path: str) -> None:
+        """Remove an output if it exists"""
+        ...
+
+    @abstractmethod
+    def copy_file(self, source: str | Path, path: str) -> None:
+        """
+        Store a file from the file system, such as a static file.
+
+        :param source: The file to copy.
+        :param path: The path of the copy in the output.
+        """
+        ...
+
+    def copy_tree(self, source: str | Path, path: str) -> None:
+        """
+        Store every file of a directory from the file system.
+
+        :param source: The directory to copy.
+        :param path: The path of the copy in the output.
+        """
+        source = Path(source)
+        for root, _, files in os.walk(source):
+            for name in files:
+                file_path = Path(root, name)
+                self.copy_file(file_path, output_key(Path(path) / file_path.relative_to(source)))
+
+
+class FileSystemBackend(OutputBackend):
+    """
+    Writes the outputs to a directory.
+
+    Attributes:
+        backend: Where the outputs are stored.
+        root: The directory the outputs are written to.
+    """
+
+    def __init__(self, root: str | Path) -> None:
+        self.root = Path(root)
+        self._directories: set[Path] = set()
+        self._lock = threading.Lock()
+
+    def _mkdir(self, directory: Path) -> None:
+        """Create a directory unless it was already created"""
+        if directory in self._directories:
+            return
+        directory.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            self._directories.add(directory)
+
+    def open(self, update: bool = False) -> None:
+        # The output path may be cleaned between builds
+        with self._lock:
+            self._directories.clear()
+
+    def write_text(self, path: str, content: str) -> int:
+        file_path = self.root / path
+        self._mkdir(file_path.parent)
+        try:
+            return file_path.write_text(content)
+        except FileNotFoundError:
+            # The directory was removed since it was created, by a plugin cleaning the output path for instance.
+            with self._lock:
+                self._directories.discard(file_path.parent)
+            self._mkdir(file_path.parent)
+            return file_path.write_text(content)
+
+    def read_text(self, path: str) -> str | None:
+        try:
+            return (self.root / path).read_text()
+        except (FileNotFoundError, IsADirectoryError, NotADirectoryError):
+            return None
+
+    def stat(self, path: str) -> tuple[int, int] | None:
+        try:
+            stat = (self.root / path).stat()
+        except (FileNotFoundError, NotADirectoryError):
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def delete(self, path: str) -> None:
+        (self.root / path).unlink(missing_ok=True)
+
+    def copy_file(self, source: str | Path, path: str) -> None:
+        destination = self.root / path
+        self._mkdir(destination.parent)
+        shutil.copy2(source, destination)
+
+    def copy_tree(self, source: str | Path, path: str) -> None:
+        shutil.copytree(source, self.root / path, dirs_exist_ok=True)
+
+
+class MemoryBackend(OutputBackend):
+    """
+    Keeps the outputs in memory.
+
+    Use it to render a whole site without touching the disk, to measure the render throughput on its own or to serve
+    a preview straight from memory.
+
+    Attributes:
+        files: Mapping of the path of every output to its content. Static files are stored as bytes.
+    """
+
+    supports_processes = False
+
+    def __init__(self) -> None:
+        self.files: dict[str, str | bytes] = {}
+        self._versions: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def _store(self, path: str, content: str | bytes) -> None:
+        with self._lock:
+            self.files[path] = content
+            self._versions[path] = self._versions.get(path, 0) + 1
+
+    def write_text(self, path: str, content: str) -> int:
+        self._store(path, content)
+        return len(content)
+
+    def read_text(self, path: str) -> str | None:
+        content = self.files.get(path)
+        return content.decode() if isinstance(content, bytes) else content
+
+    def stat(self, path: str) -> tuple[int, int] | None:
+        with self._lock:
+            if path not in self.files:
+                return None
+            return self._versions[path], len(self.files[path])
+
+    def delete(self, path: str) -> None:
+        with self._lock:
+            self.files.pop(path, None)
+
+    def copy_file(self, source: str | Path, path: str) -> None:
+        self._store(path, Path(source).read_bytes())
+
+
+class ArchiveBackend(OutputBackend):
+    """
+    Streams the outputs straight into a tar, tar.gz or zip archive, without writing an output directory first.
+
+    The archive is created when a build starts and finalized when it ends. Entries are added as they are rendered and
+    the archive is locked while an entry is added, so it can be used with the parallel renderers. Entries cannot be
+    read back once they are added to the archive.
+
+    A build that updates the outputs, such as `Site.rebuild`, writes a new archive as well. When it is finalized, the
+    entries of the previous archive that were not written again or deleted are copied into it.
+
+    Attributes:
+        path: The path of the archive.
+        format: `tar`, `tar.gz`, `tar.bz2`, `tar.xz` or `zip`. Guessed from the suffix of `path` when not given.
+        prefix: A directory inside the archive that every entry is added to.
+    """
+
+    FORMATS = {
+        ".tar": "tar",
+        ".tar.gz": "tar.gz",
+        ".tgz": "tar.gz",
+        ".tar.bz2": "tar.bz2",
+        ".tar.xz": "tar.xz",
+        ".zip": "zip",
+    }
+    supports_processes = False
+
+    _TAR_OPENERS: dict[str, Callable[..., tarfile.TarFile]] = {
+        "tar": tarfile.TarFile.taropen,
+        "tar.gz": tarfile.TarFile.gzopen,
+        "tar.bz2": tarfile.TarFile.bz2open,
+        "tar.xz": tarfile.TarFile.xzopen,
+    }
+
+    def __init__(self, path: str | Path, format: str | None = None, prefix: str = "") -> None:
+        self.path = Path(path)
+        if format is None:
+            suffix = next((suffix for suffix in self.FORMATS if self.path.name.endswith(suffix)), None)
+            if suffix is None:
+                raise ValueError(f"Unable to guess the archive format of {self.path}. Pass `format`.")
+            format = self.FORMATS[suffix]
+        if format not in self.FORMATS.values():
+            raise ValueError(
+                f"Unknown archive format {format!r}. Expected one of {sorted(set(self.FORMATS.values()))}."
+            )
+        self.format = format
+        self.prefix = output_key(prefix).strip("/") if prefix else ""
+        self._archive: tarfile.TarFile | zipfile.ZipFile | None = None
+        self._entries: dict[str, tuple[int, int]] = {}
+        self._mtime = time.time()
+        self._update = False
+        # The archive of the previous build while an update is written, and the entries not to copy from it.
+        self._previous: Path | None = None
+        self._replaced: set[str] = set()
+        self._lock = threading.Lock()
+
+    def _name(self, path: str) -> str:
+        return f"{self.prefix}/{path}" if self.prefix else path
+
+    def open(self, update: bool = False) -> None:
+        with self._lock:
+            self._update = update
+            self._open()
+
+    def _open(self) -> tarfile.TarFile | zipfile.ZipFile:
+        """Create the archive unless it is open. Must be called with the lock held."""
+        if self._archive is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            if self._update and self.path.exists():
+                self._previous = self.path.replace(self.path.with_name(f"{self.path.name}.previous"))
+            else:
+                self._entries = {}
+            self._replaced = set()
+            self._mtime = time.time()
+            if self.format == "zip":
+                self._archive = zipfile.ZipFile(self.path, "w", compression=zipfile.ZIP_DEFLATED)
+            else:
+                self._archive = self._TAR_OPENERS[self.format](self.path, "w")
+        return self._archive
+
+    def _copy_previous(self, archive: tarfile.TarFile | zipfile.ZipFile, previous: Path) -> None:
+        """Copy the entries of the previous archive that were not written again or deleted"""
+        if isinstance(archive, zipfile.ZipFile):
+            with zipfile.ZipFile(previous) as source:
+                for info in source.infolist():
+                    if info.filename not in self._replaced:
+                        archive.writestr(info, source.read(info))
+        else:
+            with tarfile.open(previous) as source:
+                for member in source.getmembers():
+                    if member.name not in self._replaced:
+                        archive.addfile(member, source.extractfile(member))
+
+    def close(self) -> None:
+        with self._lock:
+            if self._archive is not None:
+                if self._previous is not None:
+                    self._copy_previous(self._archive, self._previous)
+                    self._previous.unlink()
+                    self._previous = None
+                self._archive.close()
+                self._archive = None
+
+    def _add(self, path: str, data: bytes) -> None:
+        with self._lock:
+            archive = self._open()
+            name = self._name(path)
+            if isinstance(archive, zipfile.ZipFile):
+                info = zipfile.ZipInfo(name, date_time=time.localtime(self._mtime)[:6])
+                info.compress_type = zipfile.ZIP_DEFLATED
+                info.external_attr = 0o644 << 16
+                archive.writestr(info, data)
+            else:
+                tar_info = tarfile.TarInfo(name)
+                tar_info.size = len(data)
+                tar_info.mtime = int(self._mtime)
+                tar_info.mode = 0o644
+                archive.addfile(tar_info, io.BytesIO(data))
+            version, _ = self._entries.get(path, (0, 0))
+            self._entries[path] = (version + 1, len(data))
+            self._replaced.add(name)
+
+    def write_text(self, path: str, content: str) -> int:
+        self._add(path, content.encode())
+        return len(content)
+
+    def read_text(self, path: str) -> str | None:
+        return None
+
+    def stat(self, path: str) -> tuple[int, int] | None:
+        with self._lock:
+            return self._entries.get(path)
+
+    def delete(self, path: str) -> None:
+        # Entries that were already streamed into the archive stay in it, but are not copied by an update.
+        with self._lock:
+            self._entries.pop(path, None)
+            self._replaced.add(self._name(path))
+
+    def copy_file(self, source: str | Path, path: str) -> None:
+        self._add(path, Path(source).read_bytes())
+
+
+class OutputWriter:
+    """
+    Writes rendered outputs to an output backend.
+
+    When `write_if_changed` is set, an output whose content is the same as the one already stored is not written
+    again. Its modification time is kept, which keeps tools that compare modification times (rsync, CDN uploads) from
+    transferring it again. The digest and the backend's signature of every output written are remembered so that an
+    output that has not been touched since it was written does not have to be read to be compared.
+
+    When `threads` is set, `write_text` only queues the output and returns. Dedicated I/O threads take the outputs off
+    the queue in batches of up to `batch_size` and write them. The queue holds at most `queue_size` outputs: when the
+    render workers outrun the disk, `write_text` blocks until there is room so memory stays bounded. Call `flush` to
+    wait for the queued outputs to be written.
+
+    Directories that were already created are remembered so that writing many outputs to the same directory does not
+    create it again for every output.
+
+    Attributes:
+        write_if_changed: Whether to skip writing outputs whose content did not change.
+        threads: The number of I/O threads. 0 writes from the thread calling `write_text`.
+        queue_size: The maximum number of outputs waiting to be written.
+        batch_size: The maximum number of outputs an I/O thread takes off the queue at once.
+        written: The number of files written since the counters were reset.
+        unchanged: The number of files that were not written because their content did not change.
+        bytes_written: The size, in bytes, of the files written since the counters were reset.
+    """
+
+    def __init__(
+        self,
+        backend: OutputBackend,
+        write_if_changed: bool = False,
+        threads: int = 0,
+        queue_size: int = 256,
+        batch_size: int = 32,
+    ) -> None:
+        self.write_if_changed = write_if_changed
+        self.threads = threads
+        self.queue_size = queue_size
+        self.batch_size = batch_size
+        self.written = 0
+        self.unchanged = 0
+        self.bytes_written = 0
+        self._backend = backend
+        self._digests: dict[str, tuple[str, tuple[int, int]]] = {}
+        self._lock = threading.Lock()
+        self._queue: queue.Queue | None = None
+        self._workers: list[threading.Thread] = []
+        # Outputs are only queued by the process that created the writer, not by forked worker processes.
+        self._owner = os.getpid()
+        self._error: BaseException | None = None
+
+    @property
+    def backend(self) -> OutputBackend:
+        return self._backend
+
+    @backend.setter
+    def backend(self, backend: OutputBackend) -> None:
+        if backend is not self._backend:
+            with self._lock:
+                self._digests.clear()
+            self._backend = backend
+
+    @staticmethod
+    def _digest(content: str) -> str:
+        return hashlib.sha256(content.encode("utf-8", "surrogatepass")).hexdigest()
+
+    def _is_unchanged(self, path: str, content_digest: str, content: str) -> bool:
+        """Whether the output at `path` already has `content`"""
+        if (stat := self._backend.stat(path)) is None:
+            return False
+        with self._lock:
+            recorded = self._digests.get(path)
+        if recorded is not None and recorded[1] == stat:
+            return recorded[0] == content_digest
+        try:
+            return self._backend.read_text(path) == content
+        except (OSError, UnicodeDecodeError):
+            return False
+
+    def _write(self, path: str, content: str) -> int:
+        """Write an output now"""
+        content_digest = self._digest(content) if self.write_if_changed else ""
+        if self.write_if_changed and self._is_unchanged(path, content_digest, content):
+            with self._lock:
+                self.unchanged += 1
+            return 0
+
+        written = self._backend.write_text(path, content)
+        if self.write_if_changed and (stat := self._backend.stat(path)) is not None:
+            with self._lock:
+                self._digests[path] = (content_digest, stat)
+        size = len(content) if content.isascii() else len(content.encode("utf-8", "surrogatepass"))
+        with self._lock:
+            self.written += 1
+            self.bytes_written += size
+        return written
+
+    def _start(self) -> bool:
+        """
+        Start the I/O threads if they are not running.
+
+        :return: Whether outputs can be queued. They cannot in a forked worker process, where the I/O threads of the
+            parent do not exist.
+        """
+        if os.getpid() != self._owner:
+            return False
+        with self._lock:
+            if self._queue is None:
+                self._queue = queue.Queue(maxsize=self.queue_size)
+                self._workers = [
+                    threading.Thread(target=self._serve, name=f"render_engine_writer_{index}", daemon=True)
+                    for index in range(self.threads)
+                ]
+                for worker in self._workers:
+                    worker.start()
+        return True
+
+    def _serve(self) -> None:
+        """Write batches of queued outputs until stopped"""
+        assert self._queue is not None
+        output_queue = self._queue
+        while True:
+            batch = []
+            item = output_queue.get()
+            # Each thread takes a single stop marker so that every thread gets one
+            while item is not _STOP:
+                batch.append(item)
+                if len(batch) == self.batch_size:
+                    break
+                try:
+                    item = output_queue.get_nowait()
+                except queue.Empty:
+                    break
+            # Grouping the batch by directory keeps the directory cache and the file system's directory entries warm.
+            for path, content in sorted(batch, key=lambda item: item[0].rpartition("/")[0]):
+                try:
+                    self._write(path, content)
+                except BaseException as e:
+                    logger.error(f"Unable to write {path}", exc_info=True)
+                    with self._lock:
+                        self._error = self._error or e
+                output_queue.task_done()
+            if item is _STOP:
+                output_queue.task_done()
+                return
+
+    def write_text(self, path: str | Path, content: str) -> int:
+        """
+        Write an output.
+
+        With I/O threads the output is queued and written later. This blocks while the queue is full.
+
+        :param path: The path of the output, relative to the output path.
+        :param content: The rendered content.
+        :return: The number of characters written or queued. 0 if the output was unchanged and not written.
+        """
+        path = output_key(path)
+        if self.threads and self._start():
+            assert self._queue is not None
+            self._queue.put((path, content))
+            return len(content)
+        return self._write(path, content)
+
+    def flush(self) -> None:
+        """
+        Wait for every queued output to be written.
+
+        Raises the first error that an I/O thread ran into since the last flush.
+        """
+        if self._queue is not None and os.getpid() == self._owner:
+            self._queue.join()
+        with self._lock:
+            error, self._error = self._error, None
+        if error is not None:
+            raise error
+
+    def close(self) -> None:
+        """Write the queued outputs and stop the I/O threads. They are started again by the next write."""
+        if self._queue is None or os.getpid() != self._owner:
+            return
+        for _ in self._workers:
+            self._queue.put(_STOP)
+        for worker in self._workers:
+            worker.join()
+        with self._lock:
+            self._queue = None
+            self._workers = []
+
+    def counts(self) -> tuple[int, int]:
+        """The number of files written and the number of unchanged files"""
+        with self._lock:
+            return self.written, self.unchanged
+
+    def add_counts(self, written: int, unchanged: int, bytes_written: int = 0) -> None:
+        """Add the counts of outputs written by another process"""
+        with self._lock:
+            self.written += written
+            self.unchanged += unchanged
+            self.bytes_written += bytes_written
+
+    def reset(self) -> None:
+        """Reset the counters at the start of a build"""
+        with self._lock:
+            self.written = 0
+            self.unchanged = 0
+            self.bytes_written = 0
@@ -1,5 +1,9 @@
+import copy
+import functools
 import logging
 import re
+import threading
+from collections import ChainMap
 from pathlib import Path
 from typing import Any, cast
 
@@ -9,10 +13,74 @@ from render_engine.themes import ThemeManager
 
 from ._base_object import BaseObject
 from .parsers import BasePageParser
+from .parsers.base_parsers import metadata_path_parser
 
 logger = logging.getLogger("Page")
 
 
+class ContentParseStats:
+    """
+    Counts how often the content of pages was parsed and how often a cached parse was used instead.
+
+    Attributes:
+        parsed: The number of times the content of a page was parsed.
+        skipped: The number of parses that were skipped because the page had already parsed the same content.
+    """
+
+    def __init__(self) -> None:
+        self.parsed = 0
+        self.skipped = 0
+        self._lock = threading.Lock()
+
+    def add(self, parsed: int = 0, skipped: int = 0) -> None:
+        with self._lock:
+            self.parsed += parsed
+            self.skipped += skipped
+
+    def reset(self) -> None:
+        with self._lock:
+            self.parsed = 0
+            self.skipped = 0
+
+
+# The parse counters of the current process. Reset at the start of every build.
+parse_stats = ContentParseStats()
+
+_SITE_MAP_REFERENCE = re.compile(r"{{.*?site_map.*?}}")
+
+
+@functools.lru_cache(maxsize=256)
+def _content_template(content: str) -> Template | None:
+    """
+    The template to pre-render the content of a page with, or None if the content does not use the site map.
+
+    Templates are cached by content, so the content shared by several pages, or rendered again by a later build, is
+    only searched and compiled once. Content that fails to compile raises every time and is not cached.
+    """
+    if not _SITE_MAP_REFERENCE.search(content):
+        return None
+    return Template(content)
+
+
+def _render_template(template: Template, context: ChainMap) -> str:
+    """
+    Renders `template` with a layered context.
+
+    `Template.render` copies the variables and the globals of the template into a new dict for every render. The
+    layers of `context` are passed to Jinja as they are instead, with the globals of the template as the last one.
+    """
+    if template.environment.is_async:
+        return template.render(dict(context))
+    # `new_context` is annotated with `dict`, but with `shared` set Jinja only reads the variables through the
+    # `Mapping` interface, so the layers are not copied into one
+    layers = cast(dict[str, Any], ChainMap(*context.maps, template.globals))
+    jinja_context = template.new_context(layers, shared=True)
+    try:
+        return template.environment.concat(template.root_render_func(jinja_context))  # type: ignore[arg-type]
+    except Exception:
+        return template.environment.handle_exception()
+
+
 class BasePage(BaseObject):
     """
     This is the Base Page object.
@@ -76,42 +144,47 @@ class BasePage(BaseObject):
         """
         Renders the page from a template.
 
-        If the content looks like a template that
+        If the content looks like a template that uses the site map, it is rendered as a template first. The compiled
+        content templates are cached by content.
 
         :param template: Template to render
         :param **kwargs: Data to pass into the template for rendering.
         :return: The rendered page
         """
 
-        template_data = {"data": self._data, "content": self._content}
+        content = self._content
+        template_data = {"data": self._data, "content": content}
         if site := getattr(self, "site", None):
             template_data["site_map"] = site.site_map
+        # Built once for the pre-render and the render. `template_data` is a layer, so a pre-rendered content is seen.
+        context = ChainMap(kwargs, template_data, *self.render_context().maps)
 
-        if not self.no_prerender and isinstance(self._content, str) and re.search(r"{{.*?site_map.*?}}", self._content):
+        if self._may_prerender(content):
             # If the content looks like a template, try to render it.
             try:
-                content_template = Template(self._content)
+                content_template = _content_template(content)
             except Exception:
+                content_template = None
                 logger.info(f"Failed to parse {repr(self.path_name)} as a template.", exc_info=True)
-            else:
+            if content_template is not None:
                 try:
-                    template_data["content"] = content_template.render(
-                        **{
-                            **self.to_dict(),
-                            **template_data,
-                            **kwargs,
-                        }
-                    )
+                    template_data["content"] = _render_template(content_template, context)
                 except Exception:
                     logger.info(f"Failed to pre-render {repr(self.path_name)}.", exc_info=True)
 
-        return template.render(
-            **{
-                **self.to_dict(),
-                **template_data,
-                **kwargs,
-            },
-        )
+        return _render_template(template, context)
+
+    def _may_prerender(self, content: Any) -> bool:
+        """
+        Whether the parsed `content` may use the site map and has to be checked for pre-rendering.
+
+        Parsers do not add references to the site map, so pages whose source content does not mention it are never
+        searched or compiled as templates.
+        """
+        if self.no_prerender or not isinstance(content, str):
+            return False
+        source = getattr(self, "content", None)
+        return not isinstance(source, str) or "site_map" in source
 
     def _render_content(self, engine: Environment | None = None, **kwargs) -> str:
         """
@@ -156,19 +229,24 @@ class BasePage(BaseObject):
 
         site: Site = cast(Site, self.site)
 
+        # The settings are only built, and the hooks only called, when a plugin implements them.
+        pm = getattr(self, "plugin_manager", None)
+        render_hook = pm is not None and pm.implements("render_content")
+        post_render_hook = pm is not None and pm.implements("post_render_content")
+
         for route in self.routes:
-            path = Path(site.output_path) / Path(route) / Path(self.path_name)
-            path.parent.mkdir(parents=True, exist_ok=True)
+            path = Path(route) / Path(self.path_name)
             settings = dict()
-            if (pm := getattr(self, "plugin_manager", None)) and pm is not None:
+            if render_hook or post_render_hook:
+                # pass the route to the plugin settings
                 settings = {**site.plugin_manager.plugin_settings, "route": route}
+            if render_hook:
                 pm.hook.render_content(page=self, settings=settings, site=self.site)
             self.rendered_content = self._render_content(theme_manager.engine)
-            # pass the route to the plugin settings
-            if pm is not None:
+            if post_render_hook:
                 pm.hook.post_render_content(page=self.__class__, settings=settings, site=self.site)
 
-            rc += path.write_text(self.rendered_content)
+            rc += site.output_writer.write_text(path, self.rendered_content)
         return rc
 
 
@@ -221,6 +299,8 @@ class Page(BasePage):
         content_path: Path | str | None = None,
         content: Any | None = None,
         Parser: type[BasePageParser] | None = None,
+        lazy: bool = False,
+        metadata: dict | None = None,
     ) -> None:
         """
         Initializes a new Page object.
@@ -230,13 +310,26 @@ class Page(BasePage):
             content (Any, optional): The content of the page.
             Parser (type[BasePageParser], optional): The parser to generate the page's `raw_content`.
                 Defaults to `BasePageParser`.
+            lazy (bool, optional): Only read the frontmatter of `content_path` now and read the content the first
+                time it is used. Pages whose Parser can only parse the whole file are loaded at once. Defaults to False.
+            metadata (dict, optional): The attributes already parsed from `content_path` or `content`. When given,
+                `content` is used as it is and the Parser is not called.
         """
         if Parser:
             self.Parser = cast(type[BasePageParser], Parser)
 
+        content_path = content_path or getattr(self, "content_path", None)
+
         # Parse Content from the Content Path or the Content
-        if content_path := (content_path or getattr(self, "content_path", None)):
-            self.metadata, self.content = self.Parser.parse_content_path(content_path)
+        if metadata is not None:
+            self.metadata, self.content = metadata, content if content is not None else ""
+
+        elif content_path:
+            if lazy and (parse_metadata_path := metadata_path_parser(self.Parser)) is not None:
+                self.metadata = parse_metadata_path(content_path)
+                self._lazy_content_path = content_path
+            else:
+                self.metadata, self.content = self.Parser.parse_content_path(content_path)
 
         elif content := (content or getattr(self, "content", None)):
             self.metadata, self.content = self.Parser.parse_content(content)
@@ -251,18 +344,76 @@ class Page(BasePage):
 
         self.content_path = content_path
 
+    def __getattr__(self, name: str) -> Any:
+        # Only called when `name` is not found, so this costs nothing once the content of a lazy page is loaded.
+        if name == "content" and (content_path := self.__dict__.get("_lazy_content_path")) is not None:
+            _, content = self.Parser.parse_content_path(content_path)
+            self.content = content
+            self.__dict__.pop("_lazy_content_path", None)
+            return content
+        raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+
     @property
     def _content(self) -> Any:
         """
         Returns the parsed content of the page.
 
+        The parsed content is cached on the page so the content is only parsed once per build even though the
+        templates, feeds and plugins read it several times. The cache is invalidated when `content`, `Parser` or
+        `parser_extras` change. When the site has a persistent parse cache, content that was parsed by a previous
+        build is read from it instead of being parsed again.
+
         Returns:
             Any: The parsed content of the page.
         """
         content = getattr(self, "content", None)
-        if content:
-            return self.Parser.parse(content, extras=getattr(self, "parser_extras", {}))
-        return content
+        if not content:
+            return content
+        extras = getattr(self, "parser_extras", {})
+        found, parsed = self._cached_content(content, extras)
+        if not found:
+            parsed = self.Parser.parse(content, extras=extras)
+            parse_stats.add(parsed=1)
+            self._store_content(content, extras, parsed)
+        return parsed
+
+    def _cached_content(self, content: Any, extras: Any) -> tuple[bool, Any]:
+        """
+        Looks up the parsed content in the cache of the page, then in the persistent parse cache of the site.
+
+        Returns:
+            tuple[bool, Any]: Whether the parsed content was found and the parsed content.
+        """
+        cached = self.__dict__.get("_content_cache")
+        if cached is not None:
+            cached_content, cached_parser, cached_extras, parsed = cached
+            if cached_parser is self.Parser and cached_content == content and cached_extras == extras:
+                parse_stats.add(skipped=1)
+                return True, parsed
+        parse_cache = getattr(getattr(self, "site", None), "parse_cache", None)
+        if (
+            parse_cache is not None
+            and (key := parse_cache.key(self.Parser, content, extras)) is not None
+            and (parsed := parse_cache.get(key)) is not None
+        ):
+            self._store_content(content, extras, parsed, persist=False)
+            return True, parsed
+        return False, None
+
+    def _store_content(self, content: Any, extras: Any, parsed: Any, persist: bool = True) -> None:
+        """
+        Caches the parsed content on the page and, with `persist`, in the persistent parse cache of the site.
+        """
+        parse_cache = getattr(getattr(self, "site", None), "parse_cache", None)
+        if persist and parse_cache is not None and isinstance(parsed, str):
+            if (key := parse_cache.key(self.Parser, content, extras)) is not None:
+                parse_cache.put(key, parsed)
+        try:
+            extras_snapshot = copy.deepcopy(extras)
+        except Exception:
+            # Extras that cannot be copied are kept as they are, so changes made to them in place are not detected.
+            extras_snapshot = extras
+        self._content_cache = (content, self.Parser, extras_snapshot, parsed)
 
 
 class RedirectPage(Page):
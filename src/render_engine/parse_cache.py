@@ -0,0 +1,239 @@
+"""
+Persistent cache of parsed page content.
+
+Converting Markdown to HTML is the most expensive part of rendering most pages. The parse cache stores the result of
+`Parser.parse` on disk, keyed by the parser, its version, the parser extras and a hash of the content, so that pages
+whose content did not change are not converted again by the next build, even in a fresh process or on another CI run
+that restores the cache directory.
+"""
+
+import functools
+import hashlib
+import importlib.metadata
+import logging
+import marshal
+import os
+import sqlite3
+import sys
+import threading
+import time
+import types
+import weakref
+from pathlib import Path
+from typing import Any
+
+from .manifest import digest
+
+logger = logging.getLogger("ParseCache")
+
+PARSE_CACHE_NAME = "parse_cache.sqlite3"
+
+
+@functools.lru_cache
+def _package_version(package: str) -> str:
+    """The version of the distributions providing a top level package"""
+    distributions = importlib.metadata.packages_distributions().get(package, [])
+    versions = []
+    for distribution in sorted(set(distributions)):
+        try:
+            versions.append(f"{distribution}=={importlib.metadata.version(distribution)}")
+        except importlib.metadata.PackageNotFoundError:
+            continue
+    if not versions and (version := getattr(sys.modules.get(package), "__version__", None)):
+        versions.append(f"{package}=={version}")
+    return ",".join(versions)
+
+
+@functools.lru_cache
+def parser_version(Parser: type) -> str:
+    """
+    The version of a parser.
+
+    A parser can set `cache_version` to control when its cached results are invalidated. Otherwise the version is made
+    of the code of its `parse` method and the versions of the packages it comes from and calls into (for instance
+    `render-engine-markdown` and `markdown2` for the `MarkdownPageParser`).
+    """
+    if (version := getattr(Parser, "cache_version", None)) is not None:
+        return str(version)
+    parse = getattr(Parser, "parse", None)
+    code = getattr(parse, "__code__", None)
+    packages = {Parser.__module__.partition(".")[0]}
+    code_digest = ""
+    if code is not None:
+        code_digest = hashlib.sha256(marshal.dumps(code)).hexdigest()
+        parse_globals = getattr(parse, "__globals__", {})
+        for name in code.co_names:
+            value = parse_globals.get(name)
+            module = value.__name__ if isinstance(value, types.ModuleType) else getattr(value, "__module__", None)
+            if isinstance(module, str):
+                packages.add(module.partition(".")[0])
+    return digest(code_digest, sorted(f"{package}:{_package_version(package)}" for package in packages))
+
+
+class ParseCache:
+    """
+    Maps (parser, parser version, extras, content hash) to the parsed content, in a SQLite database.
+
+    The cache holds at most `max_size` bytes of parsed content. When it grows past that, the entries that were used
+    least recently are evicted when the cache is closed at the end of a build.
+
+    The cache can be used from several threads and from forked worker processes, which open their own connection. The
+    entries read by a worker and its hits and misses are sent back to the parent with the result of each unit (see
+    `take_usage` and `add_usage`), so the parent records when they were used and evicts them accordingly.
+
+    Attributes:
+        path: The path of the database.
+        max_size: The maximum size of the cached content in bytes.
+        hits: The number of parses that were served from the cache.
+        misses: The number of parses that were not in the cache.
+    """
+
+    def __init__(self, path: str | Path, max_size: int = 256 * 1024 * 1024) -> None:
+        self.path = Path(path)
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._connection: sqlite3.Connection | None = None
+        self._pid: int | None = None
+        self._owner = os.getpid()
+        self._used: dict[str, float] = {}
+        self._inherited: list[sqlite3.Connection] = []
+        self._lock = threading.RLock()
+        if hasattr(os, "register_at_fork"):
+            cache = weakref.ref(self)
+            os.register_at_fork(after_in_child=lambda: (instance := cache()) is not None and instance._after_fork())
+
+    def _after_fork(self) -> None:
+        """
+        Start from a fresh lock in a forked worker, a render thread of the parent may have held it.
+
+        The usage inherited from the parent is dropped, the worker only reports its own.
+        """
+        self._lock = threading.RLock()
+        self._used, self.hits, self.misses = {}, 0, 0
+
+    def _connect(self) -> sqlite3.Connection:
+        """The connection of the current process. Must be called with the lock held."""
+        if self._connection is None or self._pid != os.getpid():
+            # A connection must not be used, nor closed, across a fork, so worker processes open their own and keep a
+            # reference to the one inherited from the parent.
+            if self._connection is not None:
+                self._inherited.append(self._connection)
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._connection = sqlite3.connect(self.path, check_same_thread=False, timeout=30, isolation_level=None)
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS parsed (key TEXT PRIMARY KEY, value TEXT, size INTEGER, used REAL)"
+            )
+            self._pid = os.getpid()
+        return self._connection
+
+    @staticmethod
+    def key(Parser: type, content: Any, extras: Any) -> str | None:
+        """
+        The cache key for parsing `content` with `Parser` and `extras`.
+
+        :return: The key or None if the content cannot be cached.
+        """
+        if not isinstance(content, str):
+            return None
+        content_digest = hashlib.sha256(content.encode("utf-8", "surrogatepass")).hexdigest()
+        return digest(f"{Parser.__module__}.{Parser.__qualname__}", parser_version(Parser), extras, content_digest)
+
+    def get(self, key: str) -> str | None:
+        """The parsed content stored for `key` or None"""
+        with self._lock:
+            try:
+                row = self._connect().execute("SELECT value FROM parsed WHERE key = ?", (key,)).fetchone()
+            except sqlite3.Error:
+                logger.warning(f"Unable to read the parse cache at {self.path}.", exc_info=True)
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._used[key] = time.time()
+            return row[0]
+
+    def take_usage(self) -> tuple[dict[str, float], int, int]:
+        """
+        The entries read since the last call, with when they were read, and the number of hits and misses since then.
+
+        Used by worker processes to report what they read to the parent, whose cache records it with `add_usage`.
+        """
+        with self._lock:
+            usage = (self._used, self.hits, self.misses)
+            self._used, self.hits, self.misses = {}, 0, 0
+            return usage
+
+    def add_usage(self, used: dict[str, float], hits: int, misses: int) -> None:
+        """Record the entries read and the hits and misses of a worker process, as returned by `take_usage`"""
+        with self._lock:
+            for key, when in used.items():
+                self._used[key] = max(when, self._used.get(key, when))
+            self.hits += hits
+            self.misses += misses
+
+    def put(self, key: str, value: str) -> None:
+        """Store the parsed content for `key`"""
+        with self._lock:
+            try:
+                self._connect().execute(
+                    "INSERT OR REPLACE INTO parsed (key, value, size, used) VALUES (?, ?, ?, ?)",
+                    (key, value, len(value.encode("utf-8", "surrogatepass")), time.time()),
+                )
+            except sqlite3.Error:
+                logger.warning(f"Unable to write to the parse cache at {self.path}.", exc_info=True)
+
+    def size(self) -> int:
+        """The size of the cached content in bytes"""
+        with self._lock:
+            return self._connect().execute("SELECT COALESCE(SUM(size), 0) FROM parsed").fetchone()[0]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connect().execute("SELECT COUNT(*) FROM parsed").fetchone()[0]
+
+    def evict(self) -> int:
+        """
+        Remove the least recently used entries until the cache holds at most `max_size` bytes.
+
+        :return: The number of entries removed.
+        """
+        with self._lock:
+            connection = self._connect()
+            excess = self.size() - self.max_size
+            if excess <= 0:
+                return 0
+            keys = []
+            for key, size in connection.execute("SELECT key, size FROM parsed ORDER BY used"):
+                keys.append((key,))
+                excess -= size
+                if excess <= 0:
+                    break
+            connection.executemany("DELETE FROM parsed WHERE key = ?", keys)
+            return len(keys)
+
+    def clear(self) -> None:
+        """Remove every entry"""
+        with self._lock:
+            self._connect().execute("DELETE FROM parsed")
+            self._used = {}
+
+    def close(self) -> None:
+        """Record when the entries that were read were last used, evict and close the database"""
+        with self._lock:
+            # Worker processes report their usage to the parent, which records it.
+            if os.getpid() != self._owner or (self._connection is None and not self._used):
+                return
+            try:
+                self._connect().executemany(
+                    "UPDATE parsed SET used = ? WHERE key = ?", [(used, key) for key, used in self._used.items()]
+                )
+                self.evict()
+            finally:
+                if self._connection is not None:
+                    self._connection.close()
+                self._connection = None
+                self._used = {}
@@ -1,13 +1,142 @@
 import pathlib
+import re
+from collections.abc import Callable, Iterable, Sequence
 from typing import Any
 
 import frontmatter
+import yaml
+import yaml.resolver
+from frontmatter.default_handlers import YAMLHandler
+
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader  # type: ignore[assignment]
+
+_YAML_BOUNDARY = YAMLHandler.FM_BOUNDARY
+_SIMPLE_KEY = re.compile(r"[A-Za-z_][A-Za-z0-9_-]*")
+# Characters that give a special meaning to the start of a YAML scalar
+_INDICATORS = frozenset("-?:,[]{}#&*!|>'\"%@`")
+_STR_TAG = "tag:yaml.org,2002:str"
+_resolver = yaml.resolver.Resolver()
+# The first characters of the scalars that YAML may load as something other than a string (numbers, dates, booleans...)
+_RESOLVED_STARTS = frozenset(start for start in _resolver.yaml_implicit_resolvers if start)
+# Lines that are certainly not `key: plain string`: an empty or nested value, a list item, or a value that starts like
+# a number, a date, a flow collection or a quoted string, or that is a boolean or null. Checked for the whole
+# frontmatter at once so typed headers go to the YAML parser without being read line by line first.
+_TYPED_LINE = re.compile(
+    rf"^(?:[ \t-]|[^\n:]*:(?:[ ]*$|[ ]+(?:[{re.escape(''.join(sorted(_INDICATORS)))}0-9+.~]|"
+    rf"(?:(?:[Yy]es|YES|[Nn]o|NO|[Tt]rue|TRUE|[Ff]alse|FALSE|[Oo]n|ON|[Oo]ff|OFF|[Nn]ull|NULL)[ ]*$))))",
+    re.MULTILINE,
+)
+
+
+def _is_plain_string(scalar: str) -> bool:
+    """Whether YAML loads `scalar`, written without quotes, as this exact string"""
+    return (
+        scalar[0] not in _INDICATORS
+        and not scalar.endswith(":")
+        and ": " not in scalar
+        and " #" not in scalar
+        and scalar.isprintable()
+        and (scalar[0] not in _RESOLVED_STARTS or _resolver.resolve(yaml.ScalarNode, scalar, (True, False)) == _STR_TAG)
+    )
+
+
+def _parse_simple_yaml(fm: str) -> dict | None:
+    """
+    Parse YAML frontmatter made only of `key: value` lines without going through a YAML parser.
+
+    Only values that YAML would load as plain strings are accepted, so the result is the same as loading the YAML.
+
+    :return: The attributes or None if the frontmatter needs a YAML parser.
+    """
+    if _TYPED_LINE.search(fm):
+        return None
+    metadata = {}
+    for line in fm.split("\n"):
+        if not line.strip(" "):
+            continue
+        key, separator, value = line.partition(": ")
+        value = value.strip(" ")
+        if not (separator and value and _SIMPLE_KEY.fullmatch(key) and _is_plain_string(key)):
+            return None
+        if not _is_plain_string(value):
+            return None
+        metadata[key] = value
+    return metadata
 
 
 def parse_content(content: str) -> tuple[dict, str]:
-    """Fetching content and atttributes from a content_path"""
-    p = frontmatter.parse(content)
-    return p
+    """
+    Fetching content and atttributes from a content_path
+
+    YAML frontmatter is handled here rather than by `frontmatter.parse`: simple `key: value` headers are read without
+    a YAML parser and the others are loaded with the C YAML loader when it is available. The result is the same as
+    `frontmatter.parse(content)`, which handles any other frontmatter format.
+    """
+    if not isinstance(content, str):
+        return frontmatter.parse(content)
+    text = content.replace("\r\n", "\n").strip()
+    if not _YAML_BOUNDARY.match(text):
+        if frontmatter.detect_format(text, frontmatter.handlers) is None:
+            return {}, text
+        return frontmatter.parse(content)
+    try:
+        _, fm, body = _YAML_BOUNDARY.split(text, 2)
+    except ValueError:
+        return {}, text
+    metadata = _parse_simple_yaml(fm)
+    if metadata is None:
+        fm_data = yaml.load(fm, Loader=SafeLoader)
+        metadata = fm_data if isinstance(fm_data, dict) else {}
+    return metadata, body.strip()
+
+
+def parse_metadata(lines: Iterable[str]) -> dict:
+    """
+    Fetching the attributes from the frontmatter block at the start of `lines`.
+
+    Only the lines up to the end of the frontmatter block are read, and the attributes are the same as the ones
+    returned by `parse_content` for the whole text.
+    """
+    header: list[str] = []
+    handler = None
+    for line in lines:
+        if handler is None:
+            if not line.strip():
+                continue
+            handler = frontmatter.detect_format(line.lstrip(), frontmatter.handlers)
+            header.append(line)
+            # Without a boundary the end of the block cannot be found
+            if handler is None or handler.FM_BOUNDARY is None:
+                break
+        else:
+            header.append(line)
+            if handler.FM_BOUNDARY is not None and handler.FM_BOUNDARY.match(line):
+                break
+    return parse_content("".join(header))[0]
+
+
+def metadata_path_parser(Parser: type) -> Callable[[str | pathlib.Path], dict] | None:
+    """
+    The function fetching only the attributes of a content path for `Parser`.
+
+    This is the `parse_metadata_path` method of the parser. Parsers built on the `BasePageParser` of the
+    `render-engine-parser` package, such as the `MarkdownPageParser`, read the frontmatter of files like this module
+    does, so the frontmatter is read with `BasePageParser.parse_metadata_path` for them.
+
+    :return: The function or None if only the whole content path can be parsed.
+    """
+    if (parse_metadata_path := getattr(Parser, "parse_metadata_path", None)) is not None:
+        return parse_metadata_path
+    parse_content_path = getattr(Parser, "parse_content_path", None)
+    if (
+        getattr(parse_content_path, "__module__", None) == "render_engine_parser.base_parsers"
+        and getattr(parse_content_path, "__qualname__", None) == "BasePageParser.parse_content_path"
+    ):
+        return BasePageParser.parse_metadata_path
+    return None
 
 
 class BasePageParser:
@@ -31,6 +160,21 @@ class BasePageParser:
         """
         return parse_content(pathlib.Path(content_path).read_text())
 
+    @staticmethod
+    def parse_metadata_path(content_path: str | pathlib.Path) -> dict:
+        """
+        Fetches the attributes from the frontmatter of `Page.content_path` without reading the rest of the file.
+
+        Used by pages that are loaded lazily. Parsers that override `parse_content_path` to read their content from
+        somewhere else should override this method as well.
+
+        params:
+            content_path:
+                The path to the file that will be used to generate the Page's `content`.
+        """
+        with open(content_path) as content_file:
+            return parse_metadata(content_file)
+
     @staticmethod
     def parse_content(content: str) -> tuple[dict, str]:
         """
@@ -62,6 +206,35 @@ class BasePageParser:
         """
         return content
 
+    @classmethod
+    def parse_content_paths(cls, content_paths: Iterable[str | pathlib.Path]) -> list[tuple[dict, str]]:
+        """
+        Fetches the content and attributes of several files at once.
+
+        Collections load all of their pages through this method. Parsers can override it to share work between the
+        files, the default calls `parse_content_path` for each of them.
+
+        params:
+            content_paths:
+                The paths to the files of the pages, the results are returned in the same order.
+        """
+        return [cls.parse_content_path(content_path) for content_path in content_paths]
+
+    @classmethod
+    def parse_many(cls, contents: Sequence[str], extras: dict[str, Any] | None = None) -> list[str]:
+        """
+        Parses the content of several pages to be rendered into HTML.
+
+        When a parser overrides this method, a collection parses its pages in batches with it before they are
+        rendered, so the parser can set itself up once per batch or hand the batch out to workers. The default calls
+        `parse` for each content.
+
+        params:
+            contents: contents to be rendered into HTML, the results are returned in the same order
+            extras: dictionary with extras to augment attributes
+        """
+        return [cls.parse(content, extras=extras) for content in contents]
+
     @staticmethod
     def create_entry(*, content: str = "Hello World", **kwargs) -> str:
         """
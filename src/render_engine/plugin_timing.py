@@ -0,0 +1,131 @@
+"""
+Timing of the plugin hooks during a build.
+
+When a Site is built with `plugin_timing` set, the implementation of every hook by every registered plugin is wrapped
+for the duration of the build and the number of calls, the total and the longest time of each (plugin, hook) pair are
+recorded.
+"""
+
+import dataclasses
+import logging
+import threading
+import time
+from collections import defaultdict
+from collections.abc import Callable, Iterable
+from typing import Any
+
+from pluggy import HookImpl
+
+from .plugins import PluginManager
+
+logger = logging.getLogger("PluginTiming")
+
+
+@dataclasses.dataclass
+class HookTiming:
+    """
+    The time a plugin spent in one of its hooks.
+
+    Attributes:
+        plugin: The name of the plugin.
+        hook: The name of the hook.
+        calls: The number of times the hook of the plugin was called.
+        total: The total time spent in the hook, in seconds.
+        max: The longest call of the hook, in seconds.
+    """
+
+    plugin: str
+    hook: str
+    calls: int = 0
+    total: float = 0.0
+    max: float = 0.0
+
+
+class PluginTimings:
+    """
+    Records how long each plugin spends in each of its hooks.
+
+    Hook implementations are timed from the moment `instrument` is called with their plugin manager until `restore`
+    is called. Hook wrappers are not timed. Hooks called in worker processes of the `process` render backend are not
+    recorded.
+
+    Attributes:
+        budget: The time, in seconds, that a plugin may spend in its hooks during a build before a warning is logged.
+    """
+
+    def __init__(self, budget: float | None = None) -> None:
+        self.budget = budget
+        self._timings: dict[tuple[str, str], HookTiming] = {}
+        self._originals: dict[HookImpl, Callable] = {}
+        self._lock = threading.Lock()
+
+    def add(self, plugin: str, hook: str, seconds: float) -> None:
+        """Record a call of the hook of a plugin that took `seconds`"""
+        with self._lock:
+            timing = self._timings.get((plugin, hook))
+            if timing is None:
+                timing = self._timings[(plugin, hook)] = HookTiming(plugin=plugin, hook=hook)
+            timing.calls += 1
+            timing.total += seconds
+            timing.max = max(timing.max, seconds)
+
+    def _timed(self, function: Callable, plugin: str, hook: str) -> Callable:
+        """Wrap a hook implementation so that its calls are recorded"""
+
+        def timed(*args: Any) -> Any:
+            start = time.perf_counter()
+            try:
+                return function(*args)
+            finally:
+                self.add(plugin, hook, time.perf_counter() - start)
+
+        return timed
+
+    def instrument(self, plugin_managers: Iterable[PluginManager]) -> None:
+        """
+        Start timing the hook implementations registered with `plugin_managers`.
+
+        Implementations that are already timed are left as they are, so this can be called again once more plugins
+        are registered.
+        """
+        for plugin_manager in plugin_managers:
+            for hook, caller in vars(plugin_manager._pm.hook).items():
+                for hook_impl in caller.get_hookimpls():
+                    if hook_impl.wrapper or hook_impl.hookwrapper or hook_impl in self._originals:
+                        continue
+                    self._originals[hook_impl] = hook_impl.function
+                    hook_impl.function = self._timed(hook_impl.function, hook_impl.plugin_name, hook)
+
+    def restore(self) -> None:
+        """Stop timing the hook implementations"""
+        for hook_impl, function in self._originals.items():
+            hook_impl.function = function  # type: ignore
+        self._originals.clear()
+
+    @property
+    def timings(self) -> list[HookTiming]:
+        """The timing of every (plugin, hook) pair that was called, the slowest first"""
+        with self._lock:
+            return sorted(self._timings.values(), key=lambda timing: timing.total, reverse=True)
+
+    def plugin_totals(self) -> dict[str, float]:
+        """The total time spent in the hooks of each plugin, in seconds"""
+        totals: dict[str, float] = defaultdict(float)
+        for timing in self.timings:
+            totals[timing.plugin] += timing.total
+        return dict(totals)
+
+    def over_budget(self) -> dict[str, float]:
+        """The plugins that spent more than `budget` in their hooks and the time they spent"""
+        if self.budget is None:
+            return {}
+        return {plugin: total for plugin, total in self.plugin_totals().items() if total > self.budget}
+
+    def log(self) -> None:
+        """Log the timing of every hook and warn about the plugins over budget"""
+        for timing in self.timings:
+            logger.info(
+                f"{timing.plugin}.{timing.hook}: {timing.calls} calls, {timing.total:.3f}s total, {timing.max:.3f}s max"
+            )
+        for plugin, total in self.over_budget().items():
+            logger.warning(f"Plugin {plugin} spent {total:.3f}s in its hooks, over the budget of {self.budget:.3f}s.")
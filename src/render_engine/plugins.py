@@ -1,3 +1,4 @@
+import copy
 import logging
 from collections import defaultdict
 from collections.abc import Iterable
@@ -69,6 +70,34 @@ class SiteSpecs:
         Augments the content of the page before it is rendered as output.
         """
 
+    @hook_spec
+    def render_content_batch(
+        self,
+        pages: list,
+        collection,
+        settings: dict[str, Any],
+        site,
+    ) -> None:
+        """
+        Augments the content of a chunk of the pages of a collection before any of them is rendered.
+
+        Called once per chunk of `render_batch_size` pages, alongside `render_content` for each page.
+        """
+
+    @hook_spec
+    def post_render_content_batch(
+        self,
+        pages: list,
+        collection,
+        settings: dict[str, Any],
+        site,
+    ) -> None:
+        """
+        Steps after a chunk of the pages of a collection has been rendered.
+
+        Called once per chunk of `render_batch_size` pages once every page of the collection is rendered.
+        """
+
     @hook_spec
     def pre_build_collection(
         self,
@@ -92,6 +121,10 @@ class PluginManager:
     """
     Manages the plugins for the site.
 
+    Copies made with `copy` share the registered plugins of the manager they were copied from. A manager only gets
+    its own registrations when it registers or unregisters a plugin, so the pages of a site that use the plugins of the
+    site do not pay for a plugin manager of their own.
+
     Attributes:
         plugin_settings (dict): A dictionary that stores the settings for each plugin.
     """
@@ -99,20 +132,77 @@ class PluginManager:
     plugin_settings: dict = defaultdict(dict)
 
     def __init__(self):
-        self._pm = pluggy.PluginManager(project_name=_PROJECT_NAME)
-        self._pm.add_hookspecs(SiteSpecs)
+        self._pm = self._new_pm()
+        # False once the registrations are shared with a copy
+        self._owned = True
+        # The names of the hooks with implementations, worked out again after the registrations change
+        self._implemented: frozenset[str] | None = None
+
+    @staticmethod
+    def _new_pm() -> pluggy.PluginManager:
+        """A pluggy plugin manager with the hook specifications of render engine"""
+        pm = pluggy.PluginManager(project_name=_PROJECT_NAME)
+        pm.add_hookspecs(SiteSpecs)
+        return pm
+
+    def copy(self) -> "PluginManager":
+        """
+        Copy the plugin manager.
+
+        The copy shares the registrations of this manager until either of them registers or unregisters a plugin.
+
+        Returns:
+            PluginManager: The copy.
+        """
+        self._owned = False
+        return copy.copy(self)
+
+    def _own(self) -> None:
+        """Give the manager registrations of its own, in the same order, before they change"""
+        if self._owned:
+            return
+        pm = self._new_pm()
+        for name, plugin in self._pm.list_name_plugin():
+            if plugin is not None:
+                pm.register(plugin, name=name)
+        self._pm = pm
+        self._owned = True
 
     def register_plugin(self, plugin) -> None:
         """Register a plugin with the plugin manager"""
         if self._pm.has_plugin(plugin.__name__):
             logging.info(f"Plugin {plugin} already registered")
             return
+        self._own()
         self._pm.register(plugin)
+        self._implemented = None
 
     def unregister_plugin(self, plugin):
         """Unregister a plugin with the plugin manager"""
         if self._pm.has_plugin(plugin.__name__):
+            self._own()
             self._pm.unregister(plugin)
+            self._implemented = None
+
+    def implements(self, hook_name: str) -> bool:
+        """
+        Whether any registered plugin implements a hook.
+
+        The hooks with implementations are worked out the first time this is called after the plugins change, and
+        copies of the manager share the result until their own plugins change. Callers use it to skip building the
+        arguments of a hook, and calling it, when no plugin would run.
+
+        Args:
+            hook_name: The name of the hook, for instance `render_content`.
+
+        Returns:
+            bool: True if at least one plugin implements the hook.
+        """
+        if self._implemented is None:
+            self._implemented = frozenset(
+                name for name, caller in vars(self._pm.hook).items() if caller.get_hookimpls()
+            )
+        return hook_name in self._implemented
 
     @property
     def plugins(self) -> set[Any]:
@@ -0,0 +1,383 @@
+"""
+Site-wide scheduling of render work.
+
+The scheduler breaks every entry in a Site's route list down into renderable units (pages, data objects and
+each page, archive and feed of a collection) and submits them all to a single shared executor.
+
+Entries using the `process` render backend are instead collected in a `BuildPlan` and rendered by forked
+worker processes once the whole site has been scheduled and the units rendered by threads have finished.
+"""
+
+import dataclasses
+import logging
+import multiprocessing
+import os
+import time
+from collections.abc import Callable
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any
+
+from ._base_object import BaseObject
+from .archive import Archive
+from .build_report import EntryTiming
+from .collection import Collection
+from .feeds import RSSFeed
+from .manifest import BuildManifest, entry_outputs
+from .output import OutputWriter
+from .parse_cache import ParseCache
+from .template_dependencies import render_recording_templates
+
+logger = logging.getLogger("Scheduler")
+
+RENDER_BACKENDS = ("thread", "process")
+
+
+class BuildPlan:
+    """
+    The units of work rendered by worker processes.
+
+    Worker processes are forked once the plan is complete, so they inherit the fully prepared site
+    (route list, theme loaders and pages) from the parent. Only the index of a unit in the plan is pickled
+    and sent to a worker and only the return value of the render (the amount written), the names of the
+    templates it used, the number of files it changed and the entries it read from the parse cache are sent back.
+    """
+
+    def __init__(self, output_writer: OutputWriter | None = None, parse_cache: ParseCache | None = None) -> None:
+        self.units: list[tuple[Callable, tuple]] = []
+        self.output_writer = output_writer
+        self.parse_cache = parse_cache
+
+    def add(self, fn: Callable, *args: Any) -> int:
+        """
+        Add a unit of work to the plan.
+
+        :param fn: The function that renders the unit.
+        :param args: The arguments for `fn`.
+        :return: The index of the unit in the plan.
+        """
+        self.units.append((fn, args))
+        return len(self.units) - 1
+
+    def __len__(self) -> int:
+        return len(self.units)
+
+
+# The plan being rendered. Set in the parent right before the worker processes are forked.
+_build_plan: BuildPlan | None = None
+
+
+def _timed_render(fn: Callable, *args: Any) -> tuple[Any, frozenset[str], float, float]:
+    """
+    Render a unit, recording the templates it loads and the time it takes.
+
+    :return: The value returned by `fn`, the names of the templates it loaded, its wall clock time and the CPU time of
+        the thread that rendered it.
+    """
+    wall, cpu = time.perf_counter(), time.thread_time()
+    result, templates = render_recording_templates(fn, *args)
+    return result, templates, time.perf_counter() - wall, time.thread_time() - cpu
+
+
+def _render_planned_unit(index: int) -> tuple[Any, tuple[int, int, int], tuple[dict[str, float], int, int] | None]:
+    """
+    Render a unit of the active build plan inside a worker process.
+
+    :return: The value returned by the unit, the number of files it wrote and left unchanged and the bytes it
+        wrote, which are added to the counts of the output writer of the parent, and the usage of the parse cache,
+        which is added to the parse cache of the parent.
+    """
+    if _build_plan is None:
+        raise RuntimeError("No build plan is available in this worker process.")
+    fn, args = _build_plan.units[index]
+    writer = _build_plan.output_writer
+    parse_cache = _build_plan.parse_cache
+    if writer is None:
+        result, counts = fn(*args), (0, 0, 0)
+    else:
+        written, unchanged = writer.counts()
+        bytes_written = writer.bytes_written
+        result = fn(*args)
+        now_written, now_unchanged = writer.counts()
+        counts = (now_written - written, now_unchanged - unchanged, writer.bytes_written - bytes_written)
+    return result, counts, parse_cache.take_usage() if parse_cache is not None else None
+
+
+def _fork_context() -> multiprocessing.context.BaseContext:
+    """The multiprocessing context used for the process render backend"""
+    try:
+        return multiprocessing.get_context("fork")
+    except ValueError as e:
+        raise RuntimeError("The process render backend requires the fork start method.") from e
+
+
+@dataclasses.dataclass
+class RouteGroup:
+    """
+    The units of work submitted for a single entry in the route list.
+
+    Attributes:
+        route: The key of the entry in the route list.
+        entry: The entry that was scheduled.
+        remaining: The number of units that have not finished rendering.
+        entries: The entries of a collection that were scheduled, for the batch plugin hooks.
+        pages: The number of pages of a collection that were scheduled.
+        archives: The number of archive pages of a collection that were scheduled.
+        feeds: The number of feeds of a collection that were scheduled.
+        started: When the entry was scheduled, from `time.perf_counter`.
+        finished: When the last unit of the entry finished rendering, from `time.perf_counter`.
+        cpu: The CPU time spent rendering the units of the entry.
+    """
+
+    route: str | Path
+    entry: BaseObject
+    remaining: int = 0
+    entries: list[BaseObject] = dataclasses.field(default_factory=list)
+    pages: int = 0
+    archives: int = 0
+    feeds: int = 0
+    started: float = dataclasses.field(default_factory=time.perf_counter)
+    finished: float | None = None
+    cpu: float = 0.0
+
+
+class RenderScheduler:
+    """
+    Renders every unit of a site on one shared executor.
+
+    Entries are submitted as soon as they are scheduled so that a slow collection overlaps with the rest
+    of the site instead of blocking it. Collection plugins keep their ordering:
+    `pre_build_collection` runs before any entry of the collection is submitted and
+    `post_build_collection` runs once every entry of that collection has been rendered.
+
+    Entries whose render backend is `process` are added to a `BuildPlan` instead and rendered by a pool of
+    forked worker processes when `wait` is called, after every entry has been scheduled and every unit rendered by
+    a thread has finished.
+
+    The templates loaded by every unit are recorded in the template dependency graph of the site. When a
+    `BuildManifest` is given, units whose outputs are current are skipped and the inputs of every rendered unit
+    are recorded in the manifest.
+
+    Attributes:
+        site: The Site being rendered.
+        executor: The executor that the units are submitted to.
+        manifest: The manifest of the previous build for incremental builds.
+        skipped: The number of units that were not rendered because their outputs are current.
+        timings: The render time of every unit that was rendered.
+    """
+
+    def __init__(self, site, executor: Executor, manifest: BuildManifest | None = None) -> None:
+        self.site = site
+        self.executor = executor
+        self.manifest = manifest
+        self.skipped = 0
+        self.timings: list[EntryTiming] = []
+        self._futures: dict[Future, RouteGroup] = {}
+        self._records: dict[Future, tuple[list[str], str | None]] = {}
+        self._groups: list[RouteGroup] = []
+        self._plan = BuildPlan(getattr(site, "output_writer", None), getattr(site, "parse_cache", None))
+        self._planned: list[tuple[RouteGroup, tuple[list[str], str | None]]] = []
+
+    def render_backend(self, entry: BaseObject) -> str:
+        """
+        The render backend for an entry.
+
+        Collections can set `render_backend` to override the backend set on the Site. Entries are rendered by
+        threads when the output backend of the Site cannot receive outputs from worker processes.
+        """
+        backend = getattr(entry, "render_backend", None) or getattr(self.site, "render_backend", "thread")
+        if backend not in RENDER_BACKENDS:
+            raise ValueError(f"Unknown render backend {backend!r}. Expected one of {RENDER_BACKENDS}.")
+        output_backend = getattr(self.site, "output_backend", None)
+        if backend == "process" and output_backend is not None and not output_backend.supports_processes:
+            logger.warning(
+                f"{type(output_backend).__name__} does not support worker processes. Rendering with threads."
+            )
+            return "thread"
+        return backend
+
+    def schedule(
+        self,
+        route: str | Path,
+        entry: BaseObject,
+        *args: Any,
+        include: Callable[[BaseObject], bool] | None = None,
+    ) -> RouteGroup:
+        """
+        Submit the units for one entry of the route list.
+
+        :param route: The key of the entry in the route list.
+        :param entry: The entry to render.
+        :param args: Arguments passed to the `render` method of a page or data object.
+        :param include: Only render the units of a collection for which this returns True. Collections that
+            override `render` are always rendered completely.
+        :return: The group tracking the submitted units.
+        """
+        group = RouteGroup(route=route, entry=entry)
+        self._groups.append(group)
+        process = self.render_backend(entry) == "process"
+
+        if isinstance(entry, Collection):
+            entry._run_collection_plugins(hook_type="pre_build_collection", site=self.site)
+            if type(entry).render is Collection.render:
+                units = []
+                for collection_entry in entry.all_content:
+                    # Every entry can reach the site (and its parse cache) before any of them is rendered, since a
+                    # feed or an archive reads the content of the pages of the collection.
+                    collection_entry.site = self.site
+                    if (include is None or include(collection_entry)) and (
+                        record := self._record(collection_entry)
+                    ) is not None:
+                        units.append((collection_entry, record))
+                group.entries = [unit for unit, _ in units]
+                group.archives = sum(isinstance(unit, Archive) for unit in group.entries)
+                group.feeds = sum(isinstance(unit, RSSFeed) for unit in group.entries)
+                group.pages = len(group.entries) - group.archives - group.feeds
+                entry._run_batch_plugins(self.site, "render_content_batch", group.entries)
+                # Pages are parsed in batches when the parser of the collection supports it, each batch by the first
+                # unit that needs it. Worker processes do not share what they parse, so they parse one page at a time.
+                batches = entry._entry_batches(group.entries, [] if process else entry.parse_batches(group.entries))
+                for (collection_entry, record), entry_batches in zip(units, batches, strict=True):
+                    self._add(group, process, record, entry._render, collection_entry, entry_batches)
+            else:
+                # Respect collections that override `render`. They are rendered from the calling thread since
+                # `Collection.render` itself waits on the shared executor.
+                entry.render()
+        elif (record := self._record(entry)) is not None:
+            self._add(group, process, record, entry.render, *args)
+
+        return group
+
+    def _record(self, unit: BaseObject) -> tuple[list[str], str | None] | None:
+        """
+        The outputs of a unit and the digest of its inputs.
+
+        :param unit: The entry rendered by the unit.
+        :return: The outputs and inputs or None when the outputs are current and the unit is skipped. Units with
+            `always_render` set are never skipped.
+        """
+        outputs = entry_outputs(unit)
+        inputs = None
+        if self.manifest is not None:
+            inputs = self.manifest.inputs(unit)
+            if not getattr(unit, "always_render", False) and self.manifest.is_current(outputs, inputs):
+                self.skipped += 1
+                # The graph holds the templates of every output, including the ones this build does not render.
+                if (graph := getattr(self.site, "template_graph", None)) is not None:
+                    graph.record(outputs, self.manifest.templates(outputs))
+                return None
+        return outputs, inputs
+
+    def _add(
+        self,
+        group: RouteGroup,
+        process: bool,
+        record: tuple[list[str], str | None],
+        fn: Callable,
+        *args: Any,
+    ) -> None:
+        """
+        Add a single unit of work belonging to `group`.
+
+        :param group: The group the unit belongs to.
+        :param process: Add the unit to the build plan rather than submitting it to the executor.
+        :param record: The outputs and inputs of the unit, from `_record`.
+        :param fn: The function that renders the unit.
+        :param args: The arguments for `fn`.
+        """
+        outputs, inputs = record
+        group.remaining += 1
+        if process:
+            self._plan.add(_timed_render, fn, *args)
+            self._planned.append((group, (outputs, inputs)))
+        else:
+            future = self.executor.submit(_timed_render, fn, *args)
+            self._futures[future] = group
+            self._records[future] = (outputs, inputs)
+
+    def _finish(self, group: RouteGroup, on_complete: Callable[[RouteGroup], None] | None) -> None:
+        """Run the post build steps for a group whose units are all rendered"""
+        group.finished = time.perf_counter()
+        if isinstance(group.entry, Collection):
+            group.entry._run_batch_plugins(self.site, "post_render_content_batch", group.entries)
+            group.entry._run_collection_plugins(hook_type="post_build_collection", site=self.site)
+        if on_complete:
+            on_complete(group)
+
+    def wait(self, on_complete: Callable[[RouteGroup], None] | None = None) -> None:
+        """
+        Wait for all of the scheduled units to finish.
+
+        Post build steps and `on_complete` run in the calling thread, in the order the groups finish.
+
+        :param on_complete: Called with each group once all of its units have been rendered.
+        """
+        global _build_plan
+
+        # Groups without any units (e.g. an empty collection) are complete immediately.
+        for group in self._groups:
+            if not group.remaining:
+                self._finish(group, on_complete)
+
+        process_executor = None
+        try:
+            # The units rendered by threads finish before the worker processes are forked. Forking while a render
+            # thread holds a lock (of the template cache, the output writer or a logging handler) would leave that
+            # lock held forever in the workers.
+            self._collect(list(self._futures), on_complete, planned=False)
+            if self._plan:
+                if self._plan.output_writer is not None:
+                    self._plan.output_writer.flush()
+                # The workers are forked here, after every entry has been scheduled, so they see the prepared site.
+                _build_plan = self._plan
+                process_executor = ProcessPoolExecutor(
+                    max_workers=getattr(self.site, "max_workers", None) or os.cpu_count(),
+                    mp_context=_fork_context(),
+                )
+                futures = []
+                for index, (group, record) in enumerate(self._planned):
+                    future = process_executor.submit(_render_planned_unit, index)
+                    self._futures[future] = group
+                    self._records[future] = record
+                    futures.append(future)
+                self._collect(futures, on_complete, planned=True)
+        finally:
+            if process_executor is not None:
+                process_executor.shutdown(cancel_futures=True)
+            _build_plan = None
+            self._plan = BuildPlan(self._plan.output_writer, self._plan.parse_cache)
+            self._planned.clear()
+            self._records.clear()
+            self._futures.clear()
+            self._groups.clear()
+
+    def _collect(self, futures: list[Future], on_complete: Callable[[RouteGroup], None] | None, planned: bool) -> None:
+        """
+        Record the units in `futures` as they finish and finish the groups whose units are all rendered.
+
+        :param futures: The futures of the units.
+        :param on_complete: Called with each group once all of its units have been rendered.
+        :param planned: Whether the units were rendered by worker processes from the build plan.
+        """
+        for future in as_completed(futures):
+            group = self._futures[future]
+            if planned:
+                (_, templates, wall, cpu), counts, parse_usage = future.result()
+                if self._plan.output_writer is not None:
+                    self._plan.output_writer.add_counts(*counts)
+                if self._plan.parse_cache is not None and parse_usage is not None:
+                    self._plan.parse_cache.add_usage(*parse_usage)
+            else:
+                _, templates, wall, cpu = future.result()
+            outputs, inputs = self._records[future]
+            group.cpu += cpu
+            self.timings.append(
+                EntryTiming(route=str(group.route), output=outputs[0] if outputs else "", wall=wall, cpu=cpu)
+            )
+            if (graph := getattr(self.site, "template_graph", None)) is not None:
+                graph.record(outputs, templates)
+            if self.manifest is not None:
+                self.manifest.record(outputs, inputs, templates)
+            group.remaining -= 1
+            if not group.remaining:
+                self._finish(group, on_complete)
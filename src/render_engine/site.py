@@ -1,23 +1,36 @@
-import copy
+import contextlib
 import json
 import logging
+import os
+import threading
+import time
 from collections import defaultdict
-from collections.abc import Iterable
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any, cast
 
 import rich
-from jinja2 import FileSystemLoader, PrefixLoader
+from jinja2 import BaseLoader, ChoiceLoader, FileSystemLoader, PrefixLoader
 from rich.progress import Progress
 
 from ._base_object import BaseObject
-from .collection import Collection
+from .build_report import BuildReport, CollectionReport, PhaseTiming
+from .collection import Collection, ContentLoad
+from .content_managers import FileContentManager
 from .data_object import DataObject
 from .engine import engine
-from .page import Page, RedirectPage
+from .manifest import MANIFEST_NAME, BuildManifest, entry_outputs
+from .output import FileSystemBackend, OutputBackend, OutputWriter, output_key
+from .page import Page, RedirectPage, parse_stats
+from .parse_cache import PARSE_CACHE_NAME, ParseCache
+from .plugin_timing import PluginTimings
 from .plugins import PluginManager, handle_plugin_registration
+from .scheduler import RENDER_BACKENDS, RenderScheduler, RouteGroup
 from .site_map import SiteMap
+from .template_dependencies import TemplateDependencyGraph, reads_site
 from .themes import Theme, ThemeManager
+from .watcher import create_watcher
 
 try:
     # Get the RE version for display. If it's not set it means we're working locally.
@@ -37,6 +50,16 @@ class Site:
         plugin_settings (dict): A dictionary containing plugin settings.
         render_html_site_map (bool): Whether to render the generated site map as an HTML page.
         render_xml_site_map (bool): Whether to render the generated site map as XML.
+        render_backend (str): Whether entries are rendered by a pool of threads or of worker processes.
+        template_graph (TemplateDependencyGraph): The templates used to render each output of the last build.
+        incremental (bool): Whether to only render the entries whose inputs changed since the last build.
+        output_backend (OutputBackend): Where the outputs are stored.
+        output_writer (OutputWriter): Writes the outputs and counts the files that changed during a build.
+        parse_cache (ParseCache | None): The persistent cache of parsed content when `cache_parsed_content` is set.
+        plugin_timings (PluginTimings | None): The calls and time spent in the hooks of each plugin during the last
+            build when `plugin_timing` is set.
+        content_loads (dict[str | Path, ContentLoad]): The number of pages of each collection and how long they took to
+            load during the last build.
 
     Methods:
         update_site_vars(**kwargs): Updates the site-wide variables with the given key-value pairs.
@@ -47,7 +70,10 @@ class Site:
         collection(Collection): Adds a collection to the site's route list.
         page(Page): Adds a page to the site's route list.
         load_themes(): Loads the themes registered with the site.
+        load_content(): Loads the pages of every collection in parallel.
         render(): Renders all pages and collections added to the site.
+        rebuild(changed_paths): Re-renders the outputs affected by changed files.
+        watch(): Renders the site and re-renders it as files change.
 
     Properties:
         output_path: The output path where the rendered files will be saved.
@@ -71,6 +97,18 @@ class Site:
         static_exclude_dirs: Iterable[str] | None = None,
         static_include_dirs: Iterable[str] | None = None,
         include_static_in_site_map: bool = False,
+        render_backend: str = "thread",
+        max_workers: int | None = None,
+        incremental: bool = False,
+        cache_path: str | Path = ".render_engine_cache",
+        write_if_changed: bool = False,
+        writer_threads: int = 0,
+        writer_queue_size: int = 256,
+        output_backend: OutputBackend | None = None,
+        cache_parsed_content: bool = False,
+        parse_cache_size: int = 256 * 1024 * 1024,
+        plugin_timing: bool = False,
+        plugin_time_budget: float | None = None,
     ) -> None:
         """
         Constructor for the Site object.
@@ -92,6 +130,27 @@ class Site:
         :param static_include_dirs: Subdirectory paths that override static_exclude_dirs for matching subdirectories.
         :param include_static_in_site_map: When True, static files are added to the site map.
             They are always copied to output regardless of this setting. Default: False.
+        :param render_backend: How entries are rendered in parallel. `thread` renders in a pool of threads and
+            `process` renders in a pool of forked worker processes. Collections can override this with their
+            own `render_backend` attribute. Default: "thread".
+        :param max_workers: The number of workers used to render entries. Default: None (the number of CPUs).
+        :param incremental: When True only render the entries whose inputs changed since the last build. Default: False
+        :param cache_path: Path to store build caches such as the incremental build manifest.
+        :param write_if_changed: When True outputs whose content did not change are not written again so that they
+            keep their modification time. Default: False
+        :param writer_threads: The number of dedicated threads writing the outputs. When 0 the render workers write
+            their own outputs. Default: 0
+        :param writer_queue_size: The maximum number of rendered outputs waiting for the writer threads. Render workers
+            wait for room in the queue when it is full. Default: 256
+        :param output_backend: Where the outputs are stored. Default: None (a `FileSystemBackend` writing to the
+            `output_path`)
+        :param cache_parsed_content: When True the parsed content of pages is stored in a cache under `cache_path`
+            and reused by the next builds. Default: False
+        :param parse_cache_size: The maximum size, in bytes, of the parse cache. Default: 256 MiB
+        :param plugin_timing: When True the calls of the hooks of every plugin are counted and timed during a build.
+            Default: False
+        :param plugin_time_budget: With `plugin_timing`, a warning is logged for every plugin that spends more than
+            this many seconds in its hooks during a build. Default: None
         """
         # Use getattr for the attributes moved from class level to constructor arguments
         # to properly handle subclassing. This will prefeer the value from the subclass
@@ -127,12 +186,39 @@ class Site:
         self.render_xml_site_map: bool = getattr(self, "render_xml_site_map", render_xml_site_map)
         self.render_html_site_map: bool = getattr(self, "render_html_site_map", render_html_site_map)
         self.slug_only_urls: bool = getattr(self, "slug_only_urls", slug_only_urls)
+        self.render_backend: str = getattr(self, "render_backend", render_backend)
+        if self.render_backend not in RENDER_BACKENDS:
+            raise ValueError(f"Unknown render backend {self.render_backend!r}. Expected one of {RENDER_BACKENDS}.")
+        self.max_workers: int | None = getattr(self, "max_workers", max_workers)
+        self._executor: ThreadPoolExecutor | None = None
+        self.incremental: bool = getattr(self, "incremental", incremental)
+        self.cache_path: str | Path = getattr(self, "cache_path", cache_path)
+        self.write_if_changed: bool = getattr(self, "write_if_changed", write_if_changed)
+        self.cache_parsed_content: bool = getattr(self, "cache_parsed_content", cache_parsed_content)
+        self.parse_cache_size: int = getattr(self, "parse_cache_size", parse_cache_size)
+        self.parse_cache: ParseCache | None = None
+        self.content_loads: dict[str | Path, ContentLoad] = {}
+        self.plugin_timing: bool = getattr(self, "plugin_timing", plugin_timing)
+        self.plugin_time_budget: float | None = getattr(self, "plugin_time_budget", plugin_time_budget)
+        self.plugin_timings: PluginTimings | None = None
+        self.writer_threads: int = getattr(self, "writer_threads", writer_threads)
+        self.writer_queue_size: int = getattr(self, "writer_queue_size", writer_queue_size)
+        self.output_backend: OutputBackend = getattr(self, "output_backend", output_backend) or FileSystemBackend(
+            output_path
+        )
+        self.output_writer = OutputWriter(
+            self.output_backend,
+            write_if_changed=self.write_if_changed,
+            threads=self.writer_threads,
+            queue_size=self.writer_queue_size,
+        )
 
         self.plugin_manager: PluginManager = PluginManager()
         self.theme_manager = ThemeManager(
             engine=engine,
             output_path=output_path,
             static_paths=static_paths,
+            output_backend=self.output_backend,
         )
 
         self.site_vars: dict[str, Any] = cast(
@@ -157,6 +243,8 @@ class Site:
         self.theme_manager.engine.globals.update(self.site_vars)
         self.theme_manager.add_loader(0, FileSystemLoader(template_path))
         self._site_map = SiteMap()
+        self._site_map_pages: list[Page] = []
+        self.template_graph = TemplateDependencyGraph()
 
     @property
     def output_path(self) -> Path | str:
@@ -165,6 +253,8 @@ class Site:
     @output_path.setter
     def output_path(self, output_path: Path | str) -> None:
         self.theme_manager.output_path = output_path
+        if isinstance(self.output_backend, FileSystemBackend):
+            self.output_backend.root = Path(output_path)
 
     @property
     def static_paths(self) -> set:
@@ -178,6 +268,33 @@ class Site:
     def site_map(self) -> SiteMap | None:
         return self._site_map
 
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        """
+        The pool of threads used to render entries.
+
+        It is created on first use and reused for every collection and across builds until `close` is called.
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers or os.cpu_count(),
+                thread_name_prefix="render_engine",
+            )
+        return self._executor
+
+    def close(self) -> None:
+        """Shut down the render and writer workers. They are started again the next time the site is rendered."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        self.output_writer.close()
+
+    def __enter__(self) -> "Site":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
     def update_site_vars(self, **kwargs) -> None:
         self.site_vars.update(**kwargs)
         self.theme_manager.engine.globals.update(self.site_vars)
@@ -242,7 +359,7 @@ class Site:
         ```
         """
         _Collection = Collection()
-        _Collection.plugin_manager = copy.deepcopy(self.plugin_manager)
+        _Collection.plugin_manager = self.plugin_manager.copy()
         self.register_themes(*getattr(_Collection, "required_themes", []))
 
         if plugins := getattr(_Collection, "plugins", []):
@@ -288,7 +405,7 @@ class Site:
         page.title = page._title  # Expose _title to the user through `title`
 
         # copy the plugin manager, removing any plugins that the page has ignored
-        page.plugin_manager = copy.deepcopy(self.plugin_manager)
+        page.plugin_manager = self.plugin_manager.copy()
 
         if plugins := getattr(page, "plugins", []):
             handle_plugin_registration(page.plugin_manager, plugins, getattr(page, "plugin_settings", dict()))
@@ -336,7 +453,7 @@ class Site:
         serializer = getattr(_data_object, "serializer", None) or json.dumps
         data_object = _data_object(serializer)
 
-        data_object.plugin_manager = copy.deepcopy(self.plugin_manager)
+        data_object.plugin_manager = self.plugin_manager.copy()
         if plugins := getattr(data_object, "plugins", []):
             handle_plugin_registration(
                 data_object.plugin_manager, plugins, getattr(data_object, "plugin_settings", dict())
@@ -392,7 +509,99 @@ class Site:
             # If the path_name is still a property it will raise an AttributeError
             entry._path_name = "index.html"
 
-    def render(self, site_url: str | None = None) -> None:
+    def _add_site_map_pages(self) -> list[Page]:
+        """
+        Add the pages rendering the site map to the route list.
+
+        :return: The site map pages that were added
+        """
+        pages = []
+        if self.render_html_site_map:
+
+            @self.page
+            class SiteMapPage(Page):
+                title = f"{self.site_vars.get('SITE_TITLE', '')} Site Map"
+                path_name = "site_map.html"
+                content = self._site_map.html
+                template = "page.html"
+                slug_only_url = False
+
+            pages.append(SiteMapPage)
+
+        if self.render_xml_site_map:
+
+            @self.page
+            class SiteMapXml(Page):
+                path_name = "site_map.xml"
+                template = "sitemap.xml"
+                slug_only_url = False
+
+            pages.append(SiteMapXml)
+        self._site_map_pages = pages
+        return pages
+
+    def _site_map_routes(self) -> dict[str | Path, BaseObject]:
+        """The route list without the pages rendering the site map, which do not list themselves"""
+        site_map_pages = {id(page) for page in self._site_map_pages}
+        return {slug: entry for slug, entry in self.route_list.items() if id(entry) not in site_map_pages}
+
+    @contextlib.contextmanager
+    def _open_output(self, update: bool = False) -> Iterator[None]:
+        """
+        Prepare the output backend and writer for a build, and close the backend when the build ends or fails
+
+        :param update: Whether the build only renders some of the outputs again
+        """
+        if isinstance(self.output_backend, FileSystemBackend):
+            # `output_path` can be set as a class attribute by subclasses
+            self.output_backend.root = Path(self.output_path)
+        self.output_writer.write_if_changed = self.write_if_changed
+        self.output_writer.backend = self.output_backend
+        self.theme_manager.output_backend = self.output_backend
+        self.output_writer.reset()
+        self.output_backend.open(update=update)
+        try:
+            yield
+        finally:
+            self.output_backend.close()
+
+    def load_content(self) -> dict[str | Path, ContentLoad]:
+        """
+        Load the pages of every collection in the route list.
+
+        The collections are loaded at the same time on the render pool of the site, so that the file reads of a
+        collection overlap with the others. Each collection loads its pages with its content manager, which may use
+        its own workers.
+
+        :return: The number of pages of each collection and the time it took to load them, by route.
+        """
+        collections = {slug: entry for slug, entry in self.route_list.items() if isinstance(entry, Collection)}
+        loads = self.executor.map(lambda collection: collection.load_content(), collections.values())
+        return dict(zip(collections, loads))
+
+    def _plugin_managers(self) -> list[PluginManager]:
+        """The plugin managers of the site and of every entry in the route list"""
+        plugin_managers = [self.plugin_manager]
+        for entry in self.route_list.values():
+            if (plugin_manager := getattr(entry, "plugin_manager", None)) is not None:
+                plugin_managers.append(plugin_manager)
+        return plugin_managers
+
+    @contextlib.contextmanager
+    def _timing_plugins(self) -> Iterator[None]:
+        """Time the hooks of the plugins for the duration of a build when `plugin_timing` is set"""
+        if not self.plugin_timing:
+            yield
+            return
+        self.plugin_timings = PluginTimings(budget=self.plugin_time_budget)
+        self.plugin_timings.instrument(self._plugin_managers())
+        try:
+            yield
+        finally:
+            self.plugin_timings.restore()
+            self.plugin_timings.log()
+
+    def render(self, site_url: str | None = None) -> BuildReport:
         """
         Render all pages and collections.
 
@@ -405,113 +614,365 @@ class Site:
         You can choose to call it manually in your file or
         use the CLI command [`render-engine build`][src.render_engine.cli.build]
 
+        Every entry in the route list is submitted to a shared pool through a
+        [`RenderScheduler`][src.render_engine.scheduler.RenderScheduler].
+
         :param site_url: Alternate URL for the site to use in the site map
+        :return: The report of the build, with the time spent in every phase and the entries that were rendered
         """
         rich.print(
             f"[green]Building {repr(self.site_vars.get('SITE_TITLE', 'your site'))} "
             f"with Render Engine version {re_version}"
         )
-        with Progress() as progress:
+        parse_stats.reset()
+        if self.cache_parsed_content and self.parse_cache is None:
+            self.parse_cache = ParseCache(Path(self.cache_path) / PARSE_CACHE_NAME, max_size=self.parse_cache_size)
+        report = BuildReport()
+        with self._open_output(), Progress() as progress, self._timing_plugins():
+            task_load_content = progress.add_task("Loading content", total=1)
+            with report.phase("load_content"):
+                self.content_loads = self.load_content()
+            for slug, load in self.content_loads.items():
+                logging.info(f"Loaded {load.pages} pages of {slug} in {load.seconds:.3f}s.")
+                report.collections[str(slug)] = CollectionReport(
+                    name=str(slug), load=PhaseTiming(name="load", wall=load.seconds, cpu=load.cpu)
+                )
+            progress.update(task_load_content, advance=1)
+
             site_url = site_url if site_url is not None else self.site_vars.get("SITE_URL", "")
             task_site_map = progress.add_task(f"Updating site map. {site_url=}", total=1)
 
-            # self._site_map will be initialized with an empty route list and the site URL pointing
-            # to https://localhost:8000/ This task will update to the correct site URL and with the route list
-            # as it will be rendered.
-            self._site_map.site_url = site_url
-            self._site_map.static_paths = self.static_paths
-            self._site_map.static_include_patterns = self.static_include_patterns
-            self._site_map.static_exclude_patterns = self.static_exclude_patterns
-            self._site_map.static_exclude_dirs = self.static_exclude_dirs
-            self._site_map.static_include_dirs = self.static_include_dirs
-            self._site_map.include_static_in_site_map = self.include_static_in_site_map
-            self._site_map.update(self.route_list)
-
-            if self.render_html_site_map:
-
-                @self.page
-                class SiteMapPage(Page):
-                    title = f"{self.site_vars.get('SITE_TITLE', '')} Site Map"
-                    path_name = "site_map.html"
-                    content = self._site_map.html
-                    template = "page.html"
-                    slug_only_url = False
-
-            if self.render_xml_site_map:
-
-                @self.page
-                class SiteMapXml(Page):
-                    path_name = "site_map.xml"
-                    template = "sitemap.xml"
-                    slug_only_url = False
-
+            with report.phase("site_map"):
+                # self._site_map will be initialized with an empty route list and the site URL pointing
+                # to https://localhost:8000/ This task will update to the correct site URL and with the route list
+                # as it will be rendered.
+                self._site_map.site_url = site_url
+                self._site_map.static_paths = self.static_paths
+                self._site_map.static_include_patterns = self.static_include_patterns
+                self._site_map.static_exclude_patterns = self.static_exclude_patterns
+                self._site_map.static_exclude_dirs = self.static_exclude_dirs
+                self._site_map.static_include_dirs = self.static_include_dirs
+                self._site_map.include_static_in_site_map = self.include_static_in_site_map
+                self._site_map.update(self._site_map_routes())
+
+                self._add_site_map_pages()
             progress.update(task_site_map, advance=1)
 
             pre_build_task = progress.add_task("Loading Pre-Build Plugins and Themes", total=1)
-            self.plugin_manager.hook.pre_build_site(
-                site=self,
-                settings=self.plugin_manager.plugin_settings,
-            )
-
-            self.load_themes()
-            self.theme_manager.engine.globals.update(self.site_vars)
+            with report.phase("pre_build_plugins"):
+                self.plugin_manager.hook.pre_build_site(
+                    site=self,
+                    settings=self.plugin_manager.plugin_settings,
+                )
+
+            with report.phase("themes"):
+                self.load_themes()
+                if self.plugin_timing and self.plugin_timings is not None:
+                    # Time the plugins registered by the themes and the pages of the site map as well.
+                    self.plugin_timings.instrument(self._plugin_managers())
+                self.theme_manager.engine.globals.update(self.site_vars)
             progress.update(pre_build_task, advance=1)
             # Parse Route List
             task_add_route = progress.add_task("[blue]Adding Routes", total=len(self.route_list))
 
-            self.theme_manager._render_static()
+            with report.phase("static"):
+                self.theme_manager._render_static()
 
             self.theme_manager.engine.globals["site"] = self  # type: ignore
             self.theme_manager.engine.globals["routes"] = self.route_list  # type: ignore
 
-            for slug, entry in self.route_list.items():
-                entry.site = self
-                progress.update(task_add_route, description=f"[blue]Adding[gold]Route: [blue]{slug}")
-                args = []
-                match entry:
-                    case Page():
-                        progress.update(
-                            task_add_route,
-                            description=f"[blue]Adding[gold]Route: [blue]{entry._slug}",
-                        )
-                        args = [self.theme_manager]
-                        self.handle_slug_only_url(entry)
-                    case Collection():
-                        progress.update(
-                            task_add_route,
-                            description=f"[blue]Adding[gold]Route: [blue]Collection {entry._slug}",
-                        )
-                        pre_build_collection_task = progress.add_task(
-                            "Loading Pre-Build-Collection Plugins",
-                            total=1,
-                        )
-                        entry._run_collection_plugins(
-                            hook_type="pre_build_collection",
-                            site=self,
-                        )
-                        progress.update(pre_build_collection_task, advance=1)
-                    case DataObject():
-                        progress.update(
-                            task_add_route,
-                            description=f"[blue]Adding[gold]Route: [blue]{entry.filename}",
-                        )
-
-                entry.render(*args)
-                if isinstance(entry, Collection):
+            def route_complete(group: RouteGroup) -> None:
+                if isinstance(group.entry, Collection):
+                    collection_report = report.collections.setdefault(
+                        str(group.route), CollectionReport(name=str(group.route))
+                    )
+                    collection_report.pages = group.pages
+                    collection_report.archives = group.archives
+                    collection_report.feeds = group.feeds
+                    collection_report.render = PhaseTiming(
+                        name="render", wall=(group.finished or time.perf_counter()) - group.started, cpu=group.cpu
+                    )
                     post_build_collection_task = progress.add_task(
                         "Loading Post-Build-Collection Plugins",
                         total=1,
                     )
-                    entry._run_collection_plugins(
-                        hook_type="post_build_collection",
-                        site=self,
-                    )
                     progress.update(post_build_collection_task, advance=1)
                 progress.update(task_add_route, advance=1)
 
+            with report.phase("render"):
+                # All of the entries are rendered on one shared pool so that pages, data objects and the entries
+                # of every collection can overlap.
+                manifest = None
+                if self.incremental:
+                    manifest = BuildManifest.load(Path(self.cache_path) / MANIFEST_NAME, self.output_path)
+                    manifest.prepare(self)
+                scheduler = RenderScheduler(self, self.executor, manifest=manifest)
+                for slug, entry in self.route_list.items():
+                    entry.site = self
+                    progress.update(task_add_route, description=f"[blue]Adding[gold]Route: [blue]{slug}")
+                    args = []
+                    match entry:
+                        case Page():
+                            progress.update(
+                                task_add_route,
+                                description=f"[blue]Adding[gold]Route: [blue]{entry._slug}",
+                            )
+                            args = [self.theme_manager]
+                            self.handle_slug_only_url(entry)
+                        case Collection():
+                            progress.update(
+                                task_add_route,
+                                description=f"[blue]Adding[gold]Route: [blue]Collection {entry._slug}",
+                            )
+                            pre_build_collection_task = progress.add_task(
+                                "Loading Pre-Build-Collection Plugins",
+                                total=1,
+                            )
+                        case DataObject():
+                            progress.update(
+                                task_add_route,
+                                description=f"[blue]Adding[gold]Route: [blue]{entry.filename}",
+                            )
+
+                    scheduler.schedule(slug, entry, *args)
+                    if isinstance(entry, Collection):
+                        progress.update(pre_build_collection_task, advance=1)
+
+                try:
+                    scheduler.wait(on_complete=route_complete)
+                    self.output_writer.flush()
+                finally:
+                    self.output_backend.close()
+                    if self.parse_cache is not None:
+                        self.parse_cache.close()
+                    if manifest is not None:
+                        manifest.save()
+            if manifest is not None:
+                logging.info(f"Incremental build: {scheduler.skipped} entries are up to date.")
+            written, unchanged = self.output_writer.counts()
+            rich.print(f"[green]{written} files changed, {unchanged} unchanged")
+            report.files_written, report.files_unchanged = written, unchanged
+            report.bytes_written = self.output_writer.bytes_written
+            report.skipped = scheduler.skipped
+            report.entries = scheduler.timings
+            logging.info(f"Parsed page content {parse_stats.parsed} times, reused it {parse_stats.skipped} times.")
+
             post_build_task = progress.add_task("Loading Post-Build Plugins", total=1)
-            self.plugin_manager.hook.post_build_site(
-                site=self,
-                settings=self.plugin_manager.plugin_settings,
-            )
+            with report.phase("post_build"):
+                self.plugin_manager.hook.post_build_site(
+                    site=self,
+                    settings=self.plugin_manager.plugin_settings,
+                )
             progress.update(post_build_task, advance=1)
+
+        if self.plugin_timing and self.plugin_timings is not None:
+            report.plugin_timings = self.plugin_timings.timings
+        return report
+
+    def _template_dirs(self) -> set[tuple[Path, str]]:
+        """The template directories on the file system and the prefix of the names of their templates"""
+        template_dirs: set[tuple[Path, str]] = set()
+
+        def visit(loader: BaseLoader, prefix: str) -> None:
+            match loader:
+                case ChoiceLoader():
+                    for choice in loader.loaders:
+                        visit(choice, prefix)
+                case PrefixLoader():
+                    for loader_prefix, prefixed in loader.mapping.items():
+                        visit(prefixed, f"{prefix}{loader_prefix}{loader.delimiter}")
+                case FileSystemLoader():
+                    for search_path in loader.searchpath:
+                        template_dirs.add((Path(search_path).resolve(), prefix))
+
+        if self.theme_manager.engine.loader is not None:
+            visit(self.theme_manager.engine.loader, "")
+        return template_dirs
+
+    def watch_paths(self) -> set[Path]:
+        """
+        The directories monitored by [`Site.watch`][src.render_engine.site.Site.watch].
+
+        These are the content paths of the collections, the directories of pages loaded from a `content_path`, the
+        template directories (including the ones of themes loaded from the file system) and the static paths.
+        """
+        paths = {Path(static_path) for static_path in self.static_paths}
+        paths.update(template_dir for template_dir, _ in self._template_dirs())
+        for entry in self.route_list.values():
+            match entry:
+                case Collection():
+                    if content_path := getattr(entry.content_manager, "content_path", None):
+                        paths.add(Path(content_path))
+                case Page():
+                    if content_path := getattr(entry, "content_path", None):
+                        paths.add(Path(content_path).parent)
+        return {path.resolve() for path in paths if path.is_dir()}
+
+    def rebuild(self, changed_paths: Iterable[str | Path]) -> set[str]:
+        """
+        Re-render the outputs affected by changed files.
+
+        This is used by [`Site.watch`][src.render_engine.site.Site.watch] after the site has been rendered once and
+        keeps the parsed pages and the template environment of the running process.
+
+        - A changed static file is copied to the output path again, or removed from it if it was deleted.
+        - A changed template re-renders the outputs that were rendered with it, according to the
+          [template dependency graph][src.render_engine.template_dependencies.TemplateDependencyGraph].
+        - A changed content file of a collection using a `FileContentManager` is reloaded. Its page is re-rendered
+          along with the archives and the feed of its collection, the site map pages, the outputs rendered with a
+          template that reads the `site` or `routes` globals and the entries with `always_render` set. The outputs
+          of a deleted page are removed.
+
+        The site level plugin hooks are not run again.
+
+        :param changed_paths: The files that were created, modified or deleted.
+        :return: The output paths, relative to the output path, that were rendered.
+        """
+        with self._open_output(update=True):
+            ignored = [Path(self.output_path).resolve(), Path(self.cache_path).resolve()]
+            changed = {Path(path).resolve() for path in changed_paths}
+            changed = {path for path in changed if not any(path.is_relative_to(ignore) for ignore in ignored)}
+
+            self._rebuild_static(changed)
+
+            template_names = {
+                f"{prefix}{path.relative_to(template_dir).as_posix()}"
+                for path in changed
+                for template_dir, prefix in self._template_dirs()
+                if path.is_relative_to(template_dir)
+            }
+            dirty_outputs = self.template_graph.dependents(*template_names) if template_names else set()
+            dirty_entries: set[int] = set()
+            dirty_collections: set[int] = set()
+
+            for entry in list(self.route_list.values()):
+                match entry:
+                    case Collection():
+                        content_manager = entry.content_manager
+                        # Only the pages of a FileContentManager can be reloaded one file at a time.
+                        if not isinstance(content_manager, FileContentManager) or not content_manager.content_path:
+                            continue
+                        content_root = Path(content_manager.content_path).resolve()
+                        for path in changed:
+                            if not path.is_relative_to(content_root):
+                                continue
+                            known = next(
+                                (
+                                    page
+                                    for page in entry
+                                    if getattr(page, "content_path", None) and Path(page.content_path).resolve() == path
+                                ),
+                                None,
+                            )
+                            if (page := content_manager.reload_entry(path)) is not None:
+                                dirty_entries.add(id(page))
+                            if known is not None:
+                                # The outputs of a deleted page, or the old outputs of a page whose slug changed.
+                                stale = set(entry_outputs(known)).difference(entry_outputs(page) if page else ())
+                                for output in stale:
+                                    self.output_backend.delete(output)
+                                self.template_graph.remove(stale)
+                            if known is not None or page is not None:
+                                dirty_collections.add(id(entry))
+                    case Page():
+                        content_path = getattr(entry, "content_path", None)
+                        if content_path and Path(content_path).resolve() in changed and Path(content_path).is_file():
+                            Page.__init__(entry, content_path=content_path, Parser=entry.Parser)
+                            entry.title = entry._title
+                            dirty_entries.add(id(entry))
+
+            content_changed = bool(dirty_entries or dirty_collections)
+            if content_changed:
+                self._site_map.update(self._site_map_routes())
+                dirty_entries.update(id(page) for page in self._add_site_map_pages())
+                # Outputs whose templates read the `site` or `routes` globals can show any of the changed pages.
+                engine = self.theme_manager.engine
+                site_templates = {name for name in self.template_graph.used() if reads_site(engine, name)}
+                dirty_outputs |= self.template_graph.dependents(*site_templates) if site_templates else set()
+
+            def is_dirty(unit: BaseObject) -> bool:
+                return (
+                    id(unit) in dirty_entries
+                    or (content_changed and getattr(unit, "always_render", False))
+                    or not dirty_outputs.isdisjoint(entry_outputs(unit))
+                )
+
+            rendered: set[str] = set()
+            scheduler = RenderScheduler(self, self.executor)
+            for slug, entry in self.route_list.items():
+                entry.site = self
+                if isinstance(entry, Collection):
+                    pages = {id(page) for page in entry} if id(entry) in dirty_collections else None
+
+                    def include(unit: BaseObject, pages: set[int] | None = pages) -> bool:
+                        # The archives and the feed of a collection include every page so they follow its content
+                        return is_dirty(unit) or (pages is not None and id(unit) not in pages)
+
+                    units = [unit for unit in entry.all_content if include(unit)]
+                    if units:
+                        scheduler.schedule(slug, entry, include=include)
+                        rendered.update(output for unit in units for output in entry_outputs(unit))
+                elif is_dirty(entry):
+                    scheduler.schedule(slug, entry, *([self.theme_manager] if isinstance(entry, Page) else []))
+                    rendered.update(entry_outputs(entry))
+            scheduler.wait()
+            self.output_writer.flush()
+        return rendered
+
+    def _rebuild_static(self, changed: set[Path]) -> None:
+        """Copy the changed static files to the output path and remove the deleted ones"""
+        for static_path in self.static_paths:
+            static_root = Path(static_path).resolve()
+            for path in changed:
+                if not path.is_relative_to(static_root):
+                    continue
+                destination = output_key(Path(static_root.name) / path.relative_to(static_root))
+                if path.is_file():
+                    self.output_backend.copy_file(path, destination)
+                else:
+                    self.output_backend.delete(destination)
+
+    def watch(
+        self,
+        *,
+        force_polling: bool = False,
+        poll_interval: float = 0.5,
+        debounce: float = 0.1,
+        stop_event: threading.Event | None = None,
+    ) -> None:
+        """
+        Render the site and re-render the affected outputs whenever a watched file changes.
+
+        The directories returned by [`Site.watch_paths`][src.render_engine.site.Site.watch_paths] are watched with
+        inotify on Linux and polled elsewhere. Changes are handled by
+        [`Site.rebuild`][src.render_engine.site.Site.rebuild] in the same process so the parsed pages and compiled
+        templates stay in memory between rebuilds.
+
+        This runs until `stop_event` is set or the process is interrupted.
+
+        :param force_polling: Poll the watched directories even when inotify is available.
+        :param poll_interval: Seconds between two checks of `stop_event` and, when polling, of the directories.
+        :param debounce: Seconds to wait for more changes after a change before rebuilding.
+        :param stop_event: Set this event to stop watching.
+        """
+        stop_event = stop_event or threading.Event()
+        self.render()
+        watcher = create_watcher(
+            self.watch_paths(),
+            ignore=[self.output_path, self.cache_path],
+            force_polling=force_polling,
+            interval=poll_interval,
+        )
+        rich.print(f"[green]Watching {len(watcher.paths)} directories for changes")
+        try:
+            with watcher:
+                while not stop_event.is_set():
+                    if not (changed := watcher.wait(timeout=poll_interval)):
+                        continue
+                    # Editors and tools often write several files at once. Rebuild once for the whole burst.
+                    while debounce and (more_changes := watcher.wait(timeout=debounce)):
+                        changed |= more_changes
+                    rendered = self.rebuild(changed)
+                    rich.print(f"[green]Rebuilt {len(rendered)} outputs for {len(changed)} changed files")
+        except KeyboardInterrupt:
+            pass
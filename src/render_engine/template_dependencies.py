@@ -0,0 +1,115 @@
+"""
+Template dependency tracking.
+
+Every template that the engine loads while an entry is rendered (the template of the entry and every template it
+extends, includes or imports, including theme prefixed templates) is recorded. The resulting graph maps each output
+path to the templates it was rendered from so that changing a template only invalidates the outputs that use it.
+
+A template that reads the `site` or `routes` globals can show any entry of the site, so its outputs also depend on the
+content of every other entry.
+"""
+
+import threading
+from collections.abc import Callable, Iterable
+from contextvars import ContextVar
+from typing import Any
+
+from jinja2 import Environment, TemplateNotFound, TemplateSyntaxError, nodes
+
+# Globals through which a template can read the other entries of the site.
+SITE_GLOBALS = frozenset({"site", "routes"})
+
+_recorded_templates: ContextVar[set[str] | None] = ContextVar("recorded_templates", default=None)
+
+
+def record_template(name: str | None) -> None:
+    """Record that the template `name` was loaded by the unit currently being rendered"""
+    if name is not None and (names := _recorded_templates.get()) is not None:
+        names.add(name)
+
+
+def render_recording_templates(fn: Callable, *args: Any) -> tuple[Any, frozenset[str]]:
+    """
+    Call `fn` and record the templates loaded while it runs.
+
+    :param fn: The function that renders a unit.
+    :param args: The arguments for `fn`.
+    :return: The value returned by `fn` and the names of the templates that were loaded.
+    """
+    names: set[str] = set()
+    token = _recorded_templates.set(names)
+    try:
+        result = fn(*args)
+    finally:
+        _recorded_templates.reset(token)
+    return result, frozenset(names)
+
+
+def reads_site(environment: Environment, name: str) -> bool:
+    """
+    Whether the template `name` reads the `site` or `routes` globals.
+
+    Templates that cannot be found or parsed do not.
+    """
+    if environment.loader is None:
+        return False
+    try:
+        source, *_ = environment.loader.get_source(environment, name)
+        # `meta.find_undeclared_variables` leaves out the globals of the environment, so the names are looked up in
+        # the syntax tree instead.
+        return any(
+            node.ctx == "load" and node.name in SITE_GLOBALS for node in environment.parse(source).find_all(nodes.Name)
+        )
+    except (TemplateNotFound, TemplateSyntaxError):
+        return False
+
+
+class TemplateDependencyGraph:
+    """
+    Maps every rendered output path to the templates used to render it.
+
+    The graph is updated from the worker threads of a build so all access goes through a lock.
+    """
+
+    def __init__(self) -> None:
+        self._templates: dict[str, frozenset[str]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, outputs: Iterable[str], templates: Iterable[str]) -> None:
+        """
+        Record the templates used to render `outputs`.
+
+        :param outputs: Output paths relative to the output path of the site.
+        :param templates: Names of the templates loaded while rendering them.
+        """
+        templates = frozenset(templates)
+        with self._lock:
+            for output in outputs:
+                self._templates[output] = templates
+
+    def remove(self, outputs: Iterable[str]) -> None:
+        """Forget `outputs`, for instance once they are deleted"""
+        with self._lock:
+            for output in outputs:
+                self._templates.pop(output, None)
+
+    def used(self) -> set[str]:
+        """The names of every template used to render an output"""
+        with self._lock:
+            return set().union(*self._templates.values())
+
+    def templates(self, output: str) -> frozenset[str]:
+        """The templates used to render `output`"""
+        return self._templates.get(output, frozenset())
+
+    def dependents(self, *templates: str) -> set[str]:
+        """The output paths that were rendered using any of `templates`"""
+        changed = set(templates)
+        with self._lock:
+            return {output for output, used in self._templates.items() if used & changed}
+
+    def __contains__(self, output: str) -> bool:
+        return output in self._templates
+
+    def __len__(self) -> int:
+        return len(self._templates)
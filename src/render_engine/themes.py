@@ -8,6 +8,8 @@ from typing import cast
 import slugify
 from jinja2 import BaseLoader, ChoiceLoader, Environment, FileSystemLoader
 
+from .output import OutputBackend
+
 
 @dataclasses.dataclass
 class Theme:
@@ -59,6 +61,7 @@ class ThemeManager:
         static_paths (set): Set of filepaths for static folders.
             This will get copied to the output folder. Folders are recursive.
         template_globals (dict[str, set]): Dictionary mapping template global names to sets of values.
+        output_backend (OutputBackend | None): Where the static files are copied. Copies to `output_path` if None.
 
     Methods:
         default_template_globals() -> dict[str, set]: Returns the default template globals.
@@ -77,6 +80,7 @@ class ThemeManager:
     prefix: dict[str, BaseLoader] = dataclasses.field(default_factory=dict)
     static_paths: set = dataclasses.field(default_factory=set)
     template_globals: dict[str, set] = dataclasses.field(default_factory=default_template_globals)
+    output_backend: OutputBackend | None = None
 
     def register_theme(self, theme: Theme):
         """
@@ -110,7 +114,11 @@ class ThemeManager:
         """Copies a Static Directory to the output folder"""
         for static_path in self.static_paths:
             logging.debug(f"Copying Static Files from {static_path}")
-            if pathlib.Path(static_path).exists():
+            if not pathlib.Path(static_path).exists():
+                continue
+            if self.output_backend is not None:
+                self.output_backend.copy_tree(static_path, pathlib.Path(static_path).name)
+            else:
                 shutil.copytree(
                     static_path,
                     pathlib.Path(self.output_path) / pathlib.Path(static_path).name,
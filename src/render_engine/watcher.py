@@ -0,0 +1,243 @@
+"""
+File system watchers used by [`Site.watch`][src.render_engine.site.Site.watch].
+
+On Linux the watcher uses inotify so that changes are picked up as soon as they happen. Everywhere else, or when
+inotify is not available, the watched directories are polled.
+"""
+
+import ctypes
+import ctypes.util
+import logging
+import os
+import select
+import struct
+import sys
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+
+logger = logging.getLogger("Watcher")
+
+
+class FileWatcher(ABC):
+    """
+    Base FileWatcher abstract class
+
+    Attributes:
+        paths: The directories that are watched recursively.
+        ignore: Directories under the watched paths that are not watched, such as the output path.
+    """
+
+    def __init__(self, paths: Iterable[str | Path], ignore: Iterable[str | Path] = ()) -> None:
+        self.paths = [Path(path).resolve() for path in paths if Path(path).is_dir()]
+        self.ignore = {Path(path).resolve() for path in ignore}
+
+    def _walk(self, path: Path) -> Iterator[tuple[Path, list[str]]]:
+        """Walk the directories under `path`, skipping the ignored ones"""
+        if path in self.ignore:
+            return
+        for root, dirs, files in os.walk(path):
+            dirs[:] = [name for name in dirs if Path(root, name) not in self.ignore]
+            yield Path(root), files
+
+    @abstractmethod
+    def wait(self, timeout: float | None = None) -> set[Path]:
+        """
+        Wait for changes.
+
+        :param timeout: Seconds to wait for a change. None waits until something changes.
+        :return: The files that were created, modified or deleted. Empty if nothing changed before the timeout.
+        """
+        ...
+
+    def close(self) -> None:
+        """Stop watching"""
+        pass
+
+    def __enter__(self) -> "FileWatcher":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class PollingWatcher(FileWatcher):
+    """
+    Watches directories by comparing the modification time and size of their files.
+
+    Attributes:
+        interval: Seconds between two scans of the watched directories.
+    """
+
+    def __init__(self, paths: Iterable[str | Path], ignore: Iterable[str | Path] = (), interval: float = 0.5) -> None:
+        super().__init__(paths, ignore)
+        self.interval = interval
+        self._snapshot = self._scan()
+
+    def _scan(self) -> dict[Path, tuple[int, int]]:
+        """The modification time and size of every file under the watched paths"""
+        snapshot = {}
+        for path in self.paths:
+            for root, files in self._walk(path):
+                for name in files:
+                    file_path = root / name
+                    try:
+                        stat = file_path.stat()
+                    except FileNotFoundError:
+                        continue
+                    snapshot[file_path] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+
+    def wait(self, timeout: float | None = None) -> set[Path]:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            snapshot = self._scan()
+            changed = {
+                path
+                for path in snapshot.keys() | self._snapshot.keys()
+                if snapshot.get(path) != self._snapshot.get(path)
+            }
+            self._snapshot = snapshot
+            if changed:
+                return changed
+            if deadline is not None and time.monotonic() >= deadline:
+                return set()
+            remaining = self.interval if deadline is None else min(self.interval, deadline - time.monotonic())
+            time.sleep(max(remaining, 0))
+
+
+class InotifyWatcher(FileWatcher):
+    """
+    Watches directories with Linux inotify.
+
+    Directories created under a watched directory are watched as well. The files under the watched directories are
+    tracked so that removing or moving away a directory reports the files that were in it, as polling does.
+    """
+
+    IN_MODIFY = 0x00000002
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_Q_OVERFLOW = 0x00004000
+    IN_IGNORED = 0x00008000
+    IN_ISDIR = 0x40000000
+    MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+    _EVENT = struct.Struct("iIII")
+
+    def __init__(self, paths: Iterable[str | Path], ignore: Iterable[str | Path] = ()) -> None:
+        super().__init__(paths, ignore)
+        if not sys.platform.startswith("linux"):
+            raise OSError("inotify is only available on Linux")
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._watches: dict[int, Path] = {}
+        self._files: set[Path] = set()
+        try:
+            for path in self.paths:
+                self._watch_tree(path)
+        except OSError:
+            self.close()
+            raise
+
+    def _watch(self, path: Path) -> None:
+        """Add a watch for a single directory"""
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(path), self.MASK)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f"Unable to watch {path}")
+        self._watches[wd] = path
+
+    def _watch_tree(self, path: Path) -> set[Path]:
+        """
+        Add watches for a directory and all of its subdirectories.
+
+        :return: The files found under the directory
+        """
+        files = set()
+        for root, names in self._walk(path):
+            self._watch(root)
+            files.update(root / name for name in names)
+        self._files |= files
+        return files
+
+    def _unwatch_tree(self, path: Path) -> set[Path]:
+        """
+        Remove the watches of a directory that was deleted or moved away, and of its subdirectories.
+
+        :return: The files that were known under the directory
+        """
+        for wd, directory in list(self._watches.items()):
+            if directory.is_relative_to(path):
+                # The watch of a deleted directory is already gone, a moved one still follows the directory.
+                self._libc.inotify_rm_watch(self._fd, wd)
+                del self._watches[wd]
+        files = {file for file in self._files if file.is_relative_to(path)}
+        self._files -= files
+        return files
+
+    def wait(self, timeout: float | None = None) -> set[Path]:
+        changed: set[Path] = set()
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if not readable:
+            return changed
+        while True:
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = self._EVENT.unpack_from(data, offset)
+                name = data[offset + self._EVENT.size : offset + self._EVENT.size + length].rstrip(b"\0")
+                offset += self._EVENT.size + length
+                if mask & self.IN_Q_OVERFLOW:
+                    logger.warning("inotify event queue overflowed. Some changes may have been missed.")
+                    continue
+                if mask & self.IN_IGNORED or (directory := self._watches.get(wd)) is None:
+                    # The watch of a deleted directory was removed, its files and itself are reported by the parent.
+                    continue
+                path = directory / os.fsdecode(name)
+                if mask & self.IN_ISDIR:
+                    if mask & (self.IN_CREATE | self.IN_MOVED_TO) and path.is_dir() and path not in self.ignore:
+                        changed |= self._watch_tree(path)
+                    elif mask & (self.IN_DELETE | self.IN_MOVED_FROM):
+                        changed |= self._unwatch_tree(path)
+                    continue
+                if mask & (self.IN_DELETE | self.IN_MOVED_FROM):
+                    self._files.discard(path)
+                else:
+                    self._files.add(path)
+                changed.add(path)
+        return changed
+
+    def close(self) -> None:
+        if getattr(self, "_fd", -1) >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+def create_watcher(
+    paths: Iterable[str | Path],
+    ignore: Iterable[str | Path] = (),
+    force_polling: bool = False,
+    interval: float = 0.5,
+) -> FileWatcher:
+    """
+    Create the best available watcher for `paths`.
+
+    :param paths: The directories to watch recursively.
+    :param ignore: Directories under `paths` that are not watched.
+    :param force_polling: Always poll, even when inotify is available.
+    :param interval: Seconds between two scans when polling.
+    """
+    paths, ignore = list(paths), list(ignore)
+    if not force_polling:
+        try:
+            return InotifyWatcher(paths, ignore)
+        except (OSError, AttributeError) as e:
+            logger.info(f"inotify is not available ({e}). Falling back to polling.")
+    return PollingWatcher(paths, ignore, interval=interval)
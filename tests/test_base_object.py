@@ -77,3 +77,30 @@ class TestBaseObjectProperties:
 
 def test_base_object():
     assert BaseObject._metadata_attrs()["title"] == "Untitled Entry"
+
+
+def test_render_context_matches_to_dict():
+    """Tests that the render context holds the same items as `to_dict` without copying the attributes"""
+
+    class ContextObject(BaseObject):
+        title = "Context"
+        template_vars = {"title": "From template vars", "extra": 1}
+        plugin_settings = {"plugins": {"test_plugin": "test"}, "extra": 2}
+
+    context_object = ContextObject()
+    context_object.description = "A description"
+    context = context_object.render_context()
+
+    assert dict(context) == context_object.to_dict()
+    context_object.description = "Changed"
+    assert context["description"] == "Changed"
+
+
+def test_render_context_uses_overridden_to_dict():
+    """Tests that objects overriding `to_dict` get its result as their render context"""
+
+    class CustomObject(BaseObject):
+        def to_dict(self):
+            return {"custom": True}
+
+    assert dict(CustomObject().render_context()) == {"custom": True}
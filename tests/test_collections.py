@@ -1,5 +1,6 @@
 import pathlib
 import textwrap
+import threading
 
 import pluggy
 import pytest
@@ -7,6 +8,7 @@ from render_engine_parser import BasePageParser
 
 from render_engine.collection import Collection
 from render_engine.page import Page
+from render_engine.site import Site
 
 pm = pluggy.PluginManager("fake_test")
 
@@ -416,3 +418,131 @@ def test_create_entry_no_filename():
     # Since the base Collection object uses a FileContentManager
     with pytest.raises(ValueError):
         Collection().create_entry()
+
+
+def test_collection_get_pages_parses_content_paths_together(tmp_path: pathlib.Path):
+    for index in range(3):
+        (tmp_path / f"page{index}.md").write_text(f"---\ntitle: Page {index}\n---\nContent {index}")
+    calls = []
+
+    class BatchParser(BasePageParser):
+        @classmethod
+        def parse_content_paths(cls, content_paths):
+            calls.append(list(content_paths))
+            return [cls.parse_content_path(content_path) for content_path in content_paths]
+
+    class BatchCollection(Collection):
+        content_path = tmp_path
+        Parser = BatchParser
+        sort_by = "title"
+
+    collection = BatchCollection()
+
+    assert [(page.title, page.content) for page in collection.sorted_pages] == [
+        ("Page 0", "Content 0"),
+        ("Page 1", "Content 1"),
+        ("Page 2", "Content 2"),
+    ]
+    assert len(calls) == 1 and len(calls[0]) == 3
+    assert all(page.parser_extras == {} and page.routes == ["./"] for page in collection)
+
+
+def test_collection_parse_pages_in_batches(tmp_path: pathlib.Path, mocker):
+    batches = []
+
+    class BatchParser(BasePageParser):
+        @staticmethod
+        def parse(content, extras=None):
+            return content.upper()
+
+        @classmethod
+        def parse_many(cls, contents, extras=None):
+            batches.append(list(contents))
+            return [content.upper() for content in contents]
+
+    class BatchCollection(Collection):
+        Parser = BatchParser
+        parse_batch_size = 2
+        pages = [Page(content=f"page {index}") for index in range(5)]
+
+    collection = BatchCollection()
+    for page in collection:
+        page.Parser = BatchParser
+    parse = mocker.spy(BatchParser, "parse")
+
+    collection.parse_pages(collection)
+
+    assert batches == [["page 0", "page 1"], ["page 2", "page 3"], ["page 4"]]
+    assert [page._content for page in collection] == [f"PAGE {index}" for index in range(5)]
+    assert parse.call_count == 0
+
+
+def test_collection_parses_batches_in_render_units(tmp_path: pathlib.Path):
+    """The batches are parsed by the units rendering their pages, not by the thread scheduling them"""
+    parsed_by = []
+
+    class ThreadBatchParser(BasePageParser):
+        @classmethod
+        def parse_many(cls, contents, extras=None):
+            parsed_by.append((threading.current_thread(), len(contents)))
+            return [content.upper() for content in contents]
+
+    class Posts(Collection):
+        Parser = ThreadBatchParser
+        parse_batch_size = 2
+        pages = [Page(content=f"page {index}") for index in range(5)]
+
+    for index, page in enumerate(Posts.pages):
+        page.Parser = ThreadBatchParser
+        page.title = f"Page {index}"
+    site = Site()
+    site.output_path = tmp_path / "output"
+    site.collection(Posts)
+    site.render()
+
+    assert sorted(count for _, count in parsed_by) == [1, 2, 2]
+    assert threading.main_thread() not in {thread for thread, _ in parsed_by}
+    assert (tmp_path / "output" / "page-3.html").read_text() == "PAGE 3"
+
+
+def test_collection_parses_pages_one_at_a_time_when_a_batch_fails(tmp_path: pathlib.Path, caplog):
+    class FailingBatchParser(BasePageParser):
+        @classmethod
+        def parse_many(cls, contents, extras=None):
+            raise ValueError("batch failed")
+
+        @staticmethod
+        def parse(content, extras=None):
+            return content.upper()
+
+    class Posts(Collection):
+        Parser = FailingBatchParser
+        parse_batch_size = 2
+        pages = [Page(content=f"page {index}") for index in range(3)]
+
+    for index, page in enumerate(Posts.pages):
+        page.Parser = FailingBatchParser
+        page.title = f"Page {index}"
+    site = Site()
+    site.output_path = tmp_path / "output"
+    site.collection(Posts)
+    site.render()
+
+    assert [(tmp_path / "output" / f"page-{index}.html").read_text() for index in range(3)] == [
+        "PAGE 0",
+        "PAGE 1",
+        "PAGE 2",
+    ]
+    assert "Parsing them one at a time" in caplog.text
+
+
+def test_collection_parse_pages_requires_parse_many(mocker):
+    class NoBatchCollection(Collection):
+        pages = [Page(content="page")]
+
+    collection = NoBatchCollection()
+    parse = mocker.spy(collection.Parser, "parse")
+
+    collection.parse_pages(collection)
+
+    assert parse.call_count == 0
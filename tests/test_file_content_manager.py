@@ -1,7 +1,11 @@
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+import pytest
+
 from render_engine import Collection
 from render_engine.content_managers import FileContentManager
+from render_engine.parsers import BasePageParser
 
 
 def test_find_entry(tmp_path):
@@ -76,3 +80,154 @@ def test_update_entry(tmp_path):
     assert page.content == updated
     assert page.test_attr == "Test"
     assert len(collection.content_manager) == 1
+
+
+def test_lazy_pages_read_content_when_used(tmp_path, mocker):
+    content_path = Path(tmp_path, "test-collection")
+    content_path.mkdir(parents=True)
+    for index in range(3):
+        (content_path / f"page{index}.md").write_text(f"---\ntitle: Page {index}\n---\nContent {index}")
+
+    class TestCollection(Collection):
+        content_path = Path(tmp_path, "test-collection")
+        content_manager_extras = {"lazy": True}
+        sort_by = "title"
+
+    parse_content_path = mocker.spy(TestCollection.Parser, "parse_content_path")
+    collection = TestCollection()
+
+    assert [page.title for page in collection.sorted_pages] == ["Page 0", "Page 1", "Page 2"]
+    assert parse_content_path.call_count == 0
+
+    page = collection.content_manager.find_entry(title="Page 1")
+    assert page.content == "Content 1"
+    assert page._content == "Content 1"
+    assert parse_content_path.call_count == 1
+
+
+def test_lazy_pages_with_markdown_parser(tmp_path):
+    from render_engine_markdown import MarkdownPageParser
+
+    (tmp_path / "page.md").write_text("---\ntitle: Markdown\n---\n**bold**")
+
+    class TestCollection(Collection):
+        content_path = tmp_path
+        content_manager_extras = {"lazy": True}
+        Parser = MarkdownPageParser
+
+    (page,) = TestCollection()
+
+    assert page.title == "Markdown"
+    assert "content" not in vars(page)
+    assert page._content == "<p><strong>bold</strong></p>\n"
+
+
+@pytest.mark.parametrize("load_backend", ["thread", "process"])
+@pytest.mark.parametrize("lazy", [False, True])
+def test_pages_load_in_parallel_in_order(tmp_path, load_backend, lazy):
+    for index in range(50):
+        (tmp_path / f"page{index:02}.md").write_text(f"---\ntitle: Page {index}\n---\nContent {index}")
+
+    def load(**extras):
+        class TestCollection(Collection):
+            content_path = tmp_path
+            content_manager_extras = {"lazy": lazy, **extras}
+
+        return [(page.content_path, page.title, page.content) for page in TestCollection()]
+
+    assert load(max_workers=4, load_backend=load_backend) == load()
+
+
+def test_process_load_backend_does_not_fork(tmp_path, mocker):
+    """Pages are loaded while other threads run, so the worker processes are not forked from the loading process"""
+    spy = mocker.patch(
+        "render_engine.content_managers.file_content_manager.ProcessPoolExecutor", wraps=ProcessPoolExecutor
+    )
+    for index in range(4):
+        (tmp_path / f"page{index}.md").write_text(f"---\ntitle: Page {index}\n---\nContent {index}")
+
+    class TestCollection(Collection):
+        content_path = tmp_path
+        content_manager_extras = {"max_workers": 2, "load_backend": "process"}
+
+    assert sorted(page.title for page in TestCollection()) == [f"Page {index}" for index in range(4)]
+    assert spy.call_args.kwargs["mp_context"].get_start_method() != "fork"
+
+
+def test_process_load_backend_falls_back_to_threads(tmp_path, mocker):
+    """A parser that worker processes cannot import is run by threads"""
+    spy = mocker.patch("render_engine.content_managers.file_content_manager.ProcessPoolExecutor")
+    (tmp_path / "page0.md").write_text("---\ntitle: Page 0\n---\nContent 0")
+    (tmp_path / "page1.md").write_text("---\ntitle: Page 1\n---\nContent 1")
+
+    class LocalParser(BasePageParser):
+        pass
+
+    class TestCollection(Collection):
+        content_path = tmp_path
+        content_manager_extras = {"max_workers": 2, "load_backend": "process"}
+        Parser = LocalParser
+
+    assert sorted(page.title for page in TestCollection()) == ["Page 0", "Page 1"]
+    assert not spy.called
+
+
+def test_unknown_load_backend(tmp_path):
+    with pytest.raises(ValueError):
+        FileContentManager(content_path=tmp_path, collection=None, load_backend="fiber")
+
+
+@pytest.mark.parametrize("include_suffixes", [("*.md", "*.html"), ("**/*.md",), ("*/*.md", "*.html"), ("*",)])
+def test_iter_content_path_matches_glob(tmp_path, include_suffixes):
+    for path in ("a.md", ".hidden.md", "b.html", "c.txt", "sub/d.md", "sub/deep/e.md", "other/f.html"):
+        (tmp_path / path).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / path).write_text("content")
+    (tmp_path / "folder.md").mkdir()
+
+    content_manager = FileContentManager(content_path=tmp_path, collection=None, include_suffixes=include_suffixes)
+    expected = [path for pattern in include_suffixes for path in tmp_path.glob(pattern) if path.is_file()]
+    assert list(content_manager.iter_content_path()) == expected
+
+
+def test_iter_content_path_recursive_with_exclude(tmp_path):
+    for path in ("a.md", "b.html", "sub/c.md", "sub/deep/d.md", "drafts/e.md", "sub/drafts/f.md", "sub/_g.md"):
+        (tmp_path / path).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / path).write_text("content")
+
+    content_manager = FileContentManager(
+        content_path=tmp_path, collection=None, recursive=True, exclude=["drafts", "_*", "sub/deep"]
+    )
+    assert sorted(path.relative_to(tmp_path).as_posix() for path in content_manager.iter_content_path()) == [
+        "a.md",
+        "b.html",
+        "sub/c.md",
+    ]
+
+
+@pytest.mark.parametrize("include_suffixes", [["**/*.md"], ["*.md", "*/*.md", "*/*/*.md"]])
+def test_iter_content_path_symlink_loop(tmp_path, include_suffixes):
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "a.md").write_text("content")
+    (tmp_path / "sub" / "b.md").write_text("content")
+    (tmp_path / "sub" / "loop").symlink_to(tmp_path, target_is_directory=True)
+
+    content_manager = FileContentManager(content_path=tmp_path, collection=None, include_suffixes=include_suffixes)
+    expected = [path for pattern in include_suffixes for path in tmp_path.glob(pattern)]
+    assert list(content_manager.iter_content_path()) == expected
+
+
+def test_iter_content_path_missing_directory(tmp_path):
+    content_manager = FileContentManager(content_path=tmp_path / "missing", collection=None)
+    assert list(content_manager.iter_content_path()) == []
+
+
+def test_recursive_collection(tmp_path):
+    (tmp_path / "2024").mkdir()
+    (tmp_path / "2024" / "post.md").write_text("---\ntitle: Nested\n---\nNested content")
+    (tmp_path / "top.md").write_text("---\ntitle: Top\n---\nTop content")
+
+    class TestCollection(Collection):
+        content_path = tmp_path
+        content_manager_extras = {"recursive": True}
+
+    assert sorted(page.title for page in TestCollection()) == ["Nested", "Top"]
@@ -0,0 +1,188 @@
+import json
+from pathlib import Path
+
+import pytest
+from jinja2 import FileSystemLoader
+
+from render_engine.collection import Collection
+from render_engine.manifest import MANIFEST_NAME, BuildManifest, stable
+from render_engine.page import BasePage, Page
+from render_engine.site import Site
+
+
+@pytest.fixture
+def site_files(tmp_path: Path) -> Path:
+    content = tmp_path / "content"
+    content.mkdir()
+    (content / "first.md").write_text("---\ntitle: First\n---\nThe first post")
+    (content / "second.md").write_text("---\ntitle: Second\n---\nThe second post")
+    templates = tmp_path / "templates"
+    templates.mkdir()
+    (templates / "post.html").write_text("<p>{{ content }}</p>")
+    return tmp_path
+
+
+def make_site(tmp_path: Path, template: str = "post.html") -> Site:
+    site = Site(incremental=True, cache_path=tmp_path / "cache")
+    site.output_path = tmp_path / "output"
+    site.theme_manager.engine.loader.loaders.insert(0, FileSystemLoader(tmp_path / "templates"))
+
+    class Posts(Collection):
+        content_path = tmp_path / "content"
+
+    Posts.template = template
+    site.collection(Posts)
+
+    @site.page
+    class About(Page):
+        content = "about"
+
+    return site
+
+
+def rendered(spy) -> set[str]:
+    return {call.args[0]._slug for call in spy.call_args_list}
+
+
+def test_incremental_build_writes_manifest(site_files: Path):
+    make_site(site_files).render()
+
+    manifest = json.loads((site_files / "cache" / MANIFEST_NAME).read_text())
+    assert {"first.html", "second.html", "about.html", "posts.rss"} <= set(manifest["outputs"])
+
+
+def test_incremental_build_skips_unchanged_entries(site_files: Path, mocker):
+    make_site(site_files).render()
+    spy = mocker.spy(BasePage, "render")
+
+    make_site(site_files).render()
+
+    assert spy.call_count == 0
+
+
+def test_incremental_build_renders_changed_source(site_files: Path, mocker):
+    make_site(site_files).render()
+    (site_files / "content" / "first.md").write_text("---\ntitle: First\n---\nAn update")
+    spy = mocker.spy(BasePage, "render")
+
+    site = make_site(site_files)
+    site.render()
+
+    # The changed page and the feed that contains it
+    assert rendered(spy) == {"first", "posts"}
+    assert (site.output_path / "first.html").read_text() == "<p>An update</p>"
+
+
+def test_incremental_build_renders_on_template_change(site_files: Path, mocker):
+    make_site(site_files).render()
+    (site_files / "templates" / "post.html").write_text("<div>{{ content }}</div>")
+    spy = mocker.spy(BasePage, "render")
+
+    make_site(site_files).render()
+
+    assert {"first", "second"} <= rendered(spy)
+    assert "about" not in rendered(spy)
+
+
+def test_incremental_build_renders_dependents_of_partial(site_files: Path, mocker):
+    """Editing an included template only invalidates the outputs that include it"""
+    (site_files / "templates" / "manifest_footer.html").write_text("footer")
+    (site_files / "templates" / "manifest_post.html").write_text(
+        "<p>{{ content }}</p>{% include 'manifest_footer.html' %}"
+    )
+    make_site(site_files, template="manifest_post.html").render()
+    (site_files / "templates" / "manifest_footer.html").write_text("new footer")
+    spy = mocker.spy(BasePage, "render")
+
+    site = make_site(site_files, template="manifest_post.html")
+    site.render()
+
+    assert rendered(spy) == {"first", "second"}
+    assert (site.output_path / "second.html").read_text() == "<p>The second post</p>new footer"
+
+
+def test_incremental_build_renders_missing_output(site_files: Path, mocker):
+    make_site(site_files).render()
+    (site_files / "output" / "about.html").unlink()
+    spy = mocker.spy(BasePage, "render")
+
+    make_site(site_files).render()
+
+    assert rendered(spy) == {"about"}
+    assert (site_files / "output" / "about.html").exists()
+
+
+def test_incremental_build_renders_pages_reading_the_site(site_files: Path, mocker):
+    """A page whose template lists other entries is rendered again when one of them changes"""
+    (site_files / "templates" / "manifest_home.html").write_text(
+        "{% for post in routes['posts'] %}[{{ post.content }}]{% endfor %}"
+    )
+
+    def build() -> Site:
+        site = make_site(site_files)
+
+        @site.page
+        class Home(Page):
+            template = "manifest_home.html"
+
+        site.render()
+        return site
+
+    build()
+    spy = mocker.spy(BasePage, "render")
+    build()
+    assert spy.call_count == 0
+
+    (site_files / "content" / "first.md").write_text("---\ntitle: First\n---\nAn update")
+    site = build()
+
+    assert rendered(spy) == {"first", "posts", "home"}
+    assert "[An update]" in (site.output_path / "home.html").read_text()
+
+
+def test_incremental_build_always_renders(site_files: Path, mocker):
+    """Entries with `always_render` set are rendered by every incremental build"""
+
+    def build() -> None:
+        site = make_site(site_files)
+
+        @site.page
+        class Latest(Page):
+            content = "latest"
+            always_render = True
+
+        site.render()
+
+    build()
+    spy = mocker.spy(BasePage, "render")
+    build()
+
+    assert rendered(spy) == {"latest"}
+
+
+def test_manifest_for_other_output_path_is_ignored(tmp_path: Path):
+    manifest = BuildManifest(tmp_path / MANIFEST_NAME, tmp_path / "output")
+    manifest.record(["index.html"], "digest")
+    manifest.save()
+
+    assert BuildManifest.load(tmp_path / MANIFEST_NAME, tmp_path / "output").outputs == {
+        "index.html": {"inputs": "digest", "templates": {}}
+    }
+    assert BuildManifest.load(tmp_path / MANIFEST_NAME, tmp_path / "other").outputs == {}
+
+
+def test_stable_values_are_process_independent():
+    class Opaque:
+        pass
+
+    assert stable({"b": {2, 1}, "a": Path("x/y"), "c": Opaque()}) == {
+        "b": [1, 2],
+        "a": "x/y",
+        "c": f"{__name__}.test_stable_values_are_process_independent.<locals>.Opaque",
+    }
+
+
+def test_stable_lazy_page_includes_content(site_files: Path):
+    path = site_files / "content" / "first.md"
+
+    assert stable(Page(content_path=path, lazy=True)) == stable(Page(content_path=path))
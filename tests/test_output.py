@@ -0,0 +1,273 @@
+import os
+import tarfile
+import threading
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from render_engine.collection import Collection
+from render_engine.data_object import DataObject
+from render_engine.output import ArchiveBackend, FileSystemBackend, MemoryBackend, OutputWriter
+from render_engine.page import Page
+from render_engine.site import Site
+
+
+def test_writer_creates_parent_directories(tmp_path: Path):
+    writer = OutputWriter(FileSystemBackend(tmp_path))
+
+    assert writer.write_text("nested/index.html", "hello") == 5
+    assert (tmp_path / "nested" / "index.html").read_text() == "hello"
+    assert writer.counts() == (1, 0)
+
+
+def test_writer_always_writes_by_default(tmp_path: Path):
+    writer = OutputWriter(FileSystemBackend(tmp_path))
+    writer.write_text("index.html", "hello")
+    writer.write_text("index.html", "hello")
+
+    assert writer.counts() == (2, 0)
+
+
+def test_writer_skips_unchanged_content(tmp_path: Path):
+    path = tmp_path / "index.html"
+    path.write_text("hello")
+    os.utime(path, ns=(0, 0))
+    writer = OutputWriter(FileSystemBackend(tmp_path), write_if_changed=True)
+
+    assert writer.write_text("index.html", "hello") == 0
+    assert path.stat().st_mtime_ns == 0
+
+    assert writer.write_text("index.html", "changed") == 7
+    assert path.read_text() == "changed"
+    assert writer.counts() == (1, 1)
+
+
+def test_writer_uses_recorded_digest(tmp_path: Path, mocker):
+    path = tmp_path / "index.html"
+    writer = OutputWriter(FileSystemBackend(tmp_path), write_if_changed=True)
+    writer.write_text("index.html", "hello")
+    read_text = mocker.spy(Path, "read_text")
+
+    assert writer.write_text("index.html", "hello") == 0
+    assert read_text.call_count == 0
+
+    # A file modified by something else is compared with its content
+    path.write_text("modified elsewhere")
+    assert writer.write_text("index.html", "hello") == 5
+    assert read_text.call_count == 1
+
+
+@pytest.mark.parametrize("render_backend", ["thread", "process"])
+def test_site_reports_changed_files(tmp_path: Path, render_backend: str):
+    site = Site(output_path=tmp_path / "output", write_if_changed=True, render_backend=render_backend)
+
+    @site.page
+    class Index(Page):
+        content = "index"
+
+    @site.data_object
+    class Data(DataObject):
+        data_object = {"key": "value"}
+
+    site.render()
+    assert site.output_writer.counts() == (2, 0)
+
+    Index.content = "changed"
+    site.render()
+    assert site.output_writer.counts() == (1, 1)
+
+
+def test_queued_writer_writes_on_flush(tmp_path: Path):
+    writer = OutputWriter(FileSystemBackend(tmp_path), threads=2, batch_size=4)
+    for index in range(20):
+        assert writer.write_text(f"dir{index % 3}/{index}.html", "hello") == 5
+
+    writer.flush()
+
+    assert len(list(tmp_path.rglob("*.html"))) == 20
+    assert writer.counts() == (20, 0)
+    writer.close()
+    assert not writer._workers
+
+
+def test_queued_writer_applies_backpressure(tmp_path: Path, mocker):
+    writer = OutputWriter(FileSystemBackend(tmp_path), threads=1, queue_size=1, batch_size=1)
+    release = threading.Event()
+    write = writer._write
+    mocker.patch.object(writer, "_write", side_effect=lambda *args: release.wait() and write(*args))
+
+    writer.write_text("1.html", "1")  # taken by the I/O thread, which blocks
+    writer.write_text("2.html", "2")  # fills the queue
+    third = threading.Thread(target=writer.write_text, args=("3.html", "3"))
+    third.start()
+    third.join(timeout=0.2)
+    assert third.is_alive()
+
+    release.set()
+    third.join(timeout=5)
+    writer.flush()
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["1.html", "2.html", "3.html"]
+    writer.close()
+
+
+def test_queued_writer_raises_errors_on_flush(tmp_path: Path):
+    (tmp_path / "file").write_text("not a directory")
+    writer = OutputWriter(FileSystemBackend(tmp_path), threads=1)
+    writer.write_text("file/index.html", "hello")
+
+    with pytest.raises(OSError):
+        writer.flush()
+    writer.close()
+
+
+@pytest.mark.parametrize("render_backend", ["thread", "process"])
+def test_site_with_writer_threads(tmp_path: Path, render_backend: str):
+    with Site(output_path=tmp_path / "output", writer_threads=2, render_backend=render_backend) as site:
+
+        @site.page
+        class Index(Page):
+            content = "index"
+
+        @site.data_object
+        class Data(DataObject):
+            data_object = {"key": "value"}
+
+        site.render()
+
+        assert (tmp_path / "output" / "index.html").read_text() == "index"
+        assert (tmp_path / "output" / "data_object.json").read_text() == '{"key": "value"}'
+        assert site.output_writer.counts() == (2, 0)
+
+
+def test_memory_backend():
+    backend = MemoryBackend()
+    writer = OutputWriter(backend, write_if_changed=True)
+
+    writer.write_text("blog/post.html", "hello")
+    assert backend.files == {"blog/post.html": "hello"}
+    assert writer.write_text("blog/post.html", "hello") == 0
+
+    backend.delete("blog/post.html")
+    assert not backend.exists("blog/post.html")
+
+
+@pytest.mark.parametrize("render_backend", ["thread", "process"])
+def test_site_renders_to_memory(tmp_path: Path, render_backend: str):
+    static = tmp_path / "static"
+    static.mkdir()
+    (static / "style.css").write_text("body {}")
+    backend = MemoryBackend()
+    site = Site(
+        output_path=tmp_path / "output",
+        static_paths={static},
+        output_backend=backend,
+        render_backend=render_backend,
+    )
+
+    @site.page
+    class Index(Page):
+        content = "index"
+        slug_only_url = True
+
+    @site.data_object
+    class Data(DataObject):
+        data_object = {"key": "value"}
+
+    site.render()
+
+    assert backend.files["index/index.html"] == "index"
+    assert "index.html" in backend.files  # the slug only redirect
+    assert backend.files["data_object.json"] == '{"key": "value"}'
+    assert backend.files["static/style.css"] == b"body {}"
+    assert not (tmp_path / "output").exists()
+
+
+def test_changing_output_path_moves_file_system_backend(tmp_path: Path):
+    site = Site()
+    site.output_path = tmp_path / "elsewhere"
+
+    assert site.output_backend.root == tmp_path / "elsewhere"
+
+
+def archive_contents(path: Path) -> dict[str, bytes]:
+    if path.suffix == ".zip":
+        with zipfile.ZipFile(path) as archive:
+            return {name: archive.read(name) for name in archive.namelist()}
+    with tarfile.open(path) as archive:
+        return {member.name: archive.extractfile(member).read() for member in archive.getmembers()}
+
+
+@pytest.mark.parametrize("name", ["site.tar", "site.tar.gz", "site.zip"])
+@pytest.mark.parametrize("writer_threads", [0, 2])
+def test_site_renders_to_archive(tmp_path: Path, name: str, writer_threads: int):
+    static = tmp_path / "static"
+    static.mkdir()
+    (static / "style.css").write_text("body {}")
+    content = tmp_path / "content"
+    content.mkdir()
+    for index in range(10):
+        (content / f"post{index}.md").write_text(f"---\ntitle: post{index}\n---\npost {index}")
+    site = Site(
+        static_paths={static},
+        output_backend=ArchiveBackend(tmp_path / name, prefix="public"),
+        writer_threads=writer_threads,
+        render_backend="process",
+    )
+
+    @site.collection
+    class Posts(Collection):
+        content_path = content
+
+    site.render()
+
+    contents = archive_contents(tmp_path / name)
+    assert contents["public/post3.html"] == b"post 3"
+    assert contents["public/static/style.css"] == b"body {}"
+    assert "public/posts.rss" in contents
+    assert not (tmp_path / "output").exists()
+
+
+@pytest.mark.parametrize("name", ["site.tar.gz", "site.zip"])
+def test_site_rebuild_updates_archive(tmp_path: Path, name: str):
+    """A rebuild keeps the entries of the archive it does not render again"""
+    content = tmp_path / "content"
+    content.mkdir()
+    for index in range(3):
+        (content / f"post{index}.md").write_text(f"---\ntitle: post{index}\n---\npost {index}")
+    site = Site(output_backend=ArchiveBackend(tmp_path / name))
+
+    @site.collection
+    class Posts(Collection):
+        content_path = content
+
+    site.render()
+    (content / "post1.md").write_text("---\ntitle: post1\n---\nupdated")
+    (content / "post2.md").unlink()
+    site.rebuild([content / "post1.md", content / "post2.md"])
+
+    contents = archive_contents(tmp_path / name)
+    assert contents["post0.html"] == b"post 0"
+    assert contents["post1.html"] == b"updated"
+    assert "post2.html" not in contents
+    assert b"updated" in contents["posts.rss"]
+    assert list(tmp_path.glob("*.previous")) == []
+
+
+@pytest.mark.parametrize("name", ["site.tar.gz", "site.zip"])
+def test_site_render_closes_archive_when_loading_fails(tmp_path: Path, name: str, mocker):
+    site = Site(output_backend=ArchiveBackend(tmp_path / name))
+    mocker.patch.object(site, "load_content", side_effect=RuntimeError("unreadable content"))
+
+    with pytest.raises(RuntimeError):
+        site.render()
+
+    assert site.output_backend._archive is None
+    archive_contents(tmp_path / name)
+
+
+def test_archive_backend_requires_known_format(tmp_path: Path):
+    with pytest.raises(ValueError):
+        ArchiveBackend(tmp_path / "site.rar")
+
+    assert ArchiveBackend(tmp_path / "site", format="tar.xz").format == "tar.xz"
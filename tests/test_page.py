@@ -5,6 +5,16 @@ import jinja2
 import pytest
 
 from render_engine import Page, RedirectPage
+from render_engine.page import _content_template
+from render_engine.parsers import BasePageParser
+
+
+@pytest.fixture(autouse=True)
+def clear_content_templates():
+    """The compiled content templates are shared by every page"""
+    _content_template.cache_clear()
+    yield
+    _content_template.cache_clear()
 
 
 @pytest.fixture
@@ -167,6 +177,52 @@ def test_no_prerender():
     assert CustomPage()._render_from_template(template=CustomPage.template) == "1234\n{{ site_map.find('test') }}"
 
 
+def test_content_template_compiled_once(mocker):
+    """Tests that pages with the same content share their compiled content template"""
+    template = jinja2.Template("{{content}}")
+    compile_template = mocker.spy(jinja2.Template, "__new__")
+
+    class CustomPage(Page):
+        content = "{{ site_map is defined }}"
+
+    assert CustomPage()._render_from_template(template=template) == "False"
+    assert CustomPage()._render_from_template(template=template) == "False"
+    assert compile_template.call_count == 1
+
+
+def test_content_without_site_map_is_not_searched(mocker):
+    """Tests that content whose source does not mention the site map is never searched or compiled"""
+    search = mocker.patch("render_engine.page._content_template")
+
+    class CustomPage(Page):
+        content = "{{ example }}"
+
+    assert CustomPage()._render_from_template(template=jinja2.Template("{{content}}")) == "{{ example }}"
+    search.assert_not_called()
+
+
+def test_render_context_layers(tmp_path: pathlib.Path):
+    """Tests that keyword arguments override the page attributes and included templates see the context"""
+    environment = jinja2.Environment(
+        loader=jinja2.DictLoader(
+            {
+                "layers.html": "{{ title }}|{{ extra }}|{% include 'layers_include.html' %}",
+                "layers_include.html": "{{ x }}",
+            }
+        )
+    )
+    environment.globals["x"] = "global"
+
+    class CustomPage(Page):
+        title = "Layers"
+        template_vars = {"extra": "template var"}
+
+    page = CustomPage()
+    template = environment.get_template("layers.html")
+    assert page._render_from_template(template) == "Layers|template var|global"
+    assert page._render_from_template(template, extra="keyword", x="local") == "Layers|keyword|local"
+
+
 class TestRedirectPage:
     @pytest.mark.parametrize(
         "content, content_path, expected",
@@ -197,3 +253,28 @@ class TestRedirectPage:
                 pass
 
             TestPage()
+
+
+def test_parsed_content_is_cached(mocker):
+    from render_engine.page import parse_stats
+
+    class CountingParser(BasePageParser):
+        @staticmethod
+        def parse(content, extras=None):
+            return content.upper()
+
+    parse = mocker.spy(CountingParser, "parse")
+    page = Page(content="hello", Parser=CountingParser)
+    page.parser_extras = {"option": ["a"]}
+    parse_stats.reset()
+
+    assert page._content == "HELLO"
+    assert page._content == "HELLO"
+    assert parse.call_count == 1
+    assert (parse_stats.parsed, parse_stats.skipped) == (1, 1)
+
+    page.content = "changed"
+    assert page._content == "CHANGED"
+    page.parser_extras["option"].append("b")
+    assert page._content == "CHANGED"
+    assert parse.call_count == 3
@@ -0,0 +1,136 @@
+import time
+from pathlib import Path
+
+import pytest
+
+from render_engine.collection import Collection
+from render_engine.parse_cache import PARSE_CACHE_NAME, ParseCache, parser_version
+from render_engine.parsers import BasePageParser
+from render_engine.site import Site
+
+
+class UpperParser(BasePageParser):
+    @staticmethod
+    def parse(content, extras=None):
+        return content.upper()
+
+
+class VersionedParser(UpperParser):
+    cache_version = "2"
+
+
+def test_parse_cache_round_trip(tmp_path: Path):
+    cache = ParseCache(tmp_path / PARSE_CACHE_NAME)
+    key = cache.key(UpperParser, "hello", {})
+
+    assert cache.get(key) is None
+    cache.put(key, "HELLO")
+    assert cache.get(key) == "HELLO"
+    assert (cache.hits, cache.misses) == (1, 1)
+    cache.close()
+
+    assert ParseCache(tmp_path / PARSE_CACHE_NAME).get(key) == "HELLO"
+
+
+def test_parse_cache_key():
+    key = ParseCache.key(UpperParser, "hello", {"extras": ["a"]})
+
+    assert key == ParseCache.key(UpperParser, "hello", {"extras": ["a"]})
+    assert key != ParseCache.key(UpperParser, "hello!", {"extras": ["a"]})
+    assert key != ParseCache.key(UpperParser, "hello", {"extras": ["b"]})
+    assert key != ParseCache.key(VersionedParser, "hello", {"extras": ["a"]})
+    assert ParseCache.key(UpperParser, {"not": "text"}, {}) is None
+    assert parser_version(VersionedParser) == "2"
+
+
+def test_parse_cache_evicts_least_recently_used(tmp_path: Path):
+    cache = ParseCache(tmp_path / PARSE_CACHE_NAME, max_size=10)
+    for key in ("first", "second", "third"):
+        cache.put(key, "12345")
+        time.sleep(0.01)
+    cache.get("first")
+
+    cache.close()
+
+    cache = ParseCache(tmp_path / PARSE_CACHE_NAME, max_size=10)
+    assert cache.get("second") is None
+    assert cache.get("first") == "12345"
+    assert cache.get("third") == "12345"
+
+
+def test_parse_cache_clear(tmp_path: Path):
+    cache = ParseCache(tmp_path / PARSE_CACHE_NAME)
+    cache.put("key", "value")
+
+    cache.clear()
+
+    assert len(cache) == 0
+
+
+@pytest.mark.parametrize("render_backend", ["thread", "process"])
+def test_parse_cache_is_reused_across_builds(tmp_path: Path, mocker, render_backend: str):
+    content = tmp_path / "content"
+    content.mkdir()
+    for index in range(3):
+        (content / f"post{index}.md").write_text(f"---\ntitle: Post {index}\n---\npost {index}")
+
+    def build() -> Site:
+        site = Site(
+            output_path=tmp_path / "output",
+            cache_path=tmp_path / "cache",
+            cache_parsed_content=True,
+            render_backend=render_backend,
+        )
+
+        @site.collection
+        class Posts(Collection):
+            content_path = content
+            Parser = UpperParser
+
+        site.render()
+        return site
+
+    build()
+    parse = mocker.spy(UpperParser, "parse")
+    site = build()
+
+    assert parse.call_count == 0
+    assert (tmp_path / "output" / "post-1.html").read_text() == "POST 1"
+    assert site.parse_cache.hits == 3
+
+
+def test_parse_cache_records_usage_of_worker_processes(tmp_path: Path):
+    """Entries read by worker processes are not the least recently used ones when the parent evicts"""
+    content = tmp_path / "content"
+    content.mkdir()
+    (content / "post.md").write_text("---\ntitle: Post\n---\npost")
+
+    def build() -> Site:
+        site = Site(
+            output_path=tmp_path / "output",
+            cache_path=tmp_path / "cache",
+            cache_parsed_content=True,
+            parse_cache_size=10,
+            render_backend="process",
+        )
+
+        @site.collection
+        class Posts(Collection):
+            content_path = content
+            Parser = UpperParser
+
+        site.render()
+        return site
+
+    build()
+    cache = ParseCache(tmp_path / "cache" / PARSE_CACHE_NAME)
+    time.sleep(0.01)
+    cache.put("stale", "12345678")
+    cache.close()
+
+    site = build()
+
+    assert site.parse_cache.hits == 1
+    cache = ParseCache(tmp_path / "cache" / PARSE_CACHE_NAME)
+    assert cache.get("stale") is None
+    assert len(cache) == 1
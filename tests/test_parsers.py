@@ -0,0 +1,81 @@
+import frontmatter
+import pytest
+import yaml
+
+from render_engine.parsers import base_parsers
+from render_engine.parsers.base_parsers import BasePageParser, parse_content, parse_metadata
+
+FRONTMATTER_TEXTS = [
+    "---\ntitle: Hello\ntags: [a, b]\n---\nbody\n---\nnot frontmatter: true\n",
+    "\n\n---\ntitle: After blank lines\n---\n\nbody",
+    "----  \ntitle: Long boundary\n----\nbody",
+    '+++\ntitle = "toml"\n+++\nbody',
+    '{\n"title": "json"\n}\nbody',
+    "---\ntitle: Never closed\n",
+    "no frontmatter\n---\ntitle: Not metadata\n---\n",
+    "",
+]
+
+
+@pytest.mark.parametrize("text", FRONTMATTER_TEXTS)
+def test_parse_metadata_matches_parse_content(text: str):
+    assert parse_metadata(text.splitlines(keepends=True)) == parse_content(text)[0]
+
+
+def test_parse_metadata_path_stops_after_frontmatter(tmp_path):
+    path = tmp_path / "page.md"
+    path.write_text("---\ntitle: Hello\n---\n" + "body\n" * 1000)
+    lines_read = []
+
+    def lines():
+        for line in path.read_text().splitlines(keepends=True):
+            lines_read.append(line)
+            yield line
+
+    assert parse_metadata(lines()) == {"title": "Hello"}
+    assert len(lines_read) == 3
+    assert BasePageParser.parse_metadata_path(path) == {"title": "Hello"}
+
+
+YAML_TEXTS = [
+    "---\ntitle: Hello World\nauthor: Jane Doe\n---\n\nbody\n",
+    "---\r\ntitle: Windows\r\n---\r\nbody\r\nmore\r\n",
+    "---\ntitle: yes\ncount: 3\ndate: 2024-05-01\n---\nbody",
+    "---\non: value\n---\nbody",
+    "---\ntitle: No way\nnote: On time\ndraft: False \n---\nbody",
+    "---\ntitle: a #comment\nurl: http://example.com/a:b\n---\nbody",
+    "---\ntitle: 'quoted'\ntags: [a, b]\n---\nbody",
+    "---\ntitle: multi\n  line\n---\nbody",
+    "---\nempty:\n---\nbody",
+    "---\n- a list\n---\nbody",
+    "---\ntitle: Café ☕\n---\nbody",
+    "---\ntitle: Only one boundary",
+    "  \n---\ntitle: Leading whitespace\n---\nbody",
+]
+
+
+@pytest.mark.parametrize("text", YAML_TEXTS + FRONTMATTER_TEXTS)
+def test_parse_content_matches_frontmatter(text: str):
+    assert parse_content(text) == frontmatter.parse(text)
+
+
+def test_parse_content_invalid_yaml_raises():
+    with pytest.raises(yaml.YAMLError):
+        parse_content("---\ntitle: a: b\n---\nbody")
+
+
+def test_parse_content_simple_frontmatter_skips_yaml(mocker):
+    load = mocker.spy(yaml, "load")
+
+    assert parse_content("---\ntitle: Hello\nauthor: Jane\n---\nbody") == ({"title": "Hello", "author": "Jane"}, "body")
+    assert load.call_count == 0
+
+    assert parse_content("---\ntitle: Hello\ndraft: true\n---\nbody") == ({"title": "Hello", "draft": True}, "body")
+    assert load.call_count == 1
+
+
+def test_parse_content_typed_frontmatter_skips_line_checks(mocker):
+    is_plain_string = mocker.spy(base_parsers, "_is_plain_string")
+
+    assert parse_content("---\ntitle: Hello\nauthor: Jane\ndate: 2024-05-01\n---\nbody")[0]["title"] == "Hello"
+    assert is_plain_string.call_count == 0
@@ -2,6 +2,7 @@ import importlib
 import json
 import typing
 
+import pluggy
 import pytest
 
 from render_engine.collection import Collection
@@ -363,3 +364,183 @@ def test_plugin_settings_are_passed_properly(plugin_test_site, settings, expecte
         path = plugin_test_site.output_path / f"{hook}.html"
         with open(path) as f:
             assert json.load(f) == expected, f"Failed to match {settings=} to {expected=}"
+
+
+def test_plugin_manager_copy_shares_registrations():
+    """Tests that copies share the registrations of a plugin manager until one of them changes"""
+    plugin_manager = PluginManager()
+    plugin_manager.register_plugin(FakePlugin)
+    page_manager = plugin_manager.copy()
+    assert page_manager._pm is plugin_manager._pm
+
+    other_manager = plugin_manager.copy()
+    other_manager.unregister_plugin(FakePlugin)
+    assert other_manager._pm is not plugin_manager._pm
+    assert FakePlugin not in other_manager.plugins
+    assert FakePlugin in page_manager.plugins
+
+    plugin_manager.register_plugin(FakeLegacyPlugin)
+    assert FakeLegacyPlugin in plugin_manager.plugins
+    assert FakeLegacyPlugin not in page_manager.plugins
+    assert page_manager.plugins == {FakePlugin}
+
+
+def test_pages_without_plugin_changes_share_site_plugins():
+    """Tests that pages that do not add or ignore plugins do not get registrations of their own"""
+    site = Site()
+    site.register_plugins(FakePlugin)
+
+    @site.page
+    class SharedPage(Page):
+        pass
+
+    @site.page
+    class IgnoringPage(Page):
+        ignore_plugins = [FakePlugin]
+
+    assert SharedPage.plugin_manager._pm is site.plugin_manager._pm
+    assert IgnoringPage.plugin_manager._pm is not site.plugin_manager._pm
+    assert FakePlugin in site.plugin_manager.plugins
+
+
+class RenderContentPlugin:
+    """Implements `render_content` only"""
+
+    @staticmethod
+    @hook_impl
+    def render_content(page, settings, site):
+        page.rendered_routes = [*getattr(page, "rendered_routes", []), settings["route"]]
+
+
+def test_plugin_manager_implements():
+    """Tests that the hooks with implementations follow the registered plugins"""
+    plugin_manager = PluginManager()
+    assert not plugin_manager.implements("render_content")
+
+    plugin_manager.register_plugin(RenderContentPlugin)
+    copied_manager = plugin_manager.copy()
+    assert plugin_manager.implements("render_content")
+    assert not plugin_manager.implements("post_render_content")
+
+    plugin_manager.unregister_plugin(RenderContentPlugin)
+    assert not plugin_manager.implements("render_content")
+    assert copied_manager.implements("render_content")
+
+
+@pytest.mark.parametrize("plugins", [[], [RenderContentPlugin]])
+def test_page_render_only_calls_implemented_hooks(tmp_path, mocker, plugins):
+    """Tests that rendering a page only calls the render hooks that a plugin implements"""
+    site = Site()
+    site.output_path = tmp_path
+    site.register_plugins(*plugins)
+
+    @site.page
+    class HookedPage(Page):
+        content = "test"
+
+    HookedPage.site = site
+    hook_call = mocker.spy(pluggy.HookCaller, "__call__")
+    HookedPage.render(site.theme_manager)
+
+    assert [call.args[0].name for call in hook_call.call_args_list] == ["render_content"] * len(plugins)
+    assert getattr(HookedPage, "rendered_routes", []) == ["./"] * len(plugins)
+    assert (tmp_path / "hookedpage.html").read_text() == "test"
+
+
+class BatchPlugin:
+    """Records the batch hooks and the pages rendered in between"""
+
+    calls: list = []
+
+    @staticmethod
+    @hook_impl
+    def render_content_batch(pages, collection, settings, site):
+        BatchPlugin.calls.append(("render_content_batch", [page.title for page in pages]))
+
+    @staticmethod
+    @hook_impl
+    def render_content(page, settings, site):
+        BatchPlugin.calls.append(("render_content", page.title))
+
+    @staticmethod
+    @hook_impl
+    def post_render_content_batch(pages, collection, settings, site):
+        BatchPlugin.calls.append(("post_render_content_batch", [page.title for page in pages]))
+
+
+@pytest.mark.parametrize("render_collection", [False, True])
+def test_collection_runs_batch_render_hooks(tmp_path, render_collection):
+    """Tests that the batch hooks get the pages of a collection in chunks, around the per page hooks"""
+    BatchPlugin.calls = []
+    site = Site()
+    site.output_path = tmp_path
+    site.register_plugins(BatchPlugin)
+
+    @site.collection
+    class BatchCollection(Collection):
+        pages = [Page(content=f"---\ntitle: page{index}\n---\ntest") for index in range(5)]
+        render_batch_size = 2
+        has_archive = True
+
+    if render_collection:
+        BatchCollection.site = site
+        BatchCollection.render()
+    else:
+        site.render()
+
+    chunks = [["page0", "page1"], ["page2", "page3"], ["page4"]]
+    batch_calls = [(hook, chunk) for hook, chunk in BatchPlugin.calls if hook != "render_content"]
+    assert batch_calls == [("render_content_batch", chunk) for chunk in chunks] + [
+        ("post_render_content_batch", chunk) for chunk in chunks
+    ]
+    hooks = [hook for hook, _ in BatchPlugin.calls]
+    assert hooks[3:8] == ["render_content"] * 5
+
+
+class TimedPlugin:
+    """Implements a site hook and a page hook"""
+
+    @staticmethod
+    @hook_impl
+    def pre_build_site(site, settings):
+        pass
+
+    @staticmethod
+    @hook_impl
+    def render_content(page, settings, site):
+        pass
+
+
+def test_plugin_timing(tmp_path, caplog):
+    """Tests that the hooks of every plugin are counted and timed during a build and restored after it"""
+    site = Site(plugin_timing=True, plugin_time_budget=0)
+    site.output_path = tmp_path
+    site.register_plugins(TimedPlugin)
+    render_content = site.plugin_manager.hook.render_content.get_hookimpls()[0]
+    original = render_content.function
+
+    @site.collection
+    class TimedCollection(Collection):
+        pages = [Page(content=f"---\ntitle: page{index}\n---\ntest") for index in range(3)]
+
+    @site.page
+    class TimedPage(Page):
+        content = "test"
+
+    site.render()
+
+    timings = {(timing.plugin, timing.hook): timing for timing in site.plugin_timings.timings}
+    assert set(timings) == {("TimedPlugin", "pre_build_site"), ("TimedPlugin", "render_content")}
+    assert timings[("TimedPlugin", "pre_build_site")].calls == 1
+    assert timings[("TimedPlugin", "render_content")].calls == 4
+    assert all(timing.max <= timing.total for timing in timings.values())
+    assert render_content.function is original
+    assert "Plugin TimedPlugin spent" in caplog.text
+
+
+def test_plugin_timing_is_off_by_default(tmp_path):
+    site = Site()
+    site.output_path = tmp_path
+    site.register_plugins(TimedPlugin)
+    site.render()
+    assert site.plugin_timings is None
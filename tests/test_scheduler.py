@@ -0,0 +1,282 @@
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from render_engine import DataObject
+from render_engine.collection import Collection
+from render_engine.page import Page
+from render_engine.plugins import hook_impl
+from render_engine.scheduler import BuildPlan, RenderScheduler
+from render_engine.site import Site
+
+events: list[str] = []
+
+
+class OrderPlugin:
+    """Records the order of the collection hooks and rendered pages"""
+
+    @hook_impl
+    def pre_build_collection(collection):
+        events.append(f"pre:{collection._slug}")
+
+    @hook_impl
+    def render_content(page):
+        events.append(f"render:{page._slug}")
+
+    @hook_impl
+    def post_build_collection(collection):
+        events.append(f"post:{collection._slug}")
+
+
+@pytest.fixture
+def site(tmp_path: Path):
+    events.clear()
+    _site = Site()
+    _site.output_path = tmp_path / "output"
+    return _site
+
+
+def test_scheduler_collection_hooks_wrap_entries(site: Site):
+    """pre_build_collection runs before and post_build_collection after every entry of the collection"""
+    site.register_plugins(OrderPlugin)
+
+    class First(Page):
+        content = "first"
+
+    class Second(Page):
+        content = "second"
+
+    @site.collection
+    class Posts(Collection):
+        pages = [First(), Second()]
+
+    site.render()
+
+    pre, post = events.index("pre:posts"), events.index("post:posts")
+    for slug in ("first", "second"):
+        assert pre < events.index(f"render:{slug}") < post
+
+
+def test_scheduler_submits_all_units_to_one_executor(site: Site, mocker):
+    """Pages, data objects and collection entries share the same executor"""
+
+    class One(Page):
+        content = "one"
+
+    class Two(Page):
+        content = "two"
+
+    @site.collection
+    class Posts(Collection):
+        pages = [One(), Two()]
+
+    @site.page
+    class About(Page):
+        content = "about"
+
+    @site.data_object
+    class Data(DataObject):
+        data_object = {"key": "value"}
+
+    for entry in site.route_list.values():
+        entry.site = site
+
+    with ThreadPoolExecutor() as executor:
+        submit = mocker.spy(executor, "submit")
+        scheduler = RenderScheduler(site, executor)
+        for route, entry in site.route_list.items():
+            scheduler.schedule(route, entry, *([site.theme_manager] if isinstance(entry, Page) else []))
+        completed = []
+        scheduler.wait(on_complete=lambda group: completed.append(group.route))
+
+    # Collection: 2 pages + feed, page, data object
+    assert submit.call_count == 5
+    assert sorted(map(str, completed)) == sorted(map(str, site.route_list))
+    assert (site.output_path / "one.html").read_text() == "one"
+    assert (site.output_path / "about.html").read_text() == "about"
+    assert (site.output_path / "data_object.json").exists()
+
+
+def test_scheduler_empty_collection_runs_post_build(site: Site):
+    """A collection without entries still runs both collection hooks"""
+    site.register_plugins(OrderPlugin)
+
+    class Empty(Collection):
+        pages = []
+
+        @property
+        def all_content(self):
+            yield from ()
+
+    site.collection(Empty)
+    site.render()
+
+    assert events == ["pre:empty", "post:empty"]
+
+
+def test_scheduler_raises_render_errors(site: Site):
+    """Errors raised in a worker are raised by `Site.render`"""
+
+    def broken_serializer(data):
+        raise ValueError("Cannot serialize")
+
+    @site.data_object
+    class Broken(DataObject):
+        data_object = {"key": "value"}
+        serializer = broken_serializer
+
+    with pytest.raises(ValueError):
+        site.render()
+
+
+def test_site_process_render_backend(tmp_path: Path, mocker):
+    """Entries are rendered by worker processes when the process backend is selected"""
+    spy = mocker.patch("render_engine.scheduler.ProcessPoolExecutor", wraps=ProcessPoolExecutor)
+    site = Site(render_backend="process")
+    site.output_path = tmp_path / "output"
+
+    class One(Page):
+        content = "one"
+
+    @site.collection
+    class Posts(Collection):
+        pages = [One()]
+
+    @site.page
+    class About(Page):
+        content = "about"
+
+    site.render()
+
+    assert spy.called
+    assert (site.output_path / "one.html").read_text() == "one"
+    assert (site.output_path / "about.html").read_text() == "about"
+    assert (site.output_path / "posts.rss").exists()
+
+
+def test_collection_render_backend_overrides_site(site: Site, mocker):
+    """A collection can opt into the process backend on a threaded site"""
+    spy = mocker.spy(BuildPlan, "add")
+
+    class One(Page):
+        content = "one"
+
+    @site.collection
+    class Posts(Collection):
+        render_backend = "process"
+        pages = [One()]
+
+    @site.page
+    class About(Page):
+        content = "about"
+
+    site.render()
+
+    # The page and feed of the collection are planned, the standalone page is not
+    assert spy.call_count == 2
+    assert (site.output_path / "one.html").read_text() == "one"
+    assert (site.output_path / "about.html").read_text() == "about"
+
+
+def test_thread_units_finish_before_workers_are_forked(site: Site, mocker):
+    """Worker processes are only forked once the units rendered by threads are done"""
+    order = []
+
+    def process_pool(*args, **kwargs):
+        order.append("fork")
+        return ProcessPoolExecutor(*args, **kwargs)
+
+    mocker.patch("render_engine.scheduler.ProcessPoolExecutor", side_effect=process_pool)
+
+    class One(Page):
+        content = "one"
+
+    @site.collection
+    class Posts(Collection):
+        render_backend = "process"
+        pages = [One()]
+
+    @site.page
+    class About(Page):
+        content = "about"
+
+        def render(self, theme_manager):
+            time.sleep(0.1)
+            order.append("thread")
+            return super().render(theme_manager)
+
+    site.render()
+
+    assert order == ["thread", "fork"]
+    assert (site.output_path / "one.html").read_text() == "one"
+    assert (site.output_path / "about.html").read_text() == "about"
+
+
+def test_site_unknown_render_backend():
+    with pytest.raises(ValueError):
+        Site(render_backend="gpu")
+
+
+def test_site_executor_is_reused_across_builds(site: Site, mocker):
+    """The Site creates its executor once and reuses it for every collection and build"""
+    spy = mocker.patch("render_engine.site.ThreadPoolExecutor", wraps=ThreadPoolExecutor)
+
+    class One(Page):
+        content = "one"
+
+    @site.collection
+    class Posts(Collection):
+        pages = [One()]
+
+    @site.collection
+    class Others(Collection):
+        pages = []
+
+    site.render()
+    executor = site.executor
+    site.render()
+
+    assert spy.call_count == 1
+    assert site.executor is executor
+
+
+def test_site_max_workers(tmp_path: Path):
+    site = Site(max_workers=2)
+    assert site.executor._max_workers == 2
+    site.close()
+
+
+def test_site_close_shuts_down_executor(tmp_path: Path):
+    """Closing the site shuts the executor down and a new one is created on the next build"""
+    with Site() as site:
+        site.output_path = tmp_path / "output"
+        executor = site.executor
+
+    assert executor._shutdown
+    assert site.executor is not executor
+    site.close()
+
+
+def test_collection_overriding_render_keeps_plugins(site: Site):
+    """Collections with their own `render` are rendered through it, between the collection hooks"""
+    site.register_plugins(OrderPlugin)
+
+    class One(Page):
+        content = "one"
+
+    @site.collection
+    class Posts(Collection):
+        pages = [One()]
+
+        def render(self):
+            events.append("custom-render")
+            super().render()
+
+    site.render()
+
+    assert events[0] == "pre:posts"
+    assert events[1] == "custom-render"
+    assert events[-1] == "post:posts"
+    assert (site.output_path / "one.html").read_text() == "one"
@@ -531,3 +531,70 @@ def test_nested_static_files_appear_in_site_map(tmp_path: Path):
 
     entry = site.site_map.find("/static/nested/test.txt", attr="url_for")
     assert entry is not None
+
+
+def test_site_render_loads_content_of_collections(site, tmp_path: Path):
+    """Tests that every collection is loaded before the site is rendered and the loads are recorded"""
+    for name, count in (("posts", 3), ("notes", 2)):
+        (tmp_path / name).mkdir()
+        for index in range(count):
+            (tmp_path / name / f"{name}-{index}.md").write_text(f"---\ntitle: {name} {index}\n---\ncontent")
+
+    @site.collection
+    class Posts(Collection):
+        content_path = tmp_path / "posts"
+
+    @site.collection
+    class Notes(Collection):
+        content_path = tmp_path / "notes"
+
+    loads = site.load_content()
+    assert {slug: load.pages for slug, load in loads.items()} == {"posts": 3, "notes": 2}
+    assert all(load.seconds >= 0 for load in loads.values())
+
+    site.render()
+    assert {slug: load.pages for slug, load in site.content_loads.items()} == {"posts": 3, "notes": 2}
+    assert (tmp_path / "output" / "posts-0.html").exists()
+
+
+def test_site_render_returns_build_report(site, tmp_path: Path):
+    """Tests that the report of a build has every phase, the counts of each collection and the slowest entries"""
+    (tmp_path / "posts").mkdir()
+    for index in range(3):
+        (tmp_path / "posts" / f"post-{index}.md").write_text(f"---\ntitle: Post {index}\n---\ncontent")
+
+    @site.collection
+    class Posts(Collection):
+        content_path = tmp_path / "posts"
+        has_archive = True
+
+    @site.page
+    class About(Page):
+        content = "About this site"
+
+    report = site.render()
+
+    assert [phase.name for phase in report.phases] == [
+        "load_content",
+        "site_map",
+        "pre_build_plugins",
+        "themes",
+        "static",
+        "render",
+        "post_build",
+    ]
+    assert all(phase.wall >= 0 and phase.cpu >= 0 for phase in report.phases)
+    posts = report.collections["posts"]
+    # The first archive is also rendered as the index of the collection.
+    assert (posts.pages, posts.archives, posts.feeds) == (3, 2, 1)
+    assert posts.load.wall >= 0
+    assert posts.render.wall >= 0
+    assert report.files_written == len(report.entries)
+    outputs = [path for path in (tmp_path / "output").rglob("*") if path.is_file()]
+    assert report.bytes_written == sum(path.stat().st_size for path in outputs)
+    assert len(report.slowest(2)) == 2
+    assert report.slowest(2)[0].wall >= report.slowest(2)[1].wall
+
+    data = json.loads(json.dumps(report.to_dict(slowest=1)))
+    assert len(data["slowest"]) == 1
+    assert data["collections"]["posts"]["pages"] == 3
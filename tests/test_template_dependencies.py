@@ -0,0 +1,64 @@
+from pathlib import Path
+
+from jinja2 import DictLoader, FileSystemLoader
+
+from render_engine.collection import Collection
+from render_engine.engine import engine
+from render_engine.page import Page
+from render_engine.site import Site
+from render_engine.template_dependencies import TemplateDependencyGraph, render_recording_templates
+
+
+def test_render_recording_templates_records_extends_chain():
+    """Extended and included templates are recorded along with the template itself"""
+
+    def render():
+        return engine.get_template("archive.html").render(pages=[], title="Archive")
+
+    _, templates = render_recording_templates(render)
+    assert templates == {"archive.html", "base_templates/_archive.html", "base.html", "base_templates/_base.html"}
+
+
+def test_templates_are_not_recorded_outside_of_a_unit():
+    _, templates = render_recording_templates(lambda: None)
+    engine.get_template("page.html")
+    assert templates == frozenset()
+
+
+def test_template_dependency_graph_dependents():
+    graph = TemplateDependencyGraph()
+    graph.record(["a.html"], {"page.html", "components/footer.html"})
+    graph.record(["b.html", "b/index.html"], {"page.html"})
+
+    assert graph.dependents("components/footer.html") == {"a.html"}
+    assert graph.dependents("page.html") == {"a.html", "b.html", "b/index.html"}
+    assert graph.templates("b.html") == {"page.html"}
+    assert "c.html" not in graph
+
+
+def test_site_records_template_graph(tmp_path: Path):
+    """The site records the templates of every output, including theme prefixed templates"""
+    templates = tmp_path / "templates"
+    templates.mkdir()
+    (templates / "graph_post.html").write_text(
+        "{% extends 'theme/layout.html' %}{% block body %}{{ content }}{% endblock %}"
+    )
+
+    site = Site()
+    site.output_path = tmp_path / "output"
+    site.theme_manager.engine.loader.loaders.insert(0, FileSystemLoader(templates))
+    site.theme_manager.prefix["theme"] = DictLoader({"layout.html": "<main>{% block body %}{% endblock %}</main>"})
+
+    class Post(Page):
+        content = "post"
+        template = "graph_post.html"
+
+    @site.collection
+    class Posts(Collection):
+        pages = [Post()]
+
+    site.render()
+
+    assert site.template_graph.templates("post.html") == {"graph_post.html", "theme/layout.html"}
+    assert site.template_graph.dependents("theme/layout.html") == {"post.html"}
+    assert "rss2.0.xml" in site.template_graph.templates("posts.rss")
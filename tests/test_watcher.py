@@ -0,0 +1,250 @@
+import shutil
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+from jinja2 import FileSystemLoader
+
+from render_engine.collection import Collection
+from render_engine.page import BasePage, Page
+from render_engine.site import Site
+from render_engine.watcher import InotifyWatcher, PollingWatcher, create_watcher
+
+
+@pytest.fixture
+def site_files(tmp_path: Path) -> Path:
+    content = tmp_path / "content"
+    content.mkdir()
+    (content / "first.md").write_text("---\ntitle: First\n---\nThe first post")
+    (content / "second.md").write_text("---\ntitle: Second\n---\nThe second post")
+    (tmp_path / "templates").mkdir()
+    (tmp_path / "static").mkdir()
+    (tmp_path / "static" / "style.css").write_text("body {}")
+    return tmp_path
+
+
+def make_site(tmp_path: Path, template: str) -> Site:
+    (tmp_path / "templates" / template).write_text("<p>{{ content }}</p>")
+    site = Site(static_paths={tmp_path / "static"}, cache_path=tmp_path / "cache")
+    site.output_path = tmp_path / "output"
+    site.theme_manager.engine.loader.loaders.insert(0, FileSystemLoader(tmp_path / "templates"))
+
+    class Posts(Collection):
+        content_path = tmp_path / "content"
+
+    Posts.template = template
+    site.collection(Posts)
+
+    @site.page
+    class About(Page):
+        content = "about"
+
+    return site
+
+
+def rendered(spy) -> set[str]:
+    return {call.args[0]._slug for call in spy.call_args_list}
+
+
+def test_polling_watcher_reports_changes(tmp_path: Path):
+    (tmp_path / "ignored").mkdir()
+    (tmp_path / "modified.txt").write_text("a")
+    (tmp_path / "deleted.txt").write_text("a")
+    watcher = PollingWatcher([tmp_path], ignore=[tmp_path / "ignored"], interval=0.01)
+
+    assert watcher.wait(timeout=0) == set()
+
+    (tmp_path / "modified.txt").write_text("changed")
+    (tmp_path / "deleted.txt").unlink()
+    (tmp_path / "created.txt").write_text("a")
+    (tmp_path / "ignored" / "file.txt").write_text("a")
+
+    assert watcher.wait(timeout=1) == {
+        (tmp_path / name).resolve() for name in ("modified.txt", "deleted.txt", "created.txt")
+    }
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify is only available on Linux")
+def test_inotify_watcher_reports_changes(tmp_path: Path):
+    (tmp_path / "modified.txt").write_text("a")
+    with InotifyWatcher([tmp_path]) as watcher:
+        assert watcher.wait(timeout=0) == set()
+
+        (tmp_path / "modified.txt").write_text("changed")
+        assert (tmp_path / "modified.txt").resolve() in watcher.wait(timeout=1)
+
+        # New directories are watched as well
+        (tmp_path / "new").mkdir()
+        watcher.wait(timeout=1)
+        (tmp_path / "new" / "created.txt").write_text("a")
+        assert (tmp_path / "new" / "created.txt").resolve() in watcher.wait(timeout=1)
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify is only available on Linux")
+@pytest.mark.parametrize("watcher_class", [InotifyWatcher, PollingWatcher])
+def test_watchers_report_the_files_of_removed_directories(tmp_path: Path, watcher_class):
+    watched, outside = tmp_path / "watched", tmp_path / "outside"
+    for path in ("deleted/a.txt", "deleted/sub/b.txt", "moved/c.txt"):
+        (watched / path).parent.mkdir(parents=True, exist_ok=True)
+        (watched / path).write_text("a")
+    outside.mkdir()
+
+    with watcher_class([watched]) as watcher:
+        shutil.rmtree(watched / "deleted")
+        (watched / "moved").rename(outside / "moved")
+        changed = watcher.wait(timeout=1)
+        # The moved directory is not watched anymore
+        (outside / "moved" / "c.txt").write_text("changed")
+        later = watcher.wait(timeout=0.1)
+
+    assert changed == {(watched / path).resolve() for path in ("deleted/a.txt", "deleted/sub/b.txt", "moved/c.txt")}
+    assert later == set()
+
+
+def test_create_watcher_can_force_polling(tmp_path: Path):
+    assert isinstance(create_watcher([tmp_path], force_polling=True), PollingWatcher)
+
+
+def test_watch_paths(site_files: Path):
+    site = make_site(site_files, "watch_paths.html")
+
+    assert {
+        (site_files / "content").resolve(),
+        (site_files / "templates").resolve(),
+        (site_files / "static").resolve(),
+    } <= site.watch_paths()
+
+
+def test_rebuild_changed_content(site_files: Path, mocker):
+    site = make_site(site_files, "watch_content.html")
+    site.render()
+    spy = mocker.spy(BasePage, "render")
+
+    (site_files / "content" / "first.md").write_text("---\ntitle: First\n---\nAn update")
+    outputs = site.rebuild([site_files / "content" / "first.md"])
+
+    # The changed page and the feed that contains it
+    assert rendered(spy) == {"first", "posts"}
+    assert outputs == {"first.html", "posts.rss"}
+    assert (site.output_path / "first.html").read_text() == "<p>An update</p>"
+
+
+def test_rebuild_added_and_deleted_content(site_files: Path):
+    site = make_site(site_files, "watch_added.html")
+    site.render()
+    collection = site.route_list["posts"]
+
+    (site_files / "content" / "third.md").write_text("---\ntitle: Third\n---\nThe third post")
+    (site_files / "content" / "second.md").unlink()
+    site.rebuild([site_files / "content" / "third.md", site_files / "content" / "second.md"])
+
+    assert {page._slug for page in collection} == {"first", "third"}
+    assert (site.output_path / "third.html").read_text() == "<p>The third post</p>"
+    assert "third" in (site.output_path / "posts.rss").read_text()
+    assert not (site.output_path / "second.html").exists()
+
+
+def test_rebuild_site_map_matches_a_full_build(site_files: Path):
+    site = make_site(site_files, "watch_site_map.html")
+    site.render_html_site_map = site.render_xml_site_map = True
+    site.render()
+
+    (site_files / "content" / "first.md").write_text("---\ntitle: First\n---\nAn update")
+    site.rebuild([site_files / "content" / "first.md"])
+
+    full = make_site(site_files, "watch_site_map.html")
+    full.render_html_site_map = full.render_xml_site_map = True
+    full.output_path = site_files / "full"
+    full.render()
+    for name in ("site_map.html", "site_map.xml"):
+        assert (site.output_path / name).read_text() == (full.output_path / name).read_text()
+
+
+def test_rebuild_changed_template(site_files: Path, mocker):
+    site = make_site(site_files, "watch_template.html")
+    site.render()
+    spy = mocker.spy(BasePage, "render")
+
+    (site_files / "templates" / "watch_template.html").write_text("<div>{{ content }}</div>")
+    site.rebuild([site_files / "templates" / "watch_template.html"])
+
+    assert rendered(spy) == {"first", "second"}
+    assert (site.output_path / "first.html").read_text() == "<div>The first post</div>"
+
+
+def test_rebuild_changed_content_renders_pages_reading_the_site(site_files: Path, mocker):
+    """A page whose template lists the pages of a collection follows their changes"""
+    site = make_site(site_files, "watch_listed.html")
+    (site_files / "templates" / "watch_index.html").write_text(
+        "{% for post in routes['posts'] %}[{{ post.content }}]{% endfor %}"
+    )
+
+    @site.page
+    class Home(Page):
+        template = "watch_index.html"
+
+    site.render()
+    spy = mocker.spy(BasePage, "render")
+
+    (site_files / "content" / "first.md").write_text("---\ntitle: First\n---\nAn update")
+    site.rebuild([site_files / "content" / "first.md"])
+
+    assert rendered(spy) == {"first", "posts", "home"}
+    assert "[An update]" in (site.output_path / "home.html").read_text()
+
+
+def test_rebuild_changed_template_after_incremental_build(site_files: Path, mocker):
+    """The templates of the outputs skipped by an incremental build are known to the next rebuild"""
+    site = make_site(site_files, "watch_incremental.html")
+    site.incremental = True
+    site.render()
+    site = make_site(site_files, "watch_incremental.html")
+    site.incremental = True
+    spy = mocker.spy(BasePage, "render")
+    site.render()
+    assert spy.call_count == 0
+
+    (site_files / "templates" / "watch_incremental.html").write_text("<div>{{ content }}</div>")
+    outputs = site.rebuild([site_files / "templates" / "watch_incremental.html"])
+
+    assert outputs == {"first.html", "second.html"}
+    assert (site.output_path / "first.html").read_text() == "<div>The first post</div>"
+
+
+def test_rebuild_static_and_output_files(site_files: Path, mocker):
+    site = make_site(site_files, "watch_static.html")
+    site.render()
+    spy = mocker.spy(BasePage, "render")
+
+    (site_files / "static" / "style.css").write_text("body { color: red }")
+    (site_files / "output" / "about.html").write_text("changed by hand")
+    site.rebuild([site_files / "static" / "style.css", site_files / "output" / "about.html"])
+
+    assert spy.call_count == 0
+    assert (site.output_path / "static" / "style.css").read_text() == "body { color: red }"
+
+
+def test_watch_rebuilds_until_stopped(site_files: Path):
+    site = make_site(site_files, "watch_loop.html")
+    stop = threading.Event()
+    thread = threading.Thread(
+        target=site.watch,
+        kwargs={"force_polling": True, "poll_interval": 0.01, "debounce": 0, "stop_event": stop},
+    )
+    thread.start()
+    try:
+        output = site_files / "output" / "first.html"
+        deadline = time.monotonic() + 10
+        while not output.exists() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        # Keep writing in case the watcher was not started yet
+        while output.read_text() != "<p>Watched</p>" and time.monotonic() < deadline:
+            (site_files / "content" / "first.md").write_text("---\ntitle: First\n---\nWatched")
+            time.sleep(0.1)
+        assert output.read_text() == "<p>Watched</p>"
+    finally:
+        stop.set()
+        thread.join(timeout=10)
+    assert not thread.is_alive()